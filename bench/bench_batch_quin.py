@@ -0,0 +1,93 @@
+#!/usr/bin/python
+
+"""
+`bench_batch_quin` compares running Quin-Modified on many scenarios one at a time
+with running them together in `BatchQuinModified`. The scenarios are random
+schedules of the default configuration, each run with random priority
+thresholds.
+
+Run from the root of the repository: `python bench/bench_batch_quin.py [S ...]`
+"""
+
+# Standard Lib
+import copy
+import os
+import sys
+import tempfile
+import time
+import yaml
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root + "/" + name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from batch_quin_modified import BatchQuinModified
+from data_manager import DataManager
+from dict_util import applyOverrides
+from quin_modified import QuinModified
+from scheduler import Schedule
+
+##===============================================================================
+# MAIN
+def main():
+    sizes = [int(x) for x in sys.argv[1:]] or [100, 1000, 5000]
+    dm = DataManager()
+    rng = np.random.default_rng(0)
+    n_sched = 20  # Distinct schedules, repeated with other thresholds
+
+    print("{0:>8} {1:>10} {2:>10} {3:>8}".format("S", "loop [s]", "batch [s]", "speedup"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open("./src/config/general.yaml", "r") as f:
+            general = yaml.load(f, Loader=yaml.FullLoader)
+        with open("./src/config/schedule.yaml", "r") as f:
+            init = yaml.load(f, Loader=yaml.FullLoader)
+
+        general.update({"schedule_type": "random", "run_prev": 0})
+        with open(tmp + "/general.yaml", "w") as f:
+            yaml.dump(general, f)
+
+        # Generate the schedules
+        schedules = []
+        for seed in range(n_sched):
+            with open(tmp + "/schedule.yaml", "w") as f:
+                yaml.dump(applyOverrides(init, {"seed": seed}), f)
+            Schedule(None, tmp, tmp)
+            schedules.append(copy.deepcopy(dm.m_params))
+
+        for S in sizes:
+            thr = np.sort(rng.uniform(0.5, 0.99, size=(S, 3)), axis=1)
+
+            # One scenario at a time
+            start = time.perf_counter()
+            for s in range(S):
+                for k, v in schedules[s % n_sched].items():
+                    dm[k] = v
+                qm = QuinModified(tmp)
+                qm.high, qm.med, qm.low = thr[s]
+                qm.optimize()
+            t_loop = time.perf_counter() - start
+
+            # All scenarios together
+            start = time.perf_counter()
+            batch = BatchQuinModified(tmp)
+            for s in range(S):
+                batch.add(schedules[s % n_sched], *thr[s])
+            batch.optimize()
+            t_batch = time.perf_counter() - start
+
+            print("{0:>8} {1:>10.3f} {2:>10.3f} {3:>8.1f}".format(S, t_loop, t_batch, t_loop / t_batch))
+
+    return
+
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/python
+
+"""
+`bench_gen_schedule` times the generation of random schedules of 1000 to 100000
+visits.
+
+Run from the root of the repository: `python bench/bench_gen_schedule.py [N ...]`
+"""
+
+# Standard Lib
+import os
+import sys
+import tempfile
+import time
+import yaml
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root + "/" + name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from data_manager import DataManager
+from dict_util import applyOverrides
+from scheduler import Schedule
+
+##===============================================================================
+# MAIN
+def main():
+    sizes = [int(x) for x in sys.argv[1:]] or [1000, 10000, 100000]
+    dm = DataManager()
+    reps = 5
+
+    print("{0:>8} {1:>6} {2:>10}".format("N", "A", "gen [ms]"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open("./src/config/general.yaml", "r") as f:
+            general = yaml.load(f, Loader=yaml.FullLoader)
+        with open("./src/config/schedule.yaml", "r") as f:
+            init = yaml.load(f, Loader=yaml.FullLoader)
+
+        general.update({"schedule_type": "random", "run_prev": 0, "cache": 0})
+        with open(tmp + "/general.yaml", "w") as f:
+            yaml.dump(general, f)
+
+        for N in sizes:
+            overrides = {"buses.num_bus": max(15, N // 15), "buses.num_visit": N, "seed": 0}
+            with open(tmp + "/schedule.yaml", "w") as f:
+                yaml.dump(applyOverrides(init, overrides), f)
+
+            start = time.perf_counter()
+            for _ in range(reps):
+                Schedule(None, tmp, tmp)
+            t_gen = (time.perf_counter() - start) / reps
+
+            print("{0:>8} {1:>6} {2:>10.3f}".format(N, dm["A"], 1e3 * t_gen))
+
+    return
+
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    main()
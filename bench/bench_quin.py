@@ -0,0 +1,140 @@
+#!/usr/bin/python
+
+"""
+`bench_quin` measures how Quin-Modified scales with the number of visits, with
+the free slots kept in a `FreeSlotIndex` and in a plain list scanned in order
+of creation (the original implementation). Both must produce the same
+schedule.
+
+Run from the root of the repository: `python bench/bench_quin.py [N ...]`
+"""
+
+# Standard Lib
+import os
+import sys
+import tempfile
+import time
+import yaml
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root + "/" + name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+import quin_modified
+
+from dict_util import applyOverrides
+from free_slot_index import FreeSlotIndex
+from scheduler import Schedule
+
+##===============================================================================
+# CLASSES
+
+
+##-------------------------------------------------------------------------------
+#
+class ListFreeSlots:
+    """
+    Free slots kept in a list per charger and scanned linearly, with the same
+    interface as `FreeSlotIndex`.
+    """
+
+    def __init__(self, Q, BOD, EOD):
+        self.cu = [[[BOD, EOD]] for _ in range(Q)]
+
+    def findFreeTime(self, q, a, t):
+        for i in self.cu[q]:
+            if t < i[0] or a > i[1]:
+                continue
+            return max(a, i[0]), min(t, i[1]), i
+        return a, t, None
+
+    def reserve(self, q, i, u, c):
+        self.cu[q].remove(i)
+        self.cu[q].append([i[0], u])
+        self.cu[q].append([c, i[1]])
+
+
+##===============================================================================
+# FUNCTIONS
+
+
+##-------------------------------------------------------------------------------
+#
+def genInstance(N: int, path: str):
+    """
+    Generate a random schedule of N visits with 20 visits per bus
+
+    Input:
+      - N    : Number of visits
+      - path : Scratch directory
+
+    Output:
+      - Schedule loaded in the data manager
+    """
+    with open("./src/config/general.yaml", "r") as f:
+        general = yaml.load(f, Loader=yaml.FullLoader)
+    with open("./src/config/schedule.yaml", "r") as f:
+        init = yaml.load(f, Loader=yaml.FullLoader)
+
+    general.update({"schedule_type": "random", "run_prev": 0})
+    init = applyOverrides(init, {"buses.num_visit": N, "buses.num_bus": max(1, N // 20), "seed": 0})
+
+    with open(path + "/general.yaml", "w") as f:
+        yaml.dump(general, f)
+    with open(path + "/schedule.yaml", "w") as f:
+        yaml.dump(init, f)
+
+    Schedule(None, path, path)
+    return
+
+
+##-------------------------------------------------------------------------------
+#
+def timeQuin(cls, path: str):
+    """
+    Input:
+      - cls  : Free slot structure used by Quin-Modified
+      - path : Configuration directory
+
+    Output:
+      - dt      : Run time [s]
+      - results : Quin-Modified results
+    """
+    quin_modified.FreeSlotIndex = cls
+    start = time.perf_counter()
+    results = quin_modified.QuinModified(path).optimize()
+    dt = time.perf_counter() - start
+    quin_modified.FreeSlotIndex = FreeSlotIndex
+
+    return dt, {k: np.array(results[k], dtype=float) for k in ["u", "c", "v", "eta"]}
+
+
+##===============================================================================
+# MAIN
+def main():
+    sizes = [int(x) for x in sys.argv[1:]] or [1000, 2000, 5000, 10000]
+
+    print("{0:>8} {1:>10} {2:>10} {3:>8} {4:>6}".format("N", "list [s]", "index [s]", "speedup", "same"))
+
+    for N in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            genInstance(N, tmp)
+            t_list, r_list = timeQuin(ListFreeSlots, tmp)
+            t_idx, r_idx = timeQuin(FreeSlotIndex, tmp)
+
+        same = all(np.array_equal(r_list[k], r_idx[k]) for k in r_list)
+        print("{0:>8} {1:>10.3f} {2:>10.3f} {3:>8.1f} {4:>6}".format(N, t_list, t_idx, t_list / t_idx, str(same)))
+
+    return
+
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    main()
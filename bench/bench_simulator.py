@@ -0,0 +1,70 @@
+#!/usr/bin/python
+
+"""
+`bench_simulator` times the validation of Quin-Modified schedules by the
+`simulator` for random schedules of 1000 to 10000 visits.
+
+Run from the root of the repository: `python bench/bench_simulator.py [N ...]`
+"""
+
+# Standard Lib
+import os
+import sys
+import tempfile
+import time
+import yaml
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root + "/" + name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from data_manager import DataManager
+from dict_util import applyOverrides
+from quin_modified import QuinModified
+from scheduler import Schedule
+from simulator import simulate
+
+##===============================================================================
+# MAIN
+def main():
+    sizes = [int(x) for x in sys.argv[1:]] or [1000, 2000, 5000, 10000]
+    dm = DataManager()
+    reps = 20
+
+    print("{0:>8} {1:>10} {2:>12}".format("N", "sim [ms]", "violations"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open("./src/config/general.yaml", "r") as f:
+            general = yaml.load(f, Loader=yaml.FullLoader)
+        with open("./src/config/schedule.yaml", "r") as f:
+            init = yaml.load(f, Loader=yaml.FullLoader)
+
+        general.update({"schedule_type": "random", "run_prev": 0})
+        with open(tmp + "/general.yaml", "w") as f:
+            yaml.dump(general, f)
+
+        for N in sizes:
+            overrides = {"buses.num_bus": max(15, N // 15), "buses.num_visit": N, "seed": 0}
+            with open(tmp + "/schedule.yaml", "w") as f:
+                yaml.dump(applyOverrides(init, overrides), f)
+            Schedule(None, tmp, tmp)
+            r = QuinModified(tmp).optimize()
+
+            start = time.perf_counter()
+            for _ in range(reps):
+                sim = simulate(dm.m_params, r)
+            t_sim = (time.perf_counter() - start) / reps
+
+            print("{0:>8} {1:>10.3f} {2:>12}".format(N, 1e3 * t_sim, sim["violations"]))
+
+    return
+
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    main()
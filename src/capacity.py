@@ -0,0 +1,372 @@
+#!/usr/bin/python
+
+"""
+`capacity` searches for the fewest slow and fast chargers that still give a
+feasible day.
+
+For every number of fast chargers, the minimum number of slow chargers is
+bracketed by bisection. A probe is feasible if one of the heuristics (see
+`config/capacity.yaml`) builds a schedule the simulator finds no violation in.
+The heuristics are fast but can miss a feasible schedule, so the MILP is only
+run on the boundary: the largest number of slow chargers the heuristics could
+not find a schedule for. If the MILP finds one, the next smaller number is
+tried, until the MILP proves it infeasible or runs out of time.
+
+The probes of the different numbers of fast chargers are independent and run in
+a pool of `jobs` workers (see `general.yaml`). The minimum number of slow
+chargers for each number of fast chargers is written to
+'../data/capacity/frontier.csv' and every probe to '../data/capacity/probes.csv'.
+"""
+
+# ================================================================================
+# INCLUDES
+
+# Standard Lib
+import csv
+import multiprocessing as mp
+import os
+import tempfile
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+#
+# NOTE: Importing `sweep` (through `main`) includes the source tree in the path
+from sweep import runScenario
+
+from config_loader import Config, loadConfig, loadYAML
+from edf import EDF
+from quin_modified import QuinModified
+from run_context import RunContext
+from scheduler import Schedule
+from simulator import simulate
+
+import dir_util
+
+##===============================================================================
+# FUNCTIONS
+
+
+##-------------------------------------------------------------------------------
+#
+def loadCapacity(c_path: str = "./config"):
+    """
+    Load the capacity search configuration and the base configuration it is
+    applied to.
+
+    Input:
+      - c_path : Path to the configuration directory
+
+    Output:
+      - cap : Parsed 'capacity.yaml'
+      - cfg : Base configuration (see `config_loader`)
+    """
+    return loadYAML(c_path + "/capacity.yaml"), loadConfig(c_path)
+
+
+##-------------------------------------------------------------------------------
+#
+def chargerOverrides(slow: int, fast: int, seed: int) -> dict:
+    """
+    Input:
+      - slow : Number of slow chargers
+      - fast : Number of fast chargers
+      - seed : Seed of the schedule
+
+    Output:
+      - overrides : Overrides on 'schedule.yaml' of the probe
+    """
+    return {"chargers.slow.num": int(slow), "chargers.fast.num": int(fast), "seed": seed}
+
+
+##-------------------------------------------------------------------------------
+#
+def probeConfig(cfg: Config, general: dict, slow: int, fast: int, seed: int) -> Config:
+    """
+    Input:
+      - cfg     : Base configuration
+      - general : Overrides on 'general.yaml' of the probe
+      - slow    : Number of slow chargers
+      - fast    : Number of fast chargers
+      - seed    : Seed of the schedule
+
+    Output:
+      - cfg : Configuration of the probe
+    """
+    overrides = dict(general)
+    overrides.update({"schedule." + k: v for k, v in chargerOverrides(slow, fast, seed).items()})
+    return cfg.override(overrides)
+
+
+##-------------------------------------------------------------------------------
+#
+def probeHeuristics(job: dict, slow: int) -> dict:
+    """
+    Check whether one of the heuristics finds a feasible schedule with `slow`
+    slow chargers and `job["fast"]` fast chargers.
+
+    Input:
+      - job  : Dictionary describing the search (see `minSlow`)
+      - slow : Number of slow chargers
+
+    Output:
+      - row : Probe summary row
+    """
+    # Variables
+    dm = RunContext()
+    fast = job["fast"]
+    row = {"slow": slow, "fast": fast, "method": "", "feasible": False, "violations": np.inf}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = probeConfig(job["cfg"], {"run_prev": 0, "load_from_file": 0}, slow, fast, job["seed"])
+        Schedule(None, cfg, tmp, dm)
+
+        for h in job["heuristics"]:
+            results = QuinModified(cfg, ctx=dm).optimize() if h == "quin" else EDF(ctx=dm).optimize()
+            n = simulate(dm.m_params, results)["violations"]
+            row["violations"] = min(row["violations"], n)
+            row["method"] = h
+
+            if n == 0:
+                row["feasible"] = True
+                break
+
+    return row
+
+
+##-------------------------------------------------------------------------------
+#
+def minSlow(job: dict) -> dict:
+    """
+    Bracket the minimum number of slow chargers for a number of fast chargers by
+    bisection on the heuristic probes. This is the entry point of each pool
+    worker.
+
+    The bisection assumes that a charger more never makes the heuristics fail.
+
+    Input:
+      - job : Dictionary describing the search: number of fast chargers `fast`,
+              range of slow chargers `slow`, `heuristics`, `seed` and the
+              base configuration `cfg`
+
+    Output:
+      - result : Minimum number of slow chargers `slow` (None if the heuristics
+                 fail for the whole range) and the probes
+    """
+    # Variables
+    lo, hi = job["slow"]
+    lo = max(lo, 1 - job["fast"])  # At least one charger
+    probes = []
+
+    if lo > hi:
+        return {"fast": job["fast"], "slow": None, "probes": probes}
+
+    # The whole range may not be enough
+    probes.append(probeHeuristics(job, hi))
+    if not probes[-1]["feasible"]:
+        return {"fast": job["fast"], "slow": None, "probes": probes}
+
+    # Bisect: `hi` is feasible, `lo - 1` is not
+    while lo < hi:
+        mid = (lo + hi) // 2
+        probes.append(probeHeuristics(job, mid))
+
+        if probes[-1]["feasible"]:
+            hi = mid
+        else:
+            lo = mid + 1
+
+    return {"fast": job["fast"], "slow": hi, "probes": probes}
+
+
+##-------------------------------------------------------------------------------
+#
+def capacity(c_path: str = "./config", d_path: str = "../data/capacity"):
+    """
+    Search for the minimum number of slow chargers for every number of fast
+    chargers and write the results to 'D_PATH/{frontier,probes}.csv'.
+
+    Input:
+      - c_path : Path to the base configuration directory
+      - d_path : Path to the capacity output directory
+
+    Output:
+      - frontier : Minimum number of slow chargers for each number of fast
+                   chargers and the method that found it
+      - probes   : Summary rows of every probe
+    """
+    # Variables
+    cap, cfg = loadCapacity(c_path)
+    slo, shi = cap["slow"]
+    fast = list(range(cap["fast"][0], cap["fast"][1] + 1))
+    seed = cap.get("seed", 0)
+    jobs = max(1, min(cfg.jobs, len(fast)))
+
+    dir_util.create_dir(d_path)
+
+    # Bracket the minimum with the heuristics
+    work = [
+        {
+            "fast": f,
+            "slow": (slo, shi),
+            "heuristics": cap.get("heuristics", ["quin"]),
+            "seed": seed,
+            "cfg": cfg,
+        }
+        for f in fast
+    ]
+
+    print("Probing {0} numbers of fast chargers on {1} workers".format(len(work), jobs))
+
+    with mp.Pool(processes=jobs) as pool:
+        found = pool.map(minSlow, work, chunksize=1)
+
+    probes = [p for r in found for p in r["probes"]]
+    frontier = {}
+    for r in found:
+        method = [p["method"] for p in r["probes"] if p["feasible"] and p["slow"] == r["slow"]]
+        frontier[r["fast"]] = {"fast": r["fast"], "slow": r["slow"], "method": (method or [""])[0]}
+
+    # Check the boundary with the MILP
+    if cap.get("milp", 1):
+        probes += __milpBoundary(frontier, cap, cfg, d_path)
+
+    frontier = [frontier[f] for f in fast]
+    __writeRows(d_path + "/frontier.csv", frontier)
+    __writeRows(d_path + "/probes.csv", probes)
+
+    return frontier, probes
+
+
+##===============================================================================
+# PRIVATE
+
+
+##-------------------------------------------------------------------------------
+#
+def __milpBoundary(frontier: dict, cap: dict, cfg: Config, d_path: str) -> list:
+    """
+    Solve the MILP on the boundary of the heuristic search. The frontier is
+    lowered in place for every boundary the MILP finds a schedule for.
+
+    Input:
+      - frontier : Minimum number of slow chargers for each number of fast
+                   chargers
+      - cap      : Parsed 'capacity.yaml'
+      - cfg      : Base configuration
+      - d_path   : Path to the capacity output directory
+
+    Output:
+      - probes : Summary rows of the MILP probes
+    """
+    # Variables
+    slo, shi = cap["slow"]
+    seed = cap.get("seed", 0)
+    probes = []
+
+    # Largest number of slow chargers the heuristics failed on
+    todo = {}
+    for f, r in frontier.items():
+        s = shi if r["slow"] is None else r["slow"] - 1
+        if s >= max(slo, 1 - f):
+            todo[f] = s
+
+    while todo:
+        jobs = max(1, min(cfg.jobs, len(todo)))
+        threads = max(1, (os.cpu_count() or 1) // jobs)
+
+        g = dict(cap.get("general") or {})
+        g.update({"threads": threads, "run_prev": 0, "load_from_file": 0, "plot": 0})
+
+        work = [
+            {
+                "name": "slow-{0:03d}-fast-{1:03d}".format(s, f),
+                "overrides": chargerOverrides(s, f, seed),
+                "cfg": probeConfig(cfg, g, s, f, seed),
+                "d_path": d_path,
+                "solvers": ["milp"],
+            }
+            for f, s in todo.items()
+        ]
+
+        print("Solving {0} boundary probes with the MILP".format(len(work)))
+
+        # Each worker only runs a single probe so that the solver state starts
+        # clean for every probe
+        with mp.Pool(processes=jobs, maxtasksperchild=1) as pool:
+            rows = pool.map(runScenario, work, chunksize=1)
+
+        # Lower the frontier and try the next smaller number of slow chargers
+        done = {}
+        for (f, s), row in zip(todo.items(), rows):
+            ok = not row["error"] and np.isfinite(row["milp_obj"]) and row["milp_violations"] == 0
+            probes.append(
+                {
+                    "slow": s,
+                    "fast": f,
+                    "method": "milp",
+                    "feasible": bool(ok),
+                    "violations": row.get("milp_violations", float("nan")),
+                    "milp_status": row.get("milp_status", float("nan")),
+                    "error": row["error"],
+                }
+            )
+
+            if ok:
+                frontier[f].update({"slow": s, "method": "milp"})
+                if s - 1 >= max(slo, 1 - f):
+                    done[f] = s - 1
+        todo = done
+
+    return probes
+
+
+##-------------------------------------------------------------------------------
+#
+def __writeRows(path: str, rows: list):
+    """
+    Write a table to disk
+
+    Input:
+      - path : Path to the CSV
+      - rows : Rows of the table
+
+    Output:
+      - CSV file located at PATH
+    """
+    # Collect every column in order of appearance
+    fields = []
+    for r in rows:
+        fields += [k for k in r.keys() if k not in fields]
+
+    with open(path, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fields, restval="")
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return
+
+
+##===============================================================================
+# MAIN
+def main():
+    frontier, probes = capacity()
+
+    for r in frontier:
+        s = "-" if r["slow"] is None else r["slow"]
+        print("fast: {0:3d}  slow: {1:>3}  ({2})".format(r["fast"], s, r["method"] or "none"))
+
+    ok = [r for r in frontier if r["slow"] is not None]
+    if ok:
+        best = min(ok, key=lambda r: (r["slow"] + r["fast"], r["fast"]))
+        print("Fewest chargers: {0} slow, {1} fast".format(best["slow"], best["fast"]))
+
+    print("Ran {0} probes".format(len(probes)))
+    return
+
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    main()
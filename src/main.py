@@ -7,7 +7,8 @@
 import gurobipy as gp
 import os
 import sys
-import yaml
+
+import numpy as np
 
 ##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Include in path
@@ -22,13 +23,21 @@ for root, dirs, files in os.walk(".", topdown=False):
 # Developed
 from scheduler import Schedule
 from optimizer import Optimizer
+from column_generation import ColumnGeneration
+from edf import EDF
+from lagrangian import Lagrangian
+from local_search import LocalSearch
+from portfolio import Portfolio
 from quin_modified import QuinModified
+from robustness import Robustness
 
+from config_loader import loadConfig
 from data_output import outputData
+from simulator import KINDS, simulate
 
 ##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-# Data managers
-from data_manager import DataManager
+# Run context
+from run_context import RunContext
 
 ##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Objective
@@ -59,7 +68,6 @@ from valid_queue_vector import ValidQueueVector
 
 ##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Plots
-from plot import Plotter
 from charge_plot import ChargePlot
 from charger_usage_plot import ChargerUsagePlot
 from schedule_plot import SchedulePlot
@@ -72,26 +80,21 @@ from accumulated_energy_usage_plot import AccumulatedEnergyUsagePlot
 
 ##-------------------------------------------------------------------------------
 #
-def createModel(path: str = "./config/general.yaml"):
+def createModel(c_path="./config"):
     """
     Input:
-      - str : Path to the configuration file
+      - c_path : Path to the configuration directory, or its `Config`
 
     Output:
       - model : Model for the MILP to be created with
     """
     # Variables
-    f = open(path, "r")  # Open file
+    cfg = loadConfig(c_path)  # Parsed configuration
     model = None  # MILP model
 
-    # Parse 'config/general.yaml'
-    with open(r"config/general.yaml") as f:
-        file = yaml.load(f, Loader=yaml.FullLoader)
-        solver = file["solver"]
-
     # Create the appropriate model
     # TODO: Create appropriate model for GLPK
-    if solver == "GLPK":
+    if cfg.solver == "GLPK":
         model = gp.Model()
     else:
         model = gp.Model()
@@ -101,13 +104,14 @@ def createModel(path: str = "./config/general.yaml"):
 
 ##-------------------------------------------------------------------------------
 #
-def plot(results, dm):
+def plot(results, dm, cfg=None):
     """
     Runs a list of plot functions
 
     Input
       - results : Output of GUROBI solution
-      - dm      : Data Manager
+      - dm      : Run context
+      - cfg     : Configuration of the run, default: 'config'
 
     Output
       - NONE
@@ -120,13 +124,12 @@ def plot(results, dm):
         AccumulatedEnergyUsagePlot(),
     ]
 
-    Plotter.initialize(results, dm)
+    for p in plots:
+        p.initialize(results, dm)
 
-    with open(r"config/general.yaml") as f:
-        file = yaml.load(f, Loader=yaml.FullLoader)
-        if file["plot"] > 0:
-            for p in plots:
-                p.plot()
+    if loadConfig(cfg or "config").plot > 0:
+        for p in plots:
+            p.plot()
 
     return
 
@@ -207,36 +210,130 @@ def subscribeConstr(constraints, optimizer_obj):
     return
 
 
-##===============================================================================
-# MAIN
-def main():
-    # Create data manager object
-    dm = DataManager()
-
-    # Create MILP model
-    dm["model"] = createModel()
+##-------------------------------------------------------------------------------
+#
+def validate(name, results, dm, cfg):
+    """
+    Replay a schedule with the simulator and report its violations. The
+    robustness of the schedule to delays is reported as well if enabled in
+    'config/general.yaml'.
 
-    # Create schedule
-    Schedule(dm["model"])
+    Input
+      - name    : Name of the solver that produced the schedule
+      - results : Results of the solver
+      - dm      : Run context
+      - cfg     : Configuration of the run
 
-    # Optimize
-    ## Initialize optimizer
-    o = Optimizer()  # MILP solution
-    qm = QuinModified()  # Quin Modified solution
+    Output
+      - sim : Simulation of the schedule (see `simulator.simulate`)
+    """
+    sim = simulate(dm.m_params, results)
+
+    print(
+        "{0}: J = {1:.2f}, peak power {2:.2f} kW, {3} violations ({4})".format(
+            name,
+            sim["obj"],
+            sim["peak"],
+            sim["violations"],
+            ", ".join("{0} {1}".format(k, sim[k]) for k in KINDS),
+        )
+    )
+
+    if cfg.robustness:
+        rb = Robustness(cfg, ctx=dm).evaluate(results)
+        print(
+            "{0}: {1} sampled days, {2:.2f} missed charges a day, worst bus "
+            "P(missed charge) = {3:.3f}, P(depleted) = {4:.3f}".format(
+                name,
+                rb["samples"],
+                rb["missed"],
+                np.max(rb["p_missed"], initial=0.0),
+                np.max(rb["p_depleted"], initial=0.0),
+            )
+        )
+
+    return sim
 
-    ## Initialize objectives and constraints
-    setupObjective(o, dm)
-    setupConstraints(o, dm)
 
-    ### Optimize model with MILP
-    results = o.optimize()
-    outputData("milp", results)
-    plot(results, dm)
+##===============================================================================
+# MAIN
+def main():
+    # Create the context of the run
+    dm = RunContext()
+
+    # Parse 'config/general.yaml' and 'config/schedule.yaml'
+    cfg = loadConfig("./config")
+    formulation = cfg.formulation
+    heuristic = cfg.heuristic
+
+    if formulation == "colgen":
+        # Create schedule, the compact model is not needed
+        Schedule(None, cfg, ctx=dm)
+
+        ### Optimize with column generation
+        results = ColumnGeneration(cfg, ctx=dm).optimize()
+
+        ### Only a schedule without artificial slacks is a schedule
+        if results is not None:
+            outputData("cg", dm)
+            validate("cg", results, dm, cfg)
+            plot(results, dm, cfg)
+    elif formulation == "lagrangian":
+        # Create schedule, the compact model is not needed
+        Schedule(None, cfg, ctx=dm)
+
+        ### Bound and repaired schedule from the Lagrangian relaxation
+        results = Lagrangian(cfg, ctx=dm).optimize()
+        outputData("lr", dm)
+        validate("lr", results, dm, cfg)
+        plot(results, dm, cfg)
+    else:
+        # Create MILP model
+        dm["model"] = createModel(cfg)
+
+        # Create schedule
+        Schedule(dm["model"], cfg, ctx=dm)
+
+        # Optimize
+        ## Initialize optimizer
+        o = Optimizer(c_path=cfg, ctx=dm)  # MILP solution
+
+        ## Initialize objectives and constraints
+        setupObjective(o, dm)
+        setupConstraints(o, dm)
+
+        ### Warm start with the earliest-deadline-first schedule or the best
+        ### schedule of the heuristic portfolio
+        if cfg.warm_start:
+            if heuristic == "edf":
+                o.warmStart(EDF(ctx=dm).construct())
+            else:
+                o.warmStart(Portfolio(cfg, ctx=dm).search())
+
+        ### Optimize model with MILP
+        results = o.optimize()
+        outputData("milp", results, ctx=dm)
+        validate("milp", results, dm, cfg)
+        plot(results, dm, cfg)
 
     ### Optimize with Quin-Modified
-    results = qm.optimize()
+    if heuristic == "portfolio":
+        results = Portfolio(cfg, ctx=dm).optimize()  # Best of the heuristic variants
+    elif heuristic == "edf":
+        results = EDF(ctx=dm).optimize()  # Earliest deadline first
+    else:
+        qm = QuinModified(cfg, ctx=dm)  # Quin Modified solution
+        results = qm.optimize()
     outputData("qm", dm)
-    plot(results, dm)
+    validate("qm", results, dm, cfg)
+    plot(results, dm, cfg)
+
+    ### Improve the heuristic schedule with a local search
+    if cfg.local_search:
+        results = LocalSearch(ctx=dm).optimize()
+        outputData("ls", dm)
+        validate("ls", results, dm, cfg)
+        plot(results, dm, cfg)
 
     return
 
@@ -0,0 +1,208 @@
+# Standard Library
+import numpy as np
+
+# Developed Modules
+from config_loader import loadConfig
+from data_manager import DataManager
+from run_context import RunContext
+
+
+##===============================================================================
+#
+class BatchQuinModified:
+    """
+    Quin-Modified run on many scenarios at once. The state of every scenario is
+    held in numpy arrays and all the scenarios advance together, one visit at a
+    time.
+
+    Visits are processed in order of arrival, so the only free slot of a charger
+    a later visit can use for some time is the one after its last reservation:
+    each charger is reduced to the time it is next free. The schedules match
+    `QuinModified` except that a charger is only assigned if it is free for some
+    time within the visit, where `QuinModified` also assigns a charger for zero
+    time when one of its free slots merely touches the visit window (e.g. two
+    buses arriving at the same time). Only the default charger scan ('slow')
+    and choice ('earliest') of `QuinModified` are supported.
+    """
+
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, c_path="./config", ctx: RunContext = None):
+        """
+        Initialize the batched Quin-Modified algorithm
+
+        Input:
+          - c_path: Path to configuration directory, or its `Config`
+          - ctx: Run context, default: the `DataManager`
+
+        Output
+           - None
+        """
+        self.dm = DataManager() if ctx is None else ctx  # Run context
+        self.init = self.__parseYAML(c_path)  # Get charger configuration
+        self.BOD = 0.0  # Beginning of day
+        self.EOD = self.init["time"]["EOD"] - self.init["time"]["BOD"]  # End of day
+        self.scenarios = []  # Input parameters of each scenario
+        self.thresholds = []  # (high, med, low) priority of each scenario
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def add(
+        self,
+        params: dict = None,
+        high: float = 0.85,
+        med: float = 0.90,
+        low: float = 0.95,
+        scan: str = "slow",
+        fit: str = "earliest",
+    ):
+        """
+        Add a scenario to the batch. Every scenario must have the same number of
+        visits and chargers.
+
+        Input:
+          - params : Input parameters of the scenario (default: copy of the data
+                     manager)
+          - high   : High priority threshold
+          - med    : Medium priority threshold
+          - low    : Low priority threshold
+          - scan   : Chargers tried first, only 'slow' is supported
+          - fit    : Charger choice, only 'earliest' is supported
+
+        Output:
+          - s : Index of the scenario
+        """
+        if scan != "slow" or fit != "earliest":
+            raise ValueError("BatchQuinModified only supports scan 'slow' and fit 'earliest', got {0!r} and {1!r}".format(scan, fit))
+
+        if params is None:
+            params = self.dm.m_params
+
+        keys = ["N", "Q", "Gamma", "a", "alpha", "gamma", "kappa", "l", "t"]
+        sc = {k: np.array(params[k], copy=True) for k in keys}
+
+        if self.scenarios and (sc["N"], sc["Q"]) != (self.scenarios[0]["N"], self.scenarios[0]["Q"]):
+            raise ValueError("Every scenario of a batch must have the same number of visits and chargers.")
+
+        self.scenarios.append(sc)
+        self.thresholds.append((high, med, low))
+        return len(self.scenarios) - 1
+
+    ##---------------------------------------------------------------------------
+    #
+    def optimize(self):
+        """
+        Generate a charging schedule for every scenario based on the
+        quin-modified algorithm
+
+        Input
+          - None
+
+        Output
+          - results : Dictionary of (S, N) arrays `u`, `c`, `v`, `eta` and `p`
+        """
+        # Unpack scenarios
+        S = len(self.scenarios)
+        N = int(self.scenarios[0]["N"])
+        Q = int(self.scenarios[0]["Q"])
+        stack = lambda k: np.stack([sc[k] for sc in self.scenarios])
+
+        G = stack("Gamma")  # ID of current visit
+        a = stack("a").astype(float)  # Arrival time
+        alp = stack("alpha").astype(float)  # Initial charge percentage
+        gam = stack("gamma")  # Index of next visit for bus b
+        kap = stack("kappa").astype(float)  # Battery capacity
+        l = stack("l").astype(float)  # Discharge over route i
+        t = stack("t").astype(float)  # Departure time from station
+
+        thr = np.array(self.thresholds, dtype=float)
+        high, med, low = thr[:, 0], thr[:, 1], thr[:, 2]
+
+        # Charger configuration
+        s = self.init["chargers"]["slow"]["num"]  # Slow chargers
+        r = np.where(
+            np.arange(Q) < s,
+            self.init["chargers"]["slow"]["rate"],
+            self.init["chargers"]["fast"]["rate"],
+        )  # Charge rate [Kw]
+        cap = low * self.init["buses"]["bat_capacity"]  # Stop charging [kwh]
+
+        # Charger scan of each priority: none, fast only, slow then fast, slow
+        # only
+        scan = np.zeros((4, Q), dtype=bool)
+        scan[1, s:] = True
+        scan[2, :] = True
+        scan[3, :s] = True
+
+        # Decision variables
+        u = np.zeros((S, N))  # Initial charge time
+        c = np.zeros((S, N))  # Detach time
+        v = -1 * np.ones((S, N), dtype=int)  # Assigned queue
+        eta = np.zeros((S, N))  # Initial charge
+
+        # Helper variables
+        free = np.full((S, Q), self.BOD)  # Time each charger is next free
+        rows = np.arange(S)
+
+        # For each visit
+        for i in range(N):
+            e = eta[:, i]
+            k = kap[rows, G[:, i]]
+            nxt = gam[:, i]  # A last visit (-1) writes to the last visit, as in QuinModified
+
+            ## Set initial charge for first visit
+            first = alp[:, i] > 0
+            e[first] = k[first] * alp[first, i]
+
+            ## Priority of the normal visits, mirroring QuinModified's branches
+            fast = e < high * k
+            slow = ~fast & (e < med * k)
+            SLOW = ~fast & ~slow & (e <= med * k) & (e < low * k)
+            none = ~fast & ~slow & ~SLOW & (e >= low * k)
+            prio = np.select([fast, SLOW, none], [1, 3, 0], default=2)
+
+            ## First charger of the scan that is free before the departure
+            ok = scan[prio] & (np.maximum(free, a[:, i, None]) < t[:, i, None]) & ~first[:, None]
+            found = ok.any(axis=1)
+            q = np.argmax(ok, axis=1)
+
+            ## Charge until the departure or the battery reaches `low`
+            ui = np.maximum(a[:, i], free[rows, q])
+            ci = np.minimum(t[:, i], self.EOD)
+            full = e + r[q] * (ci - ui) >= cap
+            ci = np.where(full, (cap - e) / r[q] + ui, ci)
+            en = np.where(full, cap - l[:, i], e + r[q] * (ci - ui) - l[:, i])
+
+            ## Commit the reservations
+            free[rows[found], q[found]] = ci[found]
+            v[found, i] = q[found]
+            u[:, i] = np.where(found, ui, np.where(none | first, 0.0, a[:, i]))
+            c[:, i] = np.where(found, ci, np.where(none | first, 0.0, t[:, i]))
+
+            ## Charge at the next visit
+            en = np.where(found, en, e)
+            en = np.where(first, e - l[:, i], np.maximum(en, 0))
+            eta[rows, nxt] = en
+
+        return {"u": u, "c": c, "v": v, "eta": eta, "p": c - u}
+
+    ##===========================================================================
+    # PRIVATE
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __parseYAML(self, path):
+        """
+        Input:
+          - path: Path to the configuration directory, or its `Config`
+
+        Output:
+          - self.init: Parsed schedule YAML file
+        """
+        return loadConfig(path).schedule
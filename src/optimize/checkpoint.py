@@ -0,0 +1,201 @@
+"""
+`checkpoint` periodically saves the state of a long MILP solve such that it can
+be resumed if the process gets killed. A checkpoint contains
+
+- the incumbent solution (used as a MIP start when resuming)
+- the best objective bound
+- the fingerprint of the model the checkpoint belongs to
+- the solve time already spent
+
+This file is primarily accessed via `optimizer.py`
+"""
+
+# System Modules
+import numpy as np
+import os
+import time
+
+from gurobipy import GRB
+
+# Developed Modules
+from array_store import HEADER, loadArrays, saveArrays
+
+
+##===============================================================================
+#
+class Checkpoint:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, path: str, interval: float, fingerprint: int, prev: dict = None):
+        """
+        Input:
+          - path        : Path of the checkpoint store
+          - interval    : Minimum time between two checkpoints [s]
+          - fingerprint : Fingerprint of the model being solved
+          - prev        : Checkpoint being resumed from (if any)
+
+        Output:
+          - NONE
+        """
+        self.path = path
+        self.interval = interval
+        self.fingerprint = fingerprint
+        self.vars = None
+        self.sense = GRB.MINIMIZE
+        self.x = None
+        self.obj = float("nan")
+        self.bound = float("nan")
+        self.elapsed = 0.0
+        self.runtime = 0.0
+
+        # Carry over the state of the resumed checkpoint
+        if prev:
+            self.x = prev["x"]
+            self.obj = prev["obj"]
+            self.bound = prev["bound"]
+            self.elapsed = prev["runtime"]
+
+        self.dirty = False
+        self.last = time.monotonic()
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __call__(self, model, where):
+        """
+        Gurobi callback that buffers the incumbent/bound and periodically
+        writes them to disk.
+
+        Input:
+          - model : Gurobi model
+          - where : Callback code
+
+        Output:
+          - NONE
+        """
+        if where == GRB.Callback.MIPSOL:
+            ## A new incumbent was found
+            self.x = np.array(model.cbGetSolution(self.vars))
+            self.obj = model.cbGet(GRB.Callback.MIPSOL_OBJ)
+            self.bound = self.__bestBound(model.cbGet(GRB.Callback.MIPSOL_OBJBND))
+            self.runtime = model.cbGet(GRB.Callback.RUNTIME)
+            self.dirty = True
+        elif where == GRB.Callback.MIP:
+            ## Progress update of the branch and bound
+            bound = self.__bestBound(model.cbGet(GRB.Callback.MIP_OBJBND))
+            self.dirty = self.dirty or bound != self.bound
+            self.bound = bound
+            self.runtime = model.cbGet(GRB.Callback.RUNTIME)
+        else:
+            return
+
+        # Only write to disk every `interval` seconds
+        if self.dirty and time.monotonic() - self.last >= self.interval:
+            self.save()
+
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def attach(self, model):
+        """
+        Attach the checkpoint to the variables of a model
+
+        Input:
+          - model : Gurobi model
+
+        Output:
+          - NONE
+        """
+        self.vars = model.getVars()
+        self.sense = model.ModelSense
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def save(self):
+        """
+        Write the checkpoint to disk. The store is swapped in so a checkpoint
+        is never left half written (see `array_store`).
+
+        Input:
+          - NONE
+
+        Output:
+          - Checkpoint store at `self.path`
+        """
+        # Variables
+        data = {
+            "fingerprint": self.fingerprint,
+            "x": self.x,
+            "obj": self.obj,
+            "bound": self.bound,
+            "runtime": self.elapsed + self.runtime,
+        }
+
+        saveArrays(self.path, data)
+
+        self.dirty = False
+        self.last = time.monotonic()
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    @staticmethod
+    def load(path: str):
+        """
+        Load a checkpoint from disk
+
+        Input:
+          - path : Path of the checkpoint store
+
+        Output:
+          - data : Checkpoint dictionary, None if there is no checkpoint
+        """
+        if not os.path.isfile(os.path.join(path, HEADER)):
+            return None
+
+        return loadArrays(path)
+
+    ##---------------------------------------------------------------------------
+    #
+    @staticmethod
+    def modelFingerprint(model) -> int:
+        """
+        Fingerprint of the model. Must be queried before any MIP start is set
+        as the start values are part of the fingerprint.
+
+        Input:
+          - model : Gurobi model
+
+        Output:
+          - fingerprint : Fingerprint of the model
+        """
+        model.update()
+        return model.Fingerprint
+
+    ##===========================================================================
+    # PRIVATE
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __bestBound(self, bound: float) -> float:
+        """
+        Keep the tightest bound seen by this run or any run it resumed.
+
+        Input:
+          - bound : Bound reported by the solver
+
+        Output:
+          - bound : Tightest bound
+        """
+        if np.isnan(self.bound):
+            return bound
+        if self.sense == GRB.MINIMIZE:
+            return max(self.bound, bound)
+        return min(self.bound, bound)
@@ -0,0 +1,661 @@
+"""
+`column_generation` solves the position allocation problem with a column
+generation formulation instead of the compact big-M MILP whose size grows as
+N^2.
+
+A column is a feasible visit sequence for one charger: a set of visits, each
+with a start time and a time slot reserved on the charger, that do not overlap.
+The master problem picks at most one column per charger such that every visit is
+covered exactly once while respecting the charge dynamics of each bus:
+
+    min  sum_k c_k lambda_k + sum_iq e_q g_iq
+    s.t. sum_{k : i in k} lambda_k          = 1     (cover)     forall i
+         sum_{k in K_q} p_ik lambda_k - g_iq >= 0     (capacity)  forall i,q
+         sum_{k in K_q} lambda_k           <= 1     (convexity) forall q
+         eta_i + sum_q g_iq r_q - l_i       = eta_gamma_i       forall i
+         eta_i + sum_q g_iq r_q - l_i      >= nu kappa          forall i
+         eta_i + sum_q g_iq r_q            <= kappa             forall i
+         eta_i                              = alpha_i kappa     (first visits)
+         eta_i                             >= beta_i kappa      (last visits)
+
+where `c_k` is the assignment cost of the column, `p_ik` the slot the column
+reserves for visit `i` and `g_iq` the time visit `i` actually charges on charger
+`q`, which may be shorter than its slot. Cover, minimum and final charge
+constraints have penalized artificial slacks so the restricted master is always
+feasible.
+
+The pricing problem of each charger is a resource constrained shortest path
+over the visits ordered by arrival time, where the resource is the time the
+charger becomes free. As the reduced cost of a visit is linear in the length of
+its slot, only the slots ending at the departure time or at the arrival or
+departure of one of the following visits are considered. Once no column prices out, a dive fixes the
+largest fractional column and prices again until every charger has a column.
+Finally, the master is solved as a MIP over all generated columns and their
+copies on identical chargers (price-and-branch).
+
+The value of the master LP together with the best reduced cost of each charger
+gives a Lagrangian lower bound. It is a bound for the column space searched by
+the pricing (visits ordered by arrival, the duration breakpoints above and the
+label beam), and is only taken from master LPs that use no artificial slack.
+A final MIP solution that uses an artificial slack is not a schedule.
+"""
+
+# Standard Library
+import gurobipy as gp
+import numpy as np
+import time
+
+from gurobipy import GRB
+
+# Developed Modules
+from config_loader import loadConfig
+from data_manager import DataManager
+from dict_util import merge_dicts
+from quin_modified import QuinModified
+from run_context import RunContext
+
+
+##===============================================================================
+#
+class ColumnGeneration:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, c_path="./config", beam: int = 64, breaks: int = 3, n_cols: int = 5, ctx: RunContext = None):
+        """
+        Initialize the column generation solver
+
+        Input:
+          - c_path : Path to configuration directory, or its `Config`
+          - beam   : Maximum number of labels kept per charger in the pricing
+          - breaks : Number of following visits whose arrival and departure
+                     are used as slot breakpoints in the pricing
+          - n_cols : Maximum number of columns priced per charger and round
+          - ctx    : Run context, default: the `DataManager`
+
+        Output
+           - None
+        """
+        self.dm = DataManager() if ctx is None else ctx  # Run context
+        self.c_path = c_path
+        self.time_lim, self.verbose = self.__parseYAML(c_path)
+        self.beam = beam
+        self.breaks = breaks
+        self.n_cols = n_cols
+        self.max_iter = 500  # Maximum pricing rounds
+        self.big = 1e7  # Cost of the artificial slacks
+        self.eps = 1e-6  # Reduced cost tolerance
+        self.lp_bound = float("nan")  # Value of the root master LP
+        self.lower_bound = float("nan")  # Lagrangian bound
+        self.feasible = False  # Whether a schedule without slacks was found
+        self.columns = []  # Generated columns
+        self.keys = set()  # Signatures of the generated columns
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def optimize(self):
+        """
+        Solve the position allocation problem with price-and-branch
+
+        Input
+          - None
+
+        Output
+          - Charging schedule, None if the columns do not combine into a
+            schedule without artificial slacks
+        """
+        # Variables
+        start = time.perf_counter()
+
+        # Set up the restricted master with the Quin-Modified columns
+        self.__buildMaster()
+        for col in self.__initialColumns():
+            self.__addColumn(col)
+
+        print("====================================================================")
+        print("Column Generation")
+        print("====================================================================")
+
+        # Root: price columns until none has a negative reduced cost
+        self.lower_bound = self.__priceColumns(start, bound=True)
+
+        print("LP: {0:.2f}, lower bound: {1:.2f}, columns: {2}".format(
+            self.lp_bound, self.lower_bound, len(self.columns)))
+
+        # Dive to generate columns that combine into an integer solution
+        root = self.lp_bound
+        self.__dive(start)
+        self.lp_bound = root
+
+        # Price-and-branch: solve the master over the generated columns and
+        # their copies on the identical chargers
+        self.__copyColumns()
+        for lam in self.lam:
+            lam.LB = 0.0
+            lam.UB = 1.0
+            lam.VType = GRB.BINARY
+        self.master.setParam("TimeLimit", max(1, self.time_lim - (time.perf_counter() - start)))
+        self.master.optimize()
+
+        return self.__formatResults()
+
+    ##===========================================================================
+    # PRIVATE
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __parseYAML(self, path):
+        """
+        Input:
+          - path: Path to the configuration directory, or its `Config`
+
+        Output:
+          - time_lim : Solver time limit
+          - verbose  : Verbose output
+        """
+        cfg = loadConfig(path)
+        return cfg.time_limit, cfg.verbose
+
+    ##---------------------------------------------------------------------------
+    #
+    def __buildMaster(self):
+        """
+        Build the restricted master problem without any columns
+
+        Input:
+          - None
+
+        Output:
+          - self.master : Gurobi model of the master problem
+        """
+        # Unpack input variables
+        dm = self.dm
+        self.N = N = dm["N"]
+        self.Q = Q = dm["Q"]
+        self.a = np.asarray(dm["a"], dtype=float)
+        self.t = np.asarray(dm["t"], dtype=float)
+        self.r = np.asarray(dm["r"], dtype=float)
+        self.e = np.asarray(dm["e"], dtype=float)
+        self.m = np.asarray(dm["m"], dtype=float)
+        G = np.asarray(dm["Gamma"], dtype=int)
+        gam = np.asarray(dm["gamma"], dtype=int)
+        alpha = dm["alpha"]
+        beta = dm["beta"]
+        l = dm["l"]
+        nu = dm["nu"]
+        kap = np.asarray(dm["kappa"], dtype=float)[G]
+
+        # Visits ordered by arrival for the pricing
+        self.order = np.argsort(self.a, kind="stable")
+        a_sorted = self.a[self.order]
+
+        # Times other than the departure at which a slot may end: the arrival
+        # and departure times of the following visits
+        self.ends = [None] * N
+        for k, i in enumerate(self.order):
+            j = np.searchsorted(a_sorted, self.a[i], side="right")
+            nxt = self.order[max(j, k + 1) : max(j, k + 1) + self.breaks]
+            pts = np.concatenate([self.a[nxt], self.t[nxt]])
+            self.ends[i] = np.unique(pts[pts < self.t[i]]).tolist()
+
+        # Master problem
+        self.master = m = gp.Model("master")
+        m.setParam("OutputFlag", 0)
+        m.setParam("Threads", 1)
+
+        ## Charge and charge time of each visit. The charge is left free so that
+        ## the minimum charge slacks keep the master feasible.
+        eta = m.addVars(N, lb=-GRB.INFINITY, name="eta")
+        g = m.addVars(N, Q, lb=0.0, obj={(i, q): self.e[q] for i in range(N) for q in range(Q)}, name="g")
+        y = [gp.quicksum(self.r[q] * g[i, q] for q in range(Q)) for i in range(N)]
+
+        ## Artificial slacks
+        s = m.addVars(N, lb=0.0, obj=self.big, name="s_cover")
+        z = m.addVars(N, lb=0.0, obj=self.big, name="s_min")
+        f = m.addVars(N, lb=0.0, obj=self.big, name="s_final")
+
+        ## Constraints the columns enter
+        self.cover = [m.addConstr(s[i] == 1, name="cover_{0}".format(i)) for i in range(N)]
+        self.cap = np.array(
+            [[m.addConstr(-g[i, q] >= 0, name="capacity_{0}_{1}".format(i, q)) for q in range(Q)] for i in range(N)],
+            dtype=object,
+        )
+        self.conv = [m.addConstr(gp.LinExpr() <= 1, name="conv_{0}".format(q)) for q in range(Q)]
+
+        ## Charge dynamics
+        for i in range(N):
+            if alpha[i] > 0:
+                m.addConstr(eta[i] == alpha[i] * kap[i], name="initial_charge_{0}".format(i))
+            if gam[i] >= 0:
+                m.addConstr(eta[i] + y[i] - l[i] == eta[gam[i]], name="charge_propagation_{0}".format(i))
+            if beta[i] > 0:
+                m.addConstr(eta[i] + f[i] >= beta[i] * kap[i], name="final_charge_{0}".format(i))
+            m.addConstr(eta[i] + y[i] - l[i] + z[i] >= nu * kap[i], name="min_charge_{0}".format(i))
+            m.addConstr(eta[i] + y[i] <= kap[i], name="max_charge_{0}".format(i))
+
+        self.eta = eta
+        self.g = g
+        self.s = s
+        self.slacks = list(s.values()) + list(z.values()) + list(f.values())
+        self.lam = []
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __priceColumns(self, start, bound=False):
+        """
+        Solve the master LP and add the columns with a negative reduced cost
+        until none is left.
+
+        Input:
+          - start : Start time of the solve
+          - bound : Compute the Lagrangian bound
+
+        Output:
+          - lower_bound : Best Lagrangian bound (NaN if not computed)
+        """
+        # Variables
+        lower_bound = float("nan")
+
+        for it in range(self.max_iter):
+            self.master.optimize()
+            self.lp_bound = self.master.ObjVal
+
+            ## Duals of the master
+            pi = np.array(self.master.getAttr("Pi", self.cover))
+            theta = np.array(self.master.getAttr("Pi", self.cap.ravel().tolist())).reshape(self.N, self.Q)
+            mu = np.array(self.master.getAttr("Pi", self.conv))
+
+            ## Price a column for each charger
+            added = 0
+            min_rc = np.zeros(self.Q)
+            for q in range(self.Q):
+                for col in self.__price(q, pi, theta[:, q], mu[q]):
+                    min_rc[q] = min(min_rc[q], col["rc"])
+                    if col["rc"] < -self.eps and self.__addColumn(col):
+                        added += 1
+
+            ## Each charger uses at most one column, so the LP value plus the
+            ## best reduced cost of each charger bounds the integer solution.
+            ## An LP that needs the artificial slacks only bounds their cost.
+            if bound and self.__slack() <= self.eps:
+                lower_bound = np.fmax(lower_bound, self.lp_bound + min_rc.sum())
+
+            if self.verbose > 0:
+                print("{0:4d}: LP {1:.2f}, bound {2:.2f}, {3} columns added".format(
+                    it, self.lp_bound, lower_bound, added))
+
+            if added == 0 or time.perf_counter() - start > self.time_lim / 2:
+                break
+
+        # Make sure the solution covers the columns added last
+        if added:
+            self.master.optimize()
+
+        return lower_bound
+
+    ##---------------------------------------------------------------------------
+    #
+    def __dive(self, start):
+        """
+        Repeatedly fix the column with the largest fractional value and price
+        the remaining problem. Each fix uses up a charger, so there are at most
+        Q rounds.
+
+        Input:
+          - start : Start time of the solve
+
+        Output:
+          - Columns generated along the dive
+        """
+        # Variables
+        fixed = set()  # Chargers with a fixed column
+        covered = set()  # Visits covered by the fixed columns
+
+        for _ in range(self.Q):
+            if time.perf_counter() - start > self.time_lim / 2:
+                break
+
+            ## Select the largest column that does not clash with the fixed ones
+            x = np.array(self.master.getAttr("X", self.lam))
+            for k, col in enumerate(self.columns):
+                if col["q"] in fixed or covered.intersection(col["visits"].tolist()):
+                    x[k] = -1.0
+            k = int(np.argmax(x))
+
+            if x[k] < self.eps:
+                break
+
+            ## Fix the column, forbid it if the master becomes infeasible
+            self.lam[k].LB = 1.0
+            self.master.optimize()
+            if self.master.Status != GRB.OPTIMAL:
+                self.lam[k].LB = 0.0
+                self.lam[k].UB = 0.0
+                self.master.optimize()
+                continue
+
+            fixed.add(self.columns[k]["q"])
+            covered.update(self.columns[k]["visits"].tolist())
+            self.__priceColumns(start)
+
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __copyColumns(self):
+        """
+        Copy every column to the chargers with the same rate and usage cost. A
+        visit sequence feasible on one charger is feasible on any identical
+        charger, only its assignment cost differs.
+
+        Input:
+          - None
+
+        Output:
+          - Copies added to the master
+        """
+        for col in list(self.columns):
+            for q in range(self.Q):
+                if q != col["q"] and self.r[q] == self.r[col["q"]] and self.e[q] == self.e[col["q"]]:
+                    self.__addColumn(self.__makeColumn(q, col["visits"], col["u"], col["p"]))
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __initialColumns(self):
+        """
+        Seed the master with the charger sequences of the Quin-Modified
+        schedule.
+
+        Input:
+          - None
+
+        Output:
+          - cols : One column per charger used by Quin-Modified
+        """
+        # Variables
+        cols = []
+
+        QuinModified(self.c_path, ctx=self.dm).optimize()
+        u = np.asarray(self.dm["u"], dtype=float)
+        c = np.asarray(self.dm["c"], dtype=float)
+        v = np.asarray(self.dm["v"], dtype=int)
+
+        for q in range(self.Q):
+            idx = np.flatnonzero(v == q)
+            if len(idx):
+                cols.append(self.__makeColumn(q, idx, u[idx], c[idx] - u[idx]))
+
+        return cols
+
+    ##---------------------------------------------------------------------------
+    #
+    def __makeColumn(self, q, visits, u, p, rc=0.0):
+        """
+        Input:
+          - q      : Charger of the column
+          - visits : Visits of the sequence
+          - u      : Start charge time of each visit
+          - p      : Slot reserved for each visit
+          - rc     : Reduced cost of the column
+
+        Output:
+          - col : Column dictionary
+        """
+        p = np.maximum(p, 0.0)
+        return {
+            "q": q,
+            "visits": np.asarray(visits, dtype=int),
+            "u": np.asarray(u, dtype=float),
+            "p": p,
+            "cost": len(visits) * self.m[q],
+            "rc": rc,
+        }
+
+    ##---------------------------------------------------------------------------
+    #
+    def __addColumn(self, col):
+        """
+        Add a column to the restricted master unless it is already part of it
+
+        Input:
+          - col : Column dictionary
+
+        Output:
+          - added : Whether the column was added
+        """
+        # Variables
+        q = col["q"]
+        key = (q, tuple(col["visits"]), tuple(np.round(col["p"], 9)))
+
+        if key in self.keys:
+            return False
+        constrs = [self.cover[i] for i in col["visits"]]
+        constrs += self.cap[col["visits"], q].tolist()
+        constrs += [self.conv[q]]
+        coeffs = [1.0] * len(col["visits"]) + col["p"].tolist() + [1.0]
+
+        lam = self.master.addVar(
+            lb=0.0,
+            ub=1.0,
+            obj=col["cost"],
+            column=gp.Column(coeffs, constrs),
+            name="lambda_{0}".format(len(self.lam)),
+        )
+
+        self.lam.append(lam)
+        self.columns.append(col)
+        self.keys.add(key)
+        return True
+
+    ##---------------------------------------------------------------------------
+    #
+    def __price(self, q, pi, theta, mu):
+        """
+        Find the visit sequences of charger `q` with the most negative reduced
+        cost. The labels are the pareto front of (time the charger is free,
+        reduced cost) pairs.
+
+        Input:
+          - q     : Charger of interest
+          - pi    : Duals of the cover constraints
+          - theta : Duals of the capacity constraints of charger q
+          - mu    : Dual of the convexity constraint of charger q
+
+        Output:
+          - cols : Up to `n_cols` best columns, cheapest first
+        """
+        # Reduced cost of a slot of p hours for visit i: base[i] + slope[i]*p
+        base = (self.m[q] - pi).tolist()
+        slope = (-theta).tolist()
+        a = self.a.tolist()
+        t = self.t.tolist()
+        ends = self.ends
+        eps = self.eps
+
+        # Label: (free time, reduced cost, path)
+        labels = [(0.0, 0.0, None)]
+
+        for i in self.order.tolist():
+            ext = []
+
+            for free, cost, path in labels:
+                ## Labels are sorted by free time
+                if free > t[i]:
+                    break
+
+                u = max(a[i], free)
+
+                ## Candidate durations
+                durations = [0.0]
+                if slope[i] < 0:
+                    durations += [x - u for x in ends[i] if x > u]
+                    durations.append(t[i] - u)
+
+                for p in durations:
+                    d = base[i] + slope[i] * p
+                    if d < -eps:
+                        ext.append((u + p, cost + d, (i, u, p, path)))
+
+            if ext:
+                labels = self.__pareto(labels + ext)
+
+        # Cheapest labels
+        cols = []
+        for free, cost, path in sorted(labels, key=lambda x: x[1])[: self.n_cols]:
+            if path is None:
+                break
+
+            visits, u, p = [], [], []
+            while path is not None:
+                i, ui, pi_, path = path
+                visits.append(i)
+                u.append(ui)
+                p.append(pi_)
+
+            cols.append(self.__makeColumn(q, visits[::-1], u[::-1], np.array(p[::-1]), cost - mu))
+
+        return cols
+
+    ##---------------------------------------------------------------------------
+    #
+    def __pareto(self, labels):
+        """
+        Remove the dominated labels and keep the `beam` cheapest ones.
+
+        Input:
+          - labels : List of labels
+
+        Output:
+          - labels : Non-dominated labels sorted by free time
+        """
+        # Variables
+        front = []
+        best = float("inf")
+
+        for lbl in sorted(labels, key=lambda x: (x[0], x[1])):
+            if lbl[1] < best:
+                front.append(lbl)
+                best = lbl[1]
+
+        if len(front) > self.beam:
+            front = sorted(sorted(front, key=lambda x: x[1])[: self.beam])
+
+        return front
+
+    ##---------------------------------------------------------------------------
+    #
+    def __reassignIdle(self, u, c, v):
+        """
+        Move the visits that do not charge to the cheapest charger with an
+        instant in their window that is not inside another charge. Visits that
+        could not be covered are placed the same way.
+
+        Input:
+          - u : Start charge times
+          - c : Detach times
+          - v : Assigned chargers (-1 if not covered)
+
+        Output:
+          - u, c, v updated in place
+        """
+        for i in np.flatnonzero(c - u <= 0):
+            for q in np.argsort(self.m, kind="stable"):
+                if v[i] >= 0 and self.m[q] >= self.m[v[i]]:
+                    break
+
+                ## Candidate instants: arrival and the end of each charge
+                busy = (v == q) & (c > u)
+                pts = np.concatenate([[self.a[i]], c[busy]])
+                pts = np.sort(pts[(pts >= self.a[i]) & (pts <= self.t[i])])
+                free = [x for x in pts if not np.any((u[busy] < x) & (x < c[busy]))]
+
+                if free:
+                    u[i] = c[i] = free[0]
+                    v[i] = q
+                    break
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __slack(self) -> float:
+        """
+        Input:
+          - None
+
+        Output:
+          - slack : Largest artificial slack of the current master solution
+        """
+        return max(self.master.getAttr("X", self.slacks), default=0.0)
+
+    ##---------------------------------------------------------------------------
+    #
+    def __formatResults(self):
+        """
+        Format the price-and-branch solution so that it can be plotted
+
+        Input:
+          - None
+
+        Output:
+          - results : Parameters and decision variables, None if the master has
+                      no solution without artificial slacks
+        """
+        # Variables
+        N = self.N
+        Q = self.Q
+        u = np.zeros(N)
+        v = -1 * np.ones(N, dtype=int)
+        w = np.zeros((N, Q), dtype=int)
+
+        # A solution relying on the artificial slacks is not a schedule
+        self.feasible = self.master.SolCount > 0 and self.__slack() <= self.eps
+
+        if self.master.SolCount == 0:
+            print("WARNING: No integer solution found")
+            return None
+
+        if not self.feasible:
+            print("WARNING: No schedule found without violating the cover or charge constraints")
+            return None
+
+        # Apply the selected columns
+        eta = np.array(self.master.getAttr("X", self.eta.values()))
+        g = np.array(self.master.getAttr("X", self.g.values())).reshape(N, Q)
+        for lam, col in zip(self.lam, self.columns):
+            if lam.X < 0.5:
+                continue
+            idx = col["visits"]
+            u[idx] = col["u"]
+            v[idx] = col["q"]
+            w[idx, col["q"]] = 1
+
+        ## Charge from the start of the slot for as long as needed
+        c = u + g.sum(axis=1)
+        self.__reassignIdle(u, c, v)
+        w[v >= 0] = np.eye(Q, dtype=int)[v[v >= 0]]
+
+        print("Objective: {0:.2f}".format(np.sum(w * self.m + g * self.e)))
+
+        # Update data manager
+        self.dm["u"] = u
+        self.dm["c"] = c
+        self.dm["v"] = v
+        self.dm["p"] = c - u
+        self.dm["eta"] = eta
+        self.dm["w"] = w
+        self.dm["g"] = g
+
+        d_var_results = dict(
+            (k, self.dm.m_decision_var[k])
+            for k in self.dm.m_decision_var.keys()
+            if k != "model"
+        )
+
+        return merge_dicts(self.dm.m_params, d_var_results)
@@ -0,0 +1,292 @@
+"""
+`edf` builds a charging schedule with an earliest-deadline-first rule instead of
+the priority bands of Quin-Modified.
+
+The charge of a bus must stay above `nu` of its capacity after every route (and
+above `beta` on its final arrival), which gives a requirement on the energy
+delivered to the bus up to each of its visits. These requirements are computed
+for every visit at once with cumulative sums of the discharges along the visits
+of each bus. At a visit, the bus must get the energy it could not get at its
+next visits before its next requirement, assuming they charge at `rate` for
+their whole rest time. Charging no more than that keeps the schedule cheap.
+
+The next visit of each bus waits in a heap, ordered by urgency: the energy the
+visit must get divided by its rest time. The most urgent visit is assigned the
+cheapest charger (assignment cost `m` plus usage cost `e`) with the free time
+to deliver its energy, or the charger that delivers the most otherwise.
+"""
+
+# Standard Library
+import heapq
+
+import numpy as np
+
+# Developed Modules
+from booking_index import BookingIndex
+from data_manager import DataManager
+from dict_util import merge_dicts
+from run_context import RunContext
+
+
+##===============================================================================
+#
+class EDF:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, rate: float = None, ctx: RunContext = None):
+        """
+        Initialize the earliest-deadline-first heuristic
+
+        Input:
+          - rate : Charge rate assumed for the next visits of a bus [kw],
+                   default: the slowest charger
+          - ctx  : Run context, default: the `DataManager`
+
+        Output:
+          - None
+        """
+        self.dm = DataManager() if ctx is None else ctx  # Run context
+        self.rate = rate
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def construct(self) -> dict:
+        """
+        Build a charging schedule. The data manager is left untouched so the
+        schedule can be used as a MILP warm start.
+
+        Input:
+          - None
+
+        Output:
+          - results : Decision variables of the schedule (`u`, `c`, `v`, `p`,
+                      `eta`, `g`, `w`)
+        """
+        self.__setup()
+
+        # Variables
+        N, Q = self.N, self.Q
+        a, t, r, m, e = self.a, self.t, self.r, self.m, self.e
+        u = np.copy(a)
+        c = np.copy(a)
+        v = -np.ones(N, dtype=int)
+        before = np.zeros(N)  # Energy delivered to the bus before each visit
+        index = BookingIndex(Q)
+        done = {}  # Energy delivered to each bus
+
+        # First visit of each bus
+        heap = []
+        for i in self.first:
+            heapq.heappush(heap, self.__key(i, 0.0))
+
+        while heap:
+            _, _, i = heapq.heappop(heap)
+            b = self.G[i]
+            D = done.get(b, 0.0)
+            before[i] = D
+
+            ## Energy the visit must deliver
+            E = min(self.__must(i, D), self.cap[i] - D)
+
+            ## Cheapest charger delivering it, or the one delivering the most
+            if E > 1e-9:
+                best = None
+                for q in range(Q):
+                    s, d = index.place(q, a[i], t[i], E / r[q])
+                    full = r[q] * d >= E - 1e-9
+                    key = (not full, 0.0 if full else -r[q] * d, m[q] + e[q] * d)
+                    if d > 0 and (best is None or key < best[0]):
+                        best = (key, q, s, d)
+
+                if best is not None:
+                    _, q, s, d = best
+                    v[i], u[i], c[i] = q, s, s + d
+                    index.book(i, q, s, s + d)
+                    D += r[q] * d
+
+            done[b] = D
+
+            ## Next visit of the bus
+            if self.gam[i] >= 0:
+                heapq.heappush(heap, self.__key(self.gam[i], D))
+
+        # Decision variables
+        on = v >= 0
+        w = np.zeros((N, Q), dtype=int)
+        g = np.zeros((N, Q), dtype=float)
+        w[on, v[on]] = 1
+        g[on, v[on]] = c[on] - u[on]
+
+        return {
+            "u": u,
+            "c": c,
+            "v": v,
+            "p": c - u,
+            "eta": self.eta0 + before - self.Lx,
+            "g": g,
+            "w": w,
+        }
+
+    ##---------------------------------------------------------------------------
+    #
+    def optimize(self):
+        """
+        Generate a charging schedule with the earliest-deadline-first rule
+
+        Input:
+          - None
+
+        Output:
+          - Charging schedule
+        """
+        s = self.construct()
+
+        # Update data manager
+        for k in ["u", "c", "p", "eta", "g", "w"]:
+            self.dm[k] = s[k]
+        self.dm["v"] = [int(x) for x in s["v"]]
+
+        # Save Results
+        ## Extract all the decision variable results
+        d_var_results = dict(
+            (k, self.dm.m_decision_var[k])
+            for k in self.dm.m_decision_var.keys()
+            if k != "model"
+        )
+
+        results = merge_dicts(self.dm.m_params, d_var_results)  # Update results
+
+        return results
+
+    ##===========================================================================
+    # PRIVATE
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __setup(self):
+        """
+        Unpack the parameters and compute the energy requirements of every visit
+
+        Input:
+          - None
+
+        Output:
+          - None
+        """
+        dm = self.dm
+
+        # Parameters
+        self.N = N = int(dm["N"])
+        self.Q = int(dm["Q"])
+        self.G = G = np.asarray(dm["Gamma"], dtype=int)
+        self.a = a = np.asarray(dm["a"], dtype=float)
+        self.t = t = np.asarray(dm["t"], dtype=float)
+        self.r = np.asarray(dm["r"], dtype=float)
+        self.m = np.asarray(dm["m"], dtype=float)
+        self.e = np.asarray(dm["e"], dtype=float)
+        self.gam = gam = np.asarray(dm["gamma"], dtype=int)
+        kap = np.asarray(dm["kappa"], dtype=float)[G]
+        l = np.asarray(dm["l"], dtype=float)
+        alp = np.asarray(dm["alpha"], dtype=float)[:N]
+        beta = np.asarray(dm["beta"], dtype=float)
+        nu = float(dm["nu"])
+        self.rho = rho = float(np.min(self.r)) if self.rate is None else float(self.rate)
+
+        # Visits grouped by bus in order of arrival
+        idx = np.lexsort((a, G))
+        grp = np.cumsum(np.r_[True, G[idx[1:]] != G[idx[:-1]]]) - 1
+        start = np.flatnonzero(np.r_[True, grp[1:] != grp[:-1]])[grp]
+        self.first = idx[np.r_[True, grp[1:] != grp[:-1]]]
+
+        # Initial charge and discharge up to (excluding/including) each visit
+        self.eta0 = np.empty(N)
+        self.eta0[idx] = kap[idx[start]] * alp[idx[start]]
+        Li = np.empty(N)
+        Li[idx] = self.__groupCumsum(l[idx], start)
+        self.Lx = Li - l
+
+        # Energy needed by each visit to keep the charge above its bounds after
+        # the route
+        lim = np.where(gam >= 0, np.maximum(nu, beta[np.maximum(gam, 0)]), nu)
+        req = lim * kap + Li - self.eta0
+
+        # Energy that must be delivered by each visit, assuming the next visits
+        # charge at `rho` for their whole rest time
+        rest = np.maximum(t - a, 0.0)
+        RC = np.empty(N)
+        RC[idx] = self.__groupCumsum(rest[idx], start)
+        late = np.empty(N)
+        late[idx] = self.__groupSuffixMax((req - rho * RC)[idx], grp)
+        self.late, self.RC, self.rest = late, RC, rest  # See `__must`
+
+        # Energy the bus can take before each visit without exceeding its
+        # capacity
+        self.cap = kap + self.Lx - self.eta0
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __must(self, i: int, D: float) -> float:
+        """
+        Input:
+          - i : Visit index
+          - D : Energy delivered to the bus before visit i [kwh]
+
+        Output:
+          - E : Energy visit i must deliver [kwh]
+        """
+        return max(0.0, self.late[i] + self.rho * self.RC[i] - D)
+
+    ##---------------------------------------------------------------------------
+    #
+    def __key(self, i: int, D: float) -> tuple:
+        """
+        Input:
+          - i : Visit index
+          - D : Energy delivered to the bus before visit i [kwh]
+
+        Output:
+          - key : Heap key of the visit, most urgent first
+        """
+        E = self.__must(i, D)
+        urgency = E / self.rest[i] if self.rest[i] > 0 else (np.inf if E > 0 else 0.0)
+        return (-urgency, self.a[i], int(i))
+
+    ##---------------------------------------------------------------------------
+    #
+    def __groupCumsum(self, x: np.ndarray, start: np.ndarray) -> np.ndarray:
+        """
+        Input:
+          - x     : Values grouped in contiguous runs
+          - start : Index of the first value of the run of every value
+
+        Output:
+          - cs : Cumulative sum of the values within each run
+        """
+        cs = np.cumsum(x)
+        return cs - cs[start] + x[start]
+
+    ##---------------------------------------------------------------------------
+    #
+    def __groupSuffixMax(self, x: np.ndarray, grp: np.ndarray) -> np.ndarray:
+        """
+        Input:
+          - x   : Values grouped in contiguous runs
+          - grp : Run of every value, increasing
+
+        Output:
+          - sm : Maximum of the value and the values after it within its run
+        """
+        if len(x) == 0:
+            return x
+
+        # Offset the runs so that the running maximum does not leak between them
+        span = np.max(x) - np.min(x) + 1.0
+        off = (grp[-1] - grp) * span
+        return np.maximum.accumulate((x + off)[::-1])[::-1] - off
@@ -0,0 +1,567 @@
+"""
+`lagrangian` computes a lower bound and a feasible schedule for instances that
+are too large for the MILP by Lagrangian relaxation of the charger capacity.
+
+The horizon is split into the K steps of the schedule. A visit may charge on
+any part of any step within its window, and each charger may be occupied by at
+most one bus per step:
+
+    sum_i x_iqk <= 1    forall q, k
+
+Dualizing these packing constraints with multipliers lambda_qk >= 0 decouples
+the buses. The subproblem of a bus picks, for each of its visits, a charger and
+an amount of energy so that the charge of the bus stays within its limits. It
+is solved with a dynamic program over a grid of charge levels, vectorized over
+all the buses. The charge levels are rounded optimistically (up, with one
+grid step of slack on every transition) so that the value of the dynamic
+program never exceeds the value of the continuous subproblem, i.e. the bound
+holds for the MILP.
+
+The multipliers are updated with subgradient steps (Polyak step size). The
+subproblem solutions are repaired into a feasible schedule by placing each
+visit, in order of arrival, in the earliest free slot of the cheapest charger.
+The repair either follows the energy targets of the subproblems or charges
+just enough for the next route.
+"""
+
+# Standard Library
+import bisect
+import numpy as np
+import time
+
+# Developed Modules
+from config_loader import loadConfig
+from data_manager import DataManager
+from dict_util import merge_dicts
+from run_context import RunContext
+
+
+##===============================================================================
+#
+class Lagrangian:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, c_path="./config", levels: int = 64, max_iter: int = 200, ctx: RunContext = None):
+        """
+        Initialize the Lagrangian relaxation
+
+        Input:
+          - c_path   : Path to configuration directory, or its `Config`
+          - levels   : Number of charge levels of the dynamic program
+          - max_iter : Maximum number of subgradient iterations
+          - ctx      : Run context, default: the `DataManager`
+
+        Output
+           - None
+        """
+        self.dm = DataManager() if ctx is None else ctx  # Run context
+        self.time_lim, self.verbose = self.__parseYAML(c_path)
+        self.L = levels
+        self.max_iter = max_iter
+        self.repair_every = 10  # Iterations between two repairs
+        self.chunk = 64  # Visits per block when evaluating the charge costs
+        self.lower_bound = -np.inf  # Best Lagrangian bound
+        self.upper_bound = np.inf  # Objective of the best repaired schedule
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def optimize(self):
+        """
+        Run the subgradient method and return the best repaired schedule
+
+        Input
+          - None
+
+        Output
+          - Charging schedule
+        """
+        # Variables
+        start = time.perf_counter()
+        self.__setup()
+        lam = np.zeros((self.Q, self.K))
+        step = 2.0  # Polyak step scale
+        stall = 0  # Iterations without bound improvement
+        best = None  # Best repaired schedule
+
+        print("====================================================================")
+        print("Lagrangian Relaxation")
+        print("====================================================================")
+
+        for it in range(self.max_iter):
+            ## Solve the bus subproblems
+            F, Fq = self.__chargeCosts(lam)
+            value, E, q = self.__busDP(F, Fq)
+            bound = value - lam.sum()
+
+            if bound > self.lower_bound + 1e-9:
+                self.lower_bound = bound
+                stall = 0
+            else:
+                stall += 1
+                if stall >= 10:
+                    step /= 2
+                    stall = 0
+
+            ## Repair the subproblem solution into a schedule, either following
+            ## its energy targets or only charging what the next route needs
+            if it % self.repair_every == 0 or it == self.max_iter - 1:
+                for target, full in [(E["target"], True), (E["target"], False), (np.zeros(self.N), False)]:
+                    sched = self.__repair(target, q, full)
+                    if sched["feasible"] and sched["J"] < self.upper_bound:
+                        self.upper_bound = sched["J"]
+                        best = sched
+                    elif best is None:
+                        best = sched
+
+            if self.verbose > 0:
+                print("{0:4d}: bound {1:.2f}, best {2:.2f}, step {3:.3f}".format(
+                    it, self.lower_bound, self.upper_bound, step))
+
+            ## Subgradient of the relaxed capacity constraints
+            subgrad = self.__usage(lam, E["relaxed"], q) - 1.0
+            subgrad[(lam <= 0) & (subgrad < 0)] = 0.0
+            norm = np.sum(subgrad**2)
+
+            if (
+                not np.isfinite(bound)
+                or norm < 1e-12
+                or step < 1e-4
+                or time.perf_counter() - start > self.time_lim
+            ):
+                break
+
+            target = self.upper_bound if np.isfinite(self.upper_bound) else 1.1 * abs(bound) + 1.0
+            lam = np.maximum(0.0, lam + step * (target - bound) / norm * subgrad)
+
+        print("Lower bound: {0:.2f}, best schedule: {1:.2f}".format(self.lower_bound, self.upper_bound))
+        if np.isinf(self.lower_bound):
+            print("WARNING: The relaxation is infeasible, so is the problem")
+        if not best["feasible"]:
+            print("WARNING: The repaired schedule violates the charge constraints")
+
+        return self.__formatResults(best)
+
+    ##===========================================================================
+    # PRIVATE
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __parseYAML(self, path):
+        """
+        Input:
+          - path: Path to the configuration directory, or its `Config`
+
+        Output:
+          - time_lim : Solver time limit
+          - verbose  : Verbose output
+        """
+        cfg = loadConfig(path)
+        return cfg.time_limit, cfg.verbose
+
+    ##---------------------------------------------------------------------------
+    #
+    def __setup(self):
+        """
+        Unpack the input parameters and precompute the visit windows and the
+        order of the visits of each bus.
+
+        Input:
+          - None
+
+        Output:
+          - None
+        """
+        # Unpack input variables
+        dm = self.dm
+        self.N = N = dm["N"]
+        self.Q = dm["Q"]
+        self.A = A = dm["A"]
+        self.dt = dt = dm["dt"]
+        self.a = np.asarray(dm["a"], dtype=float)
+        self.t = np.asarray(dm["t"], dtype=float)
+        self.l = np.asarray(dm["l"], dtype=float)
+        self.r = np.asarray(dm["r"], dtype=float)
+        self.e = np.asarray(dm["e"], dtype=float)
+        self.m = np.asarray(dm["m"], dtype=float)
+        self.G = np.asarray(dm["Gamma"], dtype=int)
+        self.gam = np.asarray(dm["gamma"], dtype=int)
+        self.alpha = np.asarray(dm["alpha"], dtype=float)
+        self.beta = np.asarray(dm["beta"], dtype=float)
+        self.nu = dm["nu"]
+        self.kap = np.asarray(dm["kappa"], dtype=float)
+
+        # Time steps covered by the window of each visit and the fraction of
+        # each step within the window
+        self.K = max(int(dm["K"]), int(np.ceil(self.t.max() / dt)) + 1)
+        k0 = np.floor(self.a / dt).astype(int)
+        k1 = np.maximum(np.ceil(self.t / dt).astype(int), k0 + 1)
+        W = int(np.max(k1 - k0))
+        steps = k0[:, None] + np.arange(W)[None, :]
+        lo = np.maximum(self.a[:, None], steps * dt)
+        hi = np.minimum(self.t[:, None], (steps + 1) * dt)
+        self.cap = np.clip(hi - lo, 0.0, dt)  # Hours of each step [hr]
+        self.steps = np.minimum(steps, self.K - 1)
+
+        # Blocks of visits with similar window lengths, each only padded to
+        # the longest window of the block
+        by_len = np.argsort(k1 - k0, kind="stable")
+        self.blocks = [
+            (blk, int(np.max(k1[blk] - k0[blk])))
+            for blk in np.array_split(by_len, max(1, int(np.ceil(N / self.chunk))))
+        ]
+
+        # Visits of each bus in order of arrival: idx[b, j] is the j-th visit
+        # of bus b (-1 if bus b has less than j+1 visits)
+        order = np.lexsort((self.a, self.G))
+        count = np.bincount(self.G, minlength=A)
+        rank = np.arange(N) - np.repeat(np.cumsum(count) - count, count)
+        self.idx = -1 * np.ones((A, max(1, count.max())), dtype=int)
+        self.idx[self.G[order], rank] = order
+
+        # Charge grid of each bus
+        self.h = self.kap / self.L
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __chargeCosts(self, lam):
+        """
+        Cost of delivering energy to each visit given the multipliers. For a
+        charger, the cheapest steps of the window are filled first, which
+        results in a convex piecewise linear cost. The cost of a visit is the
+        minimum over the chargers.
+
+        The energies evaluated are those of the dynamic program transitions:
+        E_id = (d - 1) h + l_i for a change of d charge levels.
+
+        Input:
+          - lam : Multipliers of the capacity constraints
+
+        Output:
+          - F  : Cost of each transition, inf if not possible
+          - Fq : Cheapest charger of each transition
+        """
+        # Variables
+        L = self.L
+        d = np.arange(-L, L + 1)
+        E = np.maximum(0.0, (d[None, :] - 1) * self.h[self.G][:, None] + self.l[:, None])
+        F = np.full(E.shape, np.inf)
+        Fq = np.zeros(E.shape, dtype=int)
+
+        for q in range(self.Q):
+            for blk, W in self.blocks:
+                ## Cost per hour of each step, cheapest first
+                rate = self.e[q] + lam[q, self.steps[blk, :W]] / self.dt
+                cap = self.cap[blk, :W]
+                o = np.argsort(rate, axis=1, kind="stable")
+                rate = np.take_along_axis(rate, o, axis=1)
+                cap = np.take_along_axis(cap, o, axis=1)
+
+                ## Fill the steps with the charge time required
+                g = E[blk] / self.r[q]
+                cost = self.m[q] + self.__fillCost(rate, cap, g)
+
+                better = cost < F[blk]
+                F[blk] = np.where(better, cost, F[blk])
+                Fq[blk] = np.where(better, q, Fq[blk])
+
+        return F, Fq
+
+    ##---------------------------------------------------------------------------
+    #
+    def __fillCost(self, rate, cap, g):
+        """
+        Cost of charging for `g` hours by filling the steps in order
+
+        Input:
+          - rate : Cost per hour of each step, sorted (n, W)
+          - cap  : Hours available in each step (n, W)
+          - g    : Charge times to evaluate (n, D)
+
+        Output:
+          - cost : Cost of each charge time, inf if the window is too short
+        """
+        # Variables
+        n, W = cap.shape
+        T = np.cumsum(cap, axis=1)
+        C = np.cumsum(cap * rate, axis=1)
+        rows = np.arange(n)[:, None]
+
+        # Step each charge time ends in. Offsetting each row makes the
+        # cumulative times of all the rows a single sorted array.
+        off = rows * (T[:, -1].max() + 1.0)
+        k = np.searchsorted((T + off).ravel(), (g + off).ravel()).reshape(g.shape) - rows * W
+        k = np.minimum(k, W - 1)
+
+        T0 = np.where(k > 0, T[rows, k - 1], 0.0)
+        C0 = np.where(k > 0, C[rows, k - 1], 0.0)
+        cost = C0 + (g - T0) * rate[rows, k]
+        cost[g > T[:, -1:] + 1e-9] = np.inf
+
+        return cost
+
+    ##---------------------------------------------------------------------------
+    #
+    def __busDP(self, F, Fq):
+        """
+        Solve the subproblem of every bus with a dynamic program over the charge
+        levels. All the buses are advanced together one visit at a time.
+
+        Input:
+          - F  : Cost of each transition
+          - Fq : Cheapest charger of each transition
+
+        Output:
+          - value : Sum of the subproblem values
+          - E     : Relaxed energy of each visit (used for the subgradient)
+                    and energy target (used by the repair)
+          - q     : Charger of each visit
+        """
+        # Variables
+        A, R = self.idx.shape
+        L = self.L
+        lvl = np.arange(L + 1)
+        d = lvl[None, :] - lvl[:, None]  # d[j, j'] = j' - j
+        V = np.full((A, L + 1), np.inf)
+        arg = np.zeros((A, R, L + 1), dtype=int)
+
+        # Initial charge level, rounded up
+        first = self.idx[:, 0]
+        j0 = np.ceil(self.alpha[first] * self.L - 1e-9).astype(int)
+        V[np.arange(A), np.minimum(j0, L)] = 0.0
+
+        for j in range(R):
+            i = self.idx[:, j]
+            on = i >= 0
+            if not on.any():
+                break
+            b = np.flatnonzero(on)
+            i = i[on]
+
+            ## Final charge of the last visit of each bus
+            last = self.gam[i] < 0
+            jb = np.ceil(self.beta[i] * self.L - 1e-9)
+            V[b] = np.where(last[:, None] & (lvl[None, :] < jb[:, None]), np.inf, V[b])
+
+            ## Limits on the charge level after the visit
+            jmin = np.ceil(self.nu * self.L - 1e-9)
+            jmax = np.floor((self.kap[self.G[i]] - self.l[i]) / self.h[self.G[i]] + 1e-9) + 1
+            ok = (lvl[None, :] >= jmin) & (lvl[None, :] <= jmax[:, None])
+
+            ## Transition
+            cand = V[b][:, :, None] + F[i][:, d + L]
+            cand[~ok[:, None, :].repeat(L + 1, axis=1)] = np.inf
+            arg[b, j] = np.argmin(cand, axis=1)
+            V[b] = np.take_along_axis(cand, arg[b, j][:, None, :], axis=1)[:, 0, :]
+
+        # Back track the charge levels of each bus
+        value = np.sum(np.min(V, axis=1))
+        E = {"relaxed": np.zeros(self.N), "target": np.zeros(self.N)}
+        q = np.zeros(self.N, dtype=int)
+        nxt = np.argmin(V, axis=1)
+
+        for j in range(R - 1, -1, -1):
+            b = np.flatnonzero(self.idx[:, j] >= 0)
+            i = self.idx[b, j]
+            cur = arg[b, j, nxt[b]]
+            dd = nxt[b] - cur
+
+            E["relaxed"][i] = np.maximum(0.0, (dd - 1) * self.h[self.G[i]] + self.l[i])
+            E["target"][i] = np.maximum(0.0, dd * self.h[self.G[i]] + self.l[i])
+            q[i] = Fq[i, dd + L]
+            nxt[b] = cur
+
+        return value, E, q
+
+    ##---------------------------------------------------------------------------
+    #
+    def __usage(self, lam, E, q):
+        """
+        Occupancy of each charger and step in the subproblem solution
+
+        Input:
+          - lam : Multipliers of the capacity constraints
+          - E   : Relaxed energy of each visit
+          - q : Charger of each visit
+
+        Output:
+          - use : Occupancy of each charger and step
+        """
+        # Variables
+        use = np.zeros((self.Q, self.K))
+        g = E / self.r[q]
+
+        for blk, W in self.blocks:
+            qq = q[blk]
+
+            ## Fill the cheapest steps, as in `__chargeCosts`
+            rate = lam[qq[:, None], self.steps[blk, :W]]
+            cap = self.cap[blk, :W]
+            o = np.argsort(rate, axis=1, kind="stable")
+            cap_s = np.take_along_axis(cap, o, axis=1)
+            prev = np.cumsum(cap_s, axis=1) - cap_s
+            fill = np.clip(g[blk][:, None] - prev, 0.0, cap_s)
+
+            st = np.take_along_axis(self.steps[blk, :W], o, axis=1)
+            np.add.at(use, (np.repeat(qq, st.shape[1]), st.ravel()), fill.ravel() / self.dt)
+
+        return use
+
+    ##---------------------------------------------------------------------------
+    #
+    def __repair(self, target, q_hint, full):
+        """
+        Build a feasible schedule from the energy targets of the subproblems.
+        Visits are placed in order of arrival on the cheapest charger with a
+        slot that can deliver the whole target (`full`) or at least the charge
+        the next route needs. The charger of the subproblem breaks ties. As
+        much of the target as fits in the slot is delivered.
+
+        Input:
+          - target : Energy target of each visit
+          - q_hint : Charger of each visit in the subproblem
+          - full   : Only accept a charger that delivers the whole target
+
+        Output:
+          - sched : Schedule dictionary
+        """
+        # Variables
+        N = self.N
+        Q = self.Q
+        u = np.zeros(N)
+        c = np.zeros(N)
+        v = np.zeros(N, dtype=int)
+        eta = self.alpha * self.kap[self.G]  # Charge at the start of each visit
+        starts = [[] for _ in range(Q)]  # Sorted start times of each charger
+        ends = [[] for _ in range(Q)]  # Matching end times
+        feasible = True
+
+        for i in np.argsort(self.a, kind="stable").tolist():
+            b = self.G[i]
+            kap = self.kap[b]
+
+            ## Energy to deliver: the target plus one level of margin, at
+            ## least the minimum charge and at most the battery capacity
+            room = max(0.0, kap - eta[i])
+            need = min(max(0.0, self.nu * kap + self.l[i] - eta[i]), room)
+            want = min(max(target[i] + self.h[b], need), room) if target[i] > 0 else need
+
+            ## Candidate chargers
+            cost = self.m + self.e * want / self.r
+            cost[q_hint[i]] -= 1e-9
+            cands = np.argsort(cost, kind="stable").tolist()
+
+            best = None
+            for q in cands:
+                s, dur = self.__freeSlot(starts[q], ends[q], self.a[i], self.t[i], want / self.r[q])
+                if s is None:
+                    continue
+                if best is None or dur * self.r[q] > best[2] * self.r[best[0]] + 1e-9:
+                    best = (q, s, dur)
+                if dur * self.r[q] >= (want if full else need) - 1e-9:
+                    best = (q, s, dur)
+                    break
+
+            if best is None:
+                feasible = False
+                q, s, dur = int(np.argmin(self.m)), self.a[i], 0.0
+            else:
+                q, s, dur = best
+
+            ## Reserve the slot. An empty slot goes before the reservations
+            ## starting at the same time to keep the end times sorted.
+            k = bisect.bisect_right(starts[q], s) if dur > 0 else bisect.bisect_left(starts[q], s)
+            starts[q].insert(k, s)
+            ends[q].insert(k, s + dur)
+            u[i], c[i], v[i] = s, s + dur, q
+
+            ## Propagate the charge, the battery can neither drop below the
+            ## minimum charge nor be charged above its capacity
+            after = eta[i] + dur * self.r[q] - self.l[i]
+            feasible = feasible and after >= self.nu * kap - 1e-6
+            feasible = feasible and eta[i] + dur * self.r[q] <= kap + 1e-6
+            if self.gam[i] >= 0:
+                eta[self.gam[i]] = after
+            else:
+                feasible = feasible and eta[i] >= self.beta[i] * kap - 1e-6
+
+        # Objective
+        g = np.zeros((N, Q))
+        g[np.arange(N), v] = c - u
+        J = float(np.sum(self.m[v]) + np.sum(g * self.e))
+
+        return {"u": u, "c": c, "v": v, "eta": eta, "g": g, "J": J, "feasible": feasible}
+
+    ##---------------------------------------------------------------------------
+    #
+    def __freeSlot(self, starts, ends, a, t, dur):
+        """
+        Find the earliest slot of a charger within [a, t] that is free for
+        `dur` hours, or the longest free slot if none is.
+
+        Input:
+          - starts : Sorted start times of the reservations of the charger
+          - ends   : Matching end times
+          - a      : Arrival time
+          - t      : Departure time
+          - dur    : Requested duration
+
+        Output:
+          - s   : Start of the slot (None if there is no free instant)
+          - dur : Duration available from `s`, at most the requested duration
+        """
+        # Variables
+        best = (None, -1.0)
+        cur = a
+
+        for k in range(bisect.bisect_right(ends, a), len(starts) + 1):
+            nxt = min(starts[k], t) if k < len(starts) else t
+            if nxt >= cur:
+                if nxt - cur >= dur:
+                    return cur, dur
+                if nxt - cur > best[1]:
+                    best = (cur, nxt - cur)
+            if k == len(starts) or starts[k] >= t:
+                break
+            cur = max(cur, ends[k])
+
+        return best[0], max(0.0, best[1])
+
+    ##---------------------------------------------------------------------------
+    #
+    def __formatResults(self, sched):
+        """
+        Format the repaired schedule so that it can be plotted
+
+        Input:
+          - sched : Schedule dictionary
+
+        Output:
+          - results : Parameters and decision variables
+        """
+        # Variables
+        w = np.zeros((self.N, self.Q), dtype=int)
+        w[np.arange(self.N), sched["v"]] = 1
+
+        # Update data manager
+        self.dm["u"] = sched["u"]
+        self.dm["c"] = sched["c"]
+        self.dm["v"] = sched["v"]
+        self.dm["p"] = sched["c"] - sched["u"]
+        self.dm["eta"] = sched["eta"]
+        self.dm["w"] = w
+        self.dm["g"] = sched["g"]
+
+        d_var_results = dict(
+            (k, self.dm.m_decision_var[k])
+            for k in self.dm.m_decision_var.keys()
+            if k != "model"
+        )
+
+        return merge_dicts(self.dm.m_params, d_var_results)
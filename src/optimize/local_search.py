@@ -0,0 +1,710 @@
+"""
+`local_search` improves any charging schedule (e.g. the output of Quin-Modified)
+with moves on its `u`/`c`/`v` arrays:
+
+- drop   : Unassign a visit whose energy the bus can do without
+- move   : Move a visit to a cheaper charger, delivering the same energy or as
+           much as the bus can do without
+- load   : Move the energy of a visit to another visit of the same bus on a
+           cheaper (e.g. slow) charger and unassign it
+- swap   : Move a visit to a cheaper charger by moving the visit in the way to
+           another charger (possibly the one being freed)
+- shift  : Start every charge as early as possible to open up room later on
+- trim   : Shorten a charge by the energy the bus can do without
+
+The change of objective of a move is computed in O(1). Whether a bus can do
+without some energy at a visit is also O(1): removing energy lowers the charge
+at every later visit of the bus, so the energy that can be removed is the
+suffix minimum of the charge slack over the visits of the bus, which is only
+recomputed for the buses touched by an accepted move. Moving energy between two
+visits of a bus only changes the charge at the visits in between, whose slack
+is checked in O(1) with a sparse table of range minima, rebuilt in O(n log n)
+with the suffix minimum.
+"""
+
+# Standard Library
+import bisect
+import time
+
+import numpy as np
+
+# Developed Modules
+from data_manager import DataManager
+from dict_util import merge_dicts
+from run_context import RunContext
+
+
+##===============================================================================
+#
+class LocalSearch:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, time_limit: float = 10.0, max_passes: int = 50, ctx: RunContext = None):
+        """
+        Initialize the local search
+
+        Input:
+          - time_limit : Time limit of the search [s]
+          - max_passes : Maximum number of passes over the visits
+          - ctx        : Run context, default: the `DataManager`
+
+        Output:
+          - None
+        """
+        self.dm = DataManager() if ctx is None else ctx  # Run context
+        self.time_limit = time_limit
+        self.max_passes = max_passes
+        self.evaluated = 0  # Number of moves evaluated
+        self.accepted = 0  # Number of moves accepted
+        self.initial_obj = None  # Objective of the input schedule
+        self.obj = None  # Objective of the improved schedule
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def optimize(self, results: dict = None):
+        """
+        Improve a charging schedule
+
+        Input:
+          - results : Schedule to improve (`u`, `c`, `v`), default: the decision
+                      variables in the data manager
+
+        Output:
+          - Improved charging schedule
+        """
+        if results is None:
+            results = self.dm.m_decision_var
+
+        self.__setup(results)
+        self.initial_obj = self.obj = self.__objective()
+
+        start = time.perf_counter()
+        order = np.arange(self.N)
+
+        for _ in range(self.max_passes):
+            improved = False
+            self.__shift()
+
+            # Most expensive assignments first
+            order = sorted(order, key=lambda i: -self.m[self.v[i]] if self.v[i] >= 0 else 0)
+
+            for i in order:
+                if self.v[i] < 0:
+                    continue
+                improved |= self.__drop(i) or self.__move(i) or self.__load(i) or self.__swap(i)
+
+                if time.perf_counter() - start > self.time_limit:
+                    break
+
+            if not improved or time.perf_counter() - start > self.time_limit:
+                break
+
+        for i in range(self.N):
+            if self.v[i] >= 0:
+                self.__trim(i)
+
+        return self.__formatResults()
+
+    ##===========================================================================
+    # PRIVATE
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __setup(self, results: dict):
+        """
+        Unpack the parameters and the schedule
+
+        Input:
+          - results : Schedule to improve
+
+        Output:
+          - None
+        """
+        dm = self.dm
+
+        # Parameters
+        self.N = int(dm["N"])
+        self.Q = int(dm["Q"])
+        self.G = np.asarray(dm["Gamma"], dtype=int)
+        self.a = np.asarray(dm["a"], dtype=float)
+        self.t = np.asarray(dm["t"], dtype=float)
+        self.l = np.asarray(dm["l"], dtype=float)
+        self.r = np.asarray(dm["r"], dtype=float)
+        self.m = np.asarray(dm["m"], dtype=float)
+        self.e = np.asarray(dm["e"], dtype=float)
+        self.kap = np.asarray(dm["kappa"], dtype=float)[self.G]
+        self.alpha = np.asarray(dm["alpha"], dtype=float)
+        self.beta = np.asarray(dm["beta"], dtype=float)
+        self.gam = np.asarray(dm["gamma"], dtype=int)
+        self.nu = float(dm["nu"])
+        self.cheap = np.argsort(self.m, kind="stable")  # Chargers by assignment cost
+
+        # Schedule
+        self.u = np.array(results["u"], dtype=float)
+        self.c = np.array(results["c"], dtype=float)
+        self.v = np.array(results["v"], dtype=int)
+        self.c[self.v < 0] = self.u[self.v < 0]
+
+        # Visits of each bus in order
+        self.bus = {}
+        for i in np.flatnonzero(self.alpha > 0):
+            seq = [int(i)]
+            while self.gam[seq[-1]] >= 0:
+                seq.append(int(self.gam[seq[-1]]))
+            self.bus[int(self.G[i])] = seq
+
+        # Charge and slack of each bus
+        self.pos = np.zeros(self.N, dtype=int)  # Position of a visit in its bus
+        self.eta = np.zeros(self.N)
+        self.slack = np.zeros(self.N)  # Energy the charge after the route can lose
+        self.head = np.zeros(self.N)  # Energy the charge can gain
+        self.room = np.zeros(self.N)  # Energy the visit can do without
+        self.tables = {}  # Range minima of the head and slack of each bus
+        for b in self.bus:
+            self.__updateBus(b)
+
+        # Charges on each charger, sorted by start
+        self.starts = [[] for _ in range(self.Q)]
+        self.ends = [[] for _ in range(self.Q)]
+        self.ids = [[] for _ in range(self.Q)]
+        for i in np.argsort(self.u, kind="stable"):
+            if self.v[i] >= 0 and self.c[i] > self.u[i]:
+                q = self.v[i]
+                self.starts[q].append(self.u[i])
+                self.ends[q].append(self.c[i])
+                self.ids[q].append(int(i))
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __energy(self, i: int) -> float:
+        """
+        Input:
+          - i : Visit index
+
+        Output:
+          - E : Energy delivered at visit i [kwh]
+        """
+        return self.r[self.v[i]] * (self.c[i] - self.u[i]) if self.v[i] >= 0 else 0.0
+
+    ##---------------------------------------------------------------------------
+    #
+    def __updateBus(self, b: int):
+        """
+        Recompute the charge of a bus at each visit and the energy each visit
+        can do without
+
+        Input:
+          - b : Bus ID
+
+        Output:
+          - None
+        """
+        seq = self.bus[b]
+        eta = self.kap[seq[0]] * self.alpha[seq[0]]
+        slack = np.zeros(len(seq))
+
+        # Charge at each visit and slack of the charge left after the route
+        for n, i in enumerate(seq):
+            self.pos[i] = n
+            self.eta[i] = eta
+            eta = eta + self.__energy(i)
+            self.head[i] = self.kap[i] - eta
+            eta = eta - self.l[i]
+            slack[n] = eta - self.nu * self.kap[i]
+
+            ## Final charge of the next visit
+            nxt = self.gam[i]
+            if nxt >= 0 and self.beta[nxt] > 0:
+                slack[n] = min(slack[n], eta - self.beta[nxt] * self.kap[nxt])
+
+        # Suffix minimum
+        self.slack[seq] = slack
+        self.room[seq] = np.minimum.accumulate(slack[::-1])[::-1]
+
+        # Range minima
+        self.tables[b] = (self.__sparseTable(self.head[seq]), self.__sparseTable(slack))
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __sparseTable(self, x: np.ndarray) -> list:
+        """
+        Input:
+          - x : Array of values
+
+        Output:
+          - table : Minimum of x over every range of 2^k values, `table[k][n]`
+                    being the minimum of `x[n : n + 2^k]`
+        """
+        table = [np.array(x, dtype=float)]
+        w = 1
+
+        while 2 * w <= len(x):
+            table.append(np.minimum(table[-1][:-w], table[-1][w:]))
+            w *= 2
+
+        return table
+
+    ##---------------------------------------------------------------------------
+    #
+    def __rangeMin(self, table: list, lo: int, hi: int) -> float:
+        """
+        Input:
+          - table : Sparse table (see `__sparseTable`)
+          - lo    : First position of the range
+          - hi    : Position past the end of the range, greater than `lo`
+
+        Output:
+          - x : Minimum of the values over the range
+        """
+        k = int(hi - lo).bit_length() - 1
+        return min(table[k][lo], table[k][hi - (1 << k)])
+
+    ##---------------------------------------------------------------------------
+    #
+    def __spare(self, i: int, E: float) -> bool:
+        """
+        Input:
+          - i : Visit index
+          - E : Energy removed at visit i [kwh]
+
+        Output:
+          - spare : The bus can do without the energy
+        """
+        return E <= 1e-9 or E <= self.room[i] + 1e-9
+
+    ##---------------------------------------------------------------------------
+    #
+    def __objective(self) -> float:
+        """
+        Output:
+          - J : Assignment plus usage cost of the schedule
+        """
+        on = self.v >= 0
+        q = self.v[on]
+        return float(np.sum(self.m[q] + self.e[q] * (self.c[on] - self.u[on])))
+
+    ##---------------------------------------------------------------------------
+    #
+    def __place(self, q: int, a: float, t: float, need: float, skip: tuple):
+        """
+        Find the free time on charger `q` within [a, t] for a charge of duration
+        `need`: the earliest gap that fits it, or else the longest gap.
+
+        Input:
+          - q    : Charger of interest
+          - a    : Arrival time
+          - t    : Departure time
+          - need : Charge duration
+          - skip : Visits whose charges are ignored
+
+        Output:
+          - s : Start charge time
+          - d : Charge duration, at most `need`
+        """
+        st, en, ids = self.starts[q], self.ends[q], self.ids[q]
+        k = bisect.bisect_right(en, a)
+        s = a
+        best = (a, 0.0)
+
+        while True:
+            if k < len(st) and st[k] < t:
+                if ids[k] in skip:
+                    k += 1
+                    continue
+                end = st[k]
+            else:
+                end = t
+
+            d = end - s
+            if d >= need:
+                return s, need
+            if d > best[1]:
+                best = (s, d)
+            if end >= t:
+                return best
+
+            s = max(s, en[k])
+            k += 1
+
+    ##---------------------------------------------------------------------------
+    #
+    def __remove(self, i: int):
+        """
+        Input:
+          - i : Visit whose charge is removed from its charger
+
+        Output:
+          - None
+        """
+        q = self.v[i]
+        if q < 0 or self.c[i] <= self.u[i]:
+            return
+
+        k = bisect.bisect_left(self.starts[q], self.u[i])
+        while self.ids[q][k] != i:
+            k += 1
+
+        del self.starts[q][k]
+        del self.ends[q][k]
+        del self.ids[q][k]
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __assign(self, i: int, q: int, u: float, c: float):
+        """
+        Input:
+          - i : Visit index
+          - q : Charger, -1 to unassign the visit
+          - u : Start charge time
+          - c : End charge time
+
+        Output:
+          - None
+        """
+        self.__remove(i)
+        self.v[i], self.u[i], self.c[i] = q, u, c
+
+        if q >= 0 and c > u:
+            k = bisect.bisect_left(self.starts[q], u)
+            self.starts[q].insert(k, u)
+            self.ends[q].insert(k, c)
+            self.ids[q].insert(k, i)
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __accept(self, delta: float, buses: set):
+        """
+        Input:
+          - delta : Change of objective of the move
+          - buses : Buses whose charges changed
+
+        Output:
+          - None
+        """
+        self.obj += delta
+        self.accepted += 1
+        for b in buses:
+            self.__updateBus(b)
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __drop(self, i: int) -> bool:
+        """
+        Unassign a visit if the bus can do without its energy
+
+        Input:
+          - i : Visit index
+
+        Output:
+          - improved : The move was accepted
+        """
+        self.evaluated += 1
+        q = self.v[i]
+
+        if not self.__spare(i, self.__energy(i)):
+            return False
+
+        delta = -self.m[q] - self.e[q] * (self.c[i] - self.u[i])
+        self.__assign(i, -1, self.a[i], self.a[i])
+        self.__accept(delta, {self.G[i]})
+        return True
+
+    ##---------------------------------------------------------------------------
+    #
+    def __move(self, i: int) -> bool:
+        """
+        Move a visit to the cheapest charger that improves the objective
+
+        Input:
+          - i : Visit index
+
+        Output:
+          - improved : The move was accepted
+        """
+        q = self.v[i]
+        E = self.__energy(i)
+        cost = self.m[q] + self.e[q] * (self.c[i] - self.u[i])
+
+        for qq in self.cheap:
+            if self.m[qq] >= cost:
+                break
+            if qq == q:
+                continue
+
+            self.evaluated += 1
+            s, d = self.__place(qq, self.a[i], self.t[i], E / self.r[qq], ())
+
+            ## Energy not delivered must be spared by the bus
+            if not self.__spare(i, E - self.r[qq] * d):
+                continue
+
+            delta = self.m[qq] + self.e[qq] * d - cost
+            if delta < -1e-9:
+                self.__assign(i, qq, s, s + d)
+                self.__accept(delta, {self.G[i]})
+                return True
+
+        return False
+
+    ##---------------------------------------------------------------------------
+    #
+    def __load(self, i: int) -> bool:
+        """
+        Move the energy of a visit to another visit of the same bus and unassign
+        it
+
+        Input:
+          - i : Visit index
+
+        Output:
+          - improved : The move was accepted
+        """
+        q = self.v[i]
+        E = self.__energy(i)
+        cost = self.m[q] + self.e[q] * (self.c[i] - self.u[i])
+        seq = self.bus[self.G[i]]
+        pi = self.pos[i]
+        head, slack = self.tables[self.G[i]]
+
+        for j in seq:
+            pj = self.pos[j]
+            if j == i:
+                continue
+
+            ## Charging earlier raises the charge until visit i, charging later
+            ## lowers it until visit j
+            if pj < pi:
+                if E > self.__rangeMin(head, pj, pi) + 1e-9:
+                    continue
+            elif E > self.__rangeMin(slack, pi, pj) + 1e-9:
+                continue
+
+            self.evaluated += 1
+
+            ## Charge longer on the charger of visit j
+            if self.v[j] >= 0:
+                qj = self.v[j]
+                win = self.__extend(j, E / self.r[qj])
+                if win is None:
+                    continue
+                s, cj = win
+                delta = self.e[qj] * E / self.r[qj] - cost
+            ## Or assign visit j to the cheapest charger it fits on
+            else:
+                for qj in self.cheap:
+                    if self.m[qj] >= cost:
+                        break
+                    need = E / self.r[qj]
+                    s, d = self.__place(qj, self.a[j], self.t[j], need, ())
+                    if d >= need - 1e-12:
+                        break
+                else:
+                    continue
+                if self.m[qj] >= cost:
+                    continue
+                cj = s + need
+                delta = self.m[qj] + self.e[qj] * need - cost
+
+            if delta < -1e-9:
+                self.__assign(i, -1, self.a[i], self.a[i])
+                self.__assign(j, qj, s, cj)
+                self.__accept(delta, {self.G[i]})
+                return True
+
+        return False
+
+    ##---------------------------------------------------------------------------
+    #
+    def __extend(self, j: int, need: float):
+        """
+        Extend the charge of a visit on its charger
+
+        Input:
+          - j    : Visit index
+          - need : Additional charge duration
+
+        Output:
+          - win : New (start, end) charge times, None if it does not fit
+        """
+        q = self.v[j]
+        D = self.c[j] - self.u[j] + need
+        lo, hi = self.a[j], self.t[j]
+
+        # Neighbouring charges
+        if self.c[j] > self.u[j]:
+            k = bisect.bisect_left(self.starts[q], self.u[j])
+            while self.ids[q][k] != j:
+                k += 1
+            if k > 0:
+                lo = max(lo, self.ends[q][k - 1])
+            if k + 1 < len(self.starts[q]):
+                hi = min(hi, self.starts[q][k + 1])
+        else:
+            s, d = self.__place(q, self.a[j], self.t[j], D, ())
+            return (s, s + D) if d >= D - 1e-12 else None
+
+        if hi - lo < D - 1e-12:
+            return None
+
+        u = max(lo, min(self.u[j], hi - D))
+        return u, u + D
+
+    ##---------------------------------------------------------------------------
+    #
+    def __swap(self, i: int) -> bool:
+        """
+        Move a visit to a cheaper charger by moving a visit in the way to another
+        charger
+
+        Input:
+          - i : Visit index
+
+        Output:
+          - improved : The move was accepted
+        """
+        q = self.v[i]
+        Ei = self.__energy(i)
+        ci = self.m[q] + self.e[q] * (self.c[i] - self.u[i])
+
+        for qq in self.cheap:
+            if self.m[qq] >= ci:
+                break
+            if qq == q:
+                continue
+
+            # Visits in the way on the cheaper charger
+            k = bisect.bisect_right(self.ends[qq], self.a[i])
+            while k < len(self.starts[qq]) and self.starts[qq][k] < self.t[i]:
+                j = self.ids[qq][k]
+                k += 1
+                if self.G[j] == self.G[i]:
+                    continue
+
+                ## Visit i takes the place of visit j
+                s, d = self.__place(qq, self.a[i], self.t[i], Ei / self.r[qq], (j,))
+                if not self.__spare(i, Ei - self.r[qq] * d):
+                    continue
+
+                Ej = self.__energy(j)
+                cj = self.m[qq] + self.e[qq] * (self.c[j] - self.u[j])
+
+                ## Visit j goes to any charger but the cheaper one
+                for qj in self.cheap:
+                    if qj == qq:
+                        continue
+
+                    self.evaluated += 1
+                    delta = self.m[qq] - ci + self.m[qj] - cj
+                    if delta >= 0:
+                        break
+
+                    sj, dj = self.__place(qj, self.a[j], self.t[j], Ej / self.r[qj], (i,))
+                    if not self.__spare(j, Ej - self.r[qj] * dj):
+                        continue
+
+                    delta += self.e[qq] * d + self.e[qj] * dj
+                    if delta < -1e-9:
+                        self.__assign(i, -1, self.u[i], self.u[i])
+                        self.__assign(j, qj, sj, sj + dj)
+                        self.__assign(i, qq, s, s + d)
+                        self.__accept(delta, {self.G[i], self.G[j]})
+                        return True
+
+        return False
+
+    ##---------------------------------------------------------------------------
+    #
+    def __shift(self):
+        """
+        Start every charge as early as possible on its charger
+
+        Input:
+          - None
+
+        Output:
+          - None
+        """
+        for q in range(self.Q):
+            prev = 0.0
+            for k, i in enumerate(self.ids[q]):
+                p = self.ends[q][k] - self.starts[q][k]
+                u = max(self.a[i], prev)
+                if u < self.starts[q][k]:
+                    self.u[i], self.c[i] = u, u + p
+                    self.starts[q][k], self.ends[q][k] = u, u + p
+                prev = self.ends[q][k]
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __trim(self, i: int) -> bool:
+        """
+        Shorten a charge by the energy the bus can do without
+
+        Input:
+          - i : Visit index
+
+        Output:
+          - improved : The move was accepted
+        """
+        self.evaluated += 1
+        q = self.v[i]
+        x = min(self.__energy(i), self.room[i]) / self.r[q]
+
+        if x <= 1e-9:
+            return False
+
+        self.__assign(i, q, self.u[i], self.c[i] - x)
+        self.__accept(-self.e[q] * x, {self.G[i]})
+        return True
+
+    ##---------------------------------------------------------------------------
+    #
+    def __formatResults(self):
+        """
+        Format the results so that they can be plotted
+
+        Input:
+          - None
+
+        Output:
+          - Update data manager with decision variables
+        """
+        N, Q = self.N, self.Q
+        on = self.v >= 0
+        w = np.zeros((N, Q), dtype=int)
+        g = np.zeros((N, Q), dtype=float)
+        w[on, self.v[on]] = 1
+        g[on, self.v[on]] = self.c[on] - self.u[on]
+
+        # Update data manager
+        self.dm["c"] = self.c  # Detatch time
+        self.dm["eta"] = self.eta  # Charge at start of visit
+        self.dm["u"] = self.u  # Initial charge times
+        self.dm["v"] = [int(x) for x in self.v]  # Active charger
+        self.dm["p"] = self.c - self.u  # c_i - u_i
+        self.dm["w"] = w
+        self.dm["g"] = g
+
+        # Save Results
+        ## Extract all the decision variable results
+        d_var_results = dict(
+            (k, self.dm.m_decision_var[k])
+            for k in self.dm.m_decision_var.keys()
+            if k != "model"
+        )
+
+        results = merge_dicts(self.dm.m_params, d_var_results)  # Update results
+
+        return results
@@ -0,0 +1,224 @@
+"""
+`online_dispatcher` assigns chargers to buses one arrival at a time, for depots
+where the day is not known up front. Each arrival event is handled with the
+charger selection of the Quin-Modified heuristic against the reservations made
+so far, which are kept in a `FreeSlotIndex` updated after every decision.
+
+An arrival event is a dictionary with the keys
+
+- 'bus'       : ID of the bus
+- 'arrival'   : Arrival time [hr]
+- 'departure' : Departure time [hr]
+- 'discharge' : Discharge over the route following the visit [kwh]
+- 'charge'    : (optional) Charge on arrival [kwh], otherwise the charge left
+                by the previous decision of the bus is used
+- 'sent'      : (optional) `time.perf_counter()` of the release of the event,
+                otherwise the latency only covers the assignment itself
+
+Any other key is passed through to the decision. The events are read from an
+iterable, a `queue.Queue` (ended by `None`) or a file of JSON lines (see
+`eventsFromFile`). The latency budget is configured in 'config/online.yaml'.
+"""
+
+# Standard Library
+import json
+import queue
+import time
+
+import numpy as np
+
+# Developed Modules
+from config_loader import loadConfig, loadYAML
+from quin_modified import QuinModified
+
+##===============================================================================
+# FUNCTIONS
+
+
+##-------------------------------------------------------------------------------
+#
+def eventsFromFile(path: str, follow: bool = False, poll: float = 0.01):
+    """
+    Read arrival events from a file of JSON lines. When following the file, new
+    lines are waited for until a `null` line is read.
+
+    Input:
+      - path   : Path to the event file
+      - follow : Keep reading the file as it grows (like `tail -f`)
+      - poll   : Time to wait for new lines when following [s]
+
+    Output:
+      - Generator of arrival events
+    """
+    with open(path, "r") as f:
+        buf = ""
+        while True:
+            buf += f.readline()
+
+            ## Wait for the rest of the line or for new lines
+            if not buf.endswith("\n"):
+                if follow:
+                    time.sleep(poll)
+                    continue
+                if not buf:
+                    return
+
+            line, buf = buf, ""
+            if not line.strip():
+                continue
+
+            event = json.loads(line)
+            if event is None:
+                return
+            yield event
+
+
+##===============================================================================
+#
+class OnlineDispatcher:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, c_path="./config", budget: float = None):
+        """
+        Initialize the dispatcher with every charger free for the whole day
+
+        Input:
+          - c_path : Path to configuration directory, or its `Config`
+          - budget : Latency budget of an arrival [s], read from 'online.yaml'
+                     if not given
+
+        Output
+           - None
+        """
+        self.cfg = self.__parseYAML(loadConfig(c_path).path)
+        self.qm = QuinModified(c_path)  # Charger selection
+        self.budget = float(self.cfg["budget"] if budget is None else budget)
+
+        init = self.qm.init
+        self.kappa = init["buses"]["bat_capacity"]  # Battery capacity
+        self.init_charge = init["initial_charge"]["min"] * self.kappa  # Charge of unseen buses
+        self.Q = init["chargers"]["slow"]["num"] + init["chargers"]["fast"]["num"]
+
+        self.reset()
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def reset(self):
+        """
+        Drop every reservation and decision
+
+        Input:
+          - None
+
+        Output:
+          - None
+        """
+        self.qm.reset(self.Q)  # Charger availability
+        self.charge = {}  # Charge of each bus at its next arrival
+        self.decisions = []  # Decision of every arrival
+        self.latency = []  # Latency of every arrival [s]
+        self.over_budget = 0  # Number of arrivals over the latency budget
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def dispatch(self, event: dict) -> dict:
+        """
+        Assign a charger and a charge window to an arrival
+
+        Input:
+          - event : Arrival event
+
+        Output:
+          - decision : Event with the assigned charger `v` (-1 if none), the
+                       charge window `u`/`c`, the charge on arrival `eta`, the
+                       charge at the next arrival `eta_next` and the latency
+                       `latency` [s]
+        """
+        start = time.perf_counter()
+        b = event["bus"]
+
+        # Charge on arrival
+        if event.get("charge") is not None:
+            self.charge[b] = event["charge"]
+        eta = self.charge.get(b, self.init_charge)
+
+        # Select the charger
+        eta_next, v, u, c = self.qm.assign(
+            eta, self.kappa, event["arrival"], event["departure"], event["discharge"]
+        )
+        self.charge[b] = eta_next
+
+        # Record the decision
+        latency = time.perf_counter() - event.get("sent", start)
+        decision = dict(event, v=int(v), u=u, c=c, eta=eta, eta_next=eta_next, latency=latency)
+
+        self.decisions.append(decision)
+        self.latency.append(latency)
+        if latency > self.budget:
+            self.over_budget += 1
+
+        return decision
+
+    ##---------------------------------------------------------------------------
+    #
+    def run(self, source) -> list:
+        """
+        Dispatch every event of a source
+
+        Input:
+          - source : Iterable of events or `queue.Queue` of events ended by `None`
+
+        Output:
+          - decisions : Decision of every event of the source
+        """
+        if isinstance(source, queue.Queue):
+            source = iter(source.get, None)
+
+        return [self.dispatch(event) for event in source]
+
+    ##---------------------------------------------------------------------------
+    #
+    def stats(self) -> dict:
+        """
+        Latency percentiles of the arrivals dispatched so far
+
+        Input:
+          - None
+
+        Output:
+          - stats : Number of events, latency percentiles and maximum [ms], and
+                    number of events over the budget
+        """
+        lat = 1e3 * np.asarray(self.latency or [0.0])
+
+        return {
+            "events": len(self.latency),
+            "p50": float(np.percentile(lat, 50)),
+            "p90": float(np.percentile(lat, 90)),
+            "p99": float(np.percentile(lat, 99)),
+            "max": float(np.max(lat)),
+            "budget": 1e3 * self.budget,
+            "over_budget": self.over_budget,
+        }
+
+    ##===========================================================================
+    # PRIVATE
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __parseYAML(self, path: str):
+        """
+        Input:
+          - path: Path to the configuration directory
+
+        Output:
+          - cfg : Parsed online YAML file
+        """
+        return loadYAML(path + "/online.yaml")
@@ -1,16 +1,26 @@
 # System Modules
-import yaml
 import sys
 import numpy as np
+import scipy.sparse as sp
 
+from gurobipy import GRB
 from progress.bar import Bar
 
 np.set_printoptions(threshold=sys.maxsize)
 
 # Developed Modules
+from array_store import loadArrays, saveArrays
+from checkpoint import Checkpoint
+from config_loader import loadConfig
 from data_manager import DataManager
 from dict_util import merge_dicts
+from run_context import RunContext
+from tuning import bucketKey, profileParams
 
+##===============================================================================
+# PUBLIC CONSTANTS
+SPARSE = {"sigma": True, "delta": True, "w": True, "g": False}  # Sparse results (binary or not)
+CHUNK = 1 << 20  # Values of a sparse result read from the solver at once
 
 ##===============================================================================
 #
@@ -21,24 +31,39 @@ class Optimizer:
 
     ##---------------------------------------------------------------------------
     #
-    def __init__(self, data_d: str = "../data"):
+    def __init__(self, data_d: str = "../data", c_path="./config", ctx: RunContext = None):
+        """
+        Input:
+          - data_d : Path to the data directory
+          - c_path : Path to the configuration directory, or its `Config`
+          - ctx    : Run context, default: the `DataManager`
+
+        Output:
+          - NONE
+        """
         # Parse 'config/general.yaml'
-        with open(r"config/general.yaml") as f:
-            file = yaml.load(f, Loader=yaml.FullLoader)
-            self.jobs = file["jobs"]
-            self.verbose = file["verbose"]
-            self.lff = file["load_from_file"]
-            self.time_lim = file["time_limit"]
-            self.solver = file["solver"]
+        cfg = loadConfig(c_path)
+        self.jobs = cfg.jobs
+        self.verbose = cfg.verbose
+        self.lff = cfg.load_from_file
+        self.time_lim = cfg.time_limit
+        self.solver = cfg.solver
+        self.threads = cfg.threads
+        self.ckpt_interval = cfg.checkpoint
+        self.resume = cfg.resume
 
         # Initialize member variables
-        self.dm = DataManager()
+        self.dm = DataManager() if ctx is None else ctx
         self.model = self.dm["model"]
         self.params = self.dm.m_params
         self.d_var = self.dm.m_decision_var
         self.data_d = data_d
+        self.c_path = cfg.path
+        self.built = False
         self.constr = []
         self.objective = []
+        self.start = None
+        self.resumed = False
 
         return
 
@@ -47,7 +72,7 @@ class Optimizer:
     def optimize(self):
         """
             This method runs the uta-pap optimization based on the the data
-            set in DataManager shared memory.
+            set in the run context.
 
         Input:
             NONE
@@ -59,34 +84,8 @@ class Optimizer:
             # gurobi model
             model = self.model
 
-            # Set time limit
-            model.setParam("TimeLimit", self.time_lim)
-
-            # Objective
-            print(
-                "===================================================================="
-            )
-            print("Creating Objective...")
-            print(
-                "===================================================================="
-            )
-            self.__inputObjectives()
-
-            # Add constraints
-            print(
-                "===================================================================="
-            )
-            print("Adding Constraints")
-            print(
-                "===================================================================="
-            )
-            with Bar("", max=self.iterations) as bar:
-                for i in range(self.iterations):
-                    self.__inputConstraints(i)
-                    bar.next()
-
-            # Uncomment to print model to disk
-            #  model.write("model.lp")
+            # Build the objective and constraints
+            self.build()
 
             # Optimize
             print(
@@ -96,12 +95,20 @@ class Optimizer:
             print(
                 "===================================================================="
             )
-            model.optimize()
+            ckpt = self.__setupCheckpoint(model)
+            if self.start is not None and not self.resumed:
+                self.__applyStart(model)
+            model.optimize(ckpt)
+
+            ## Save the final state of the solve
+            if ckpt:
+                ckpt.runtime = model.Runtime
+                ckpt.save()
 
             # Save Results
             ## Extract all the decision variable results
             d_var_results = dict(
-                (k, self.dm.m_decision_var[k].X)
+                (k, self.__solution(k, self.dm.m_decision_var[k]))
                 for k in self.dm.m_decision_var.keys()
                 if k != "model"
             )
@@ -110,16 +117,92 @@ class Optimizer:
             results = merge_dicts(self.dm.m_params, d_var_results)
 
             ## Save the results to disk
-            np.save(self.data_d + "/results.npy", results)
+            saveArrays(self.data_d + "/results", results)
         else:
             ## Load the results from disk
-            results = np.load(self.data_d + "/results.npy", allow_pickle="TRUE").item()
+            results = loadArrays(self.data_d + "/results")
 
         # Update data manager with results
         self.__updateDM(results)
 
         return results
 
+    ##---------------------------------------------------------------------------
+    #
+    def build(self):
+        """
+        Add the objectives and constraints to the model and set the solver
+        parameters. The model is only built once.
+
+        Input:
+            NONE
+
+        Output:
+            Gurobi model ready to be optimized
+        """
+        # gurobi model
+        model = self.model
+
+        if self.built:
+            return
+
+        # Set time limit
+        model.setParam("TimeLimit", self.time_lim)
+
+        # Cap the number of solver threads (0 lets Gurobi decide)
+        if self.threads > 0:
+            model.setParam("Threads", self.threads)
+
+        # Apply the tuned parameters for the size of the instance
+        self.__applyProfile(model)
+
+        # Objective
+        print(
+            "===================================================================="
+        )
+        print("Creating Objective...")
+        print(
+            "===================================================================="
+        )
+        self.__inputObjectives()
+
+        # Add constraints
+        print(
+            "===================================================================="
+        )
+        print("Adding Constraints")
+        print(
+            "===================================================================="
+        )
+        with Bar("", max=self.iterations) as bar:
+            for i in range(self.iterations):
+                self.__inputConstraints(i)
+                bar.next()
+
+        # Uncomment to print model to disk
+        #  model.write("model.lp")
+
+        self.built = True
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def warmStart(self, results: dict):
+        """
+        Use a heuristic schedule as the MIP start of the solve. A start loaded
+        from a checkpoint takes precedence.
+
+        Input:
+          - results : Decision variables of the schedule (`u`, `c`, `v`, `g`,
+                      `w`). Visits with `v < 0` are left for the solver to
+                      complete.
+
+        Output:
+          - None
+        """
+        self.start = results
+        return
+
     ##---------------------------------------------------------------------------
     # Input:
     #                       i: Number of iterations to apply constraints
@@ -157,6 +240,38 @@ class Optimizer:
     # PRIVATE
     ##===========================================================================
 
+    ##---------------------------------------------------------------------------
+    #
+    def __solution(self, k: str, var):
+        """
+        Extract the solution of a decision variable. The matrices listed in
+        `SPARSE` are mostly zero; they are read `CHUNK` values at a time and
+        kept as sparse matrices (binary ones as booleans) so that they are
+        never held densely.
+
+        Input:
+          - k   : Name of the decision variable
+          - var : Gurobi MVar
+
+        Output:
+          - x : Solution as a numpy array or a sparse CSR matrix
+        """
+        if k not in SPARSE:
+            return var.X
+
+        # Variables
+        N, M = var.shape
+        step = max(1, CHUNK // max(M, 1))
+        rows = []
+
+        for i in range(0, N, step):
+            x = var[i : i + step].X
+            rows.append(sp.csr_array(x > 0.5 if SPARSE[k] else x))
+
+        if not rows:
+            return sp.csr_array((N, M), dtype=bool if SPARSE[k] else float)
+        return sp.vstack(rows, format="csr")
+
     ##---------------------------------------------------------------------------
     # Input:
     #                       NONE
@@ -186,6 +301,123 @@ class Optimizer:
             c.addConstr(i)
         return
 
+    ##---------------------------------------------------------------------------
+    #
+    def __applyProfile(self, model):
+        """
+        Apply the cached tuning profile matching the size of the instance (see
+        `tune.py`).
+
+        Input:
+          - model : Gurobi model
+
+        Output:
+          - NONE
+        """
+        # Variables
+        N = self.dm["N"]
+        Q = self.dm["Q"]
+        params = profileParams(self.c_path + "/tuning.yaml", N, Q)
+
+        if params:
+            print("Using tuning profile {0}: {1}".format(bucketKey(N, Q), params))
+
+        for k, v in params.items():
+            model.setParam(k, v)
+
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __setupCheckpoint(self, model):
+        """
+        Set up periodic checkpoints of the solve. If resuming, the model is
+        verified against the checkpoint fingerprint, the checkpointed incumbent
+        is loaded as a MIP start and the time limit is reduced by the time
+        already spent.
+
+        Input:
+          - model : Gurobi model
+
+        Output:
+          - ckpt : Checkpoint callback, None if checkpoints are disabled
+        """
+        # Variables
+        path = self.data_d + "/checkpoint"
+        prev = None
+
+        if self.ckpt_interval <= 0 and not self.resume:
+            return None
+
+        # The fingerprint has to be taken before any MIP start is set
+        fp = Checkpoint.modelFingerprint(model)
+
+        # Load the previous checkpoint
+        if self.resume:
+            prev = Checkpoint.load(path)
+
+            if prev is None:
+                print("No checkpoint found, solving from scratch")
+            elif prev["fingerprint"] != fp:
+                print("WARNING: Checkpoint does not match the model, solving from scratch")
+                prev = None
+
+        # Continue from the previous checkpoint
+        if prev:
+            if prev["x"] is not None:
+                model.setAttr("Start", model.getVars(), prev["x"])
+                self.resumed = True
+
+            model.setParam("TimeLimit", max(0, self.time_lim - prev["runtime"]))
+
+            print(
+                "Resuming after {0:.0f}s (incumbent: {1}, bound: {2})".format(
+                    prev["runtime"], prev["obj"], prev["bound"]
+                )
+            )
+
+        if self.ckpt_interval <= 0:
+            return None
+
+        ckpt = Checkpoint(path, self.ckpt_interval, fp, prev)
+        ckpt.attach(model)
+
+        return ckpt
+
+    ##---------------------------------------------------------------------------
+    #
+    def __applyStart(self, model):
+        """
+        Set the MIP start from the warm start schedule. Only the visits the
+        schedule charges are set, the solver completes the rest.
+
+        Input:
+          - model : Gurobi model
+
+        Output:
+          - None
+        """
+        # Variables
+        r = self.start
+        d = self.d_var
+        v = np.asarray(r["v"], dtype=int)
+        on = v >= 0
+        undef = GRB.UNDEFINED
+
+        for k in ["u", "c"]:
+            d[k].Start = np.where(on, np.asarray(r[k], dtype=float), undef)
+
+        d["v"].Start = np.where(on, v, undef)
+        d["p"].Start = np.where(on, np.asarray(r["c"], dtype=float) - np.asarray(r["u"], dtype=float), undef)
+
+        for k in ["g", "w"]:
+            d[k].Start = np.where(on[:, None], np.asarray(r[k], dtype=float), undef)
+
+        model.update()
+
+        print("Warm start with {0} of {1} visits assigned".format(int(on.sum()), len(v)))
+        return
+
     ##---------------------------------------------------------------------------
     #
     def __updateDM(self, results):
@@ -0,0 +1,223 @@
+"""
+`portfolio` runs many variants of the Quin-Modified heuristic in a process pool
+and keeps the best schedule. The variants combine the priority thresholds, the
+charger scan order and the charger choice listed in 'config/portfolio.yaml'.
+
+Each schedule is scored with the MILP objective and replayed by the
+`simulator`, which checks the constraints of the MILP it can violate (time
+windows, charger overlaps and battery bounds). Schedules with the fewest
+violations win, ties are broken by the objective.
+"""
+
+# Standard Library
+import itertools
+import multiprocessing as mp
+
+import numpy as np
+
+# Developed Modules
+from config_loader import loadConfig, loadYAML
+from data_manager import DataManager
+from dict_util import merge_dicts
+from quin_modified import QuinModified
+from run_context import RunContext
+from simulator import simulate
+
+##===============================================================================
+# PRIVATE VARIABLES
+__worker = None  # Run context of a pool worker
+
+##===============================================================================
+# FUNCTIONS
+
+
+##-------------------------------------------------------------------------------
+#
+def genVariants(cfg: dict) -> list:
+    """
+    Expand the portfolio configuration into the list of heuristic variants.
+
+    Input:
+      - cfg : Parsed 'portfolio.yaml'
+
+    Output:
+      - variants : List of `QuinModified` keyword arguments
+    """
+    thresholds = cfg.get("thresholds") or [[0.85, 0.90, 0.95]]
+    scans = cfg.get("scan") or ["slow"]
+    fits = cfg.get("fit") or ["earliest"]
+
+    return [
+        {"high": h, "med": m, "low": l, "scan": s, "fit": f}
+        for (h, m, l), s, f in itertools.product(thresholds, scans, fits)
+    ]
+
+
+##-------------------------------------------------------------------------------
+#
+def scoreSchedule(params: dict, results: dict) -> dict:
+    """
+    Score a heuristic schedule.
+
+    Input:
+      - params  : Input parameters of the schedule
+      - results : Decision variables of the schedule (`u`, `c`, `v`, `g`, `w`)
+
+    Output:
+      - score : Objective `obj` and the number of visits violating a
+                constraint `violations` (see `simulator.simulate`)
+    """
+    sim = simulate(params, results)
+    return {"obj": sim["obj"], "violations": sim["violations"]}
+
+
+##-------------------------------------------------------------------------------
+#
+def initWorker(params: dict):
+    """
+    Load the input parameters into a new run context of a pool worker. The
+    dimensions are set first so the arrays are checked against them.
+
+    Input:
+      - params : Input parameters of the schedule
+
+    Output:
+      - None
+    """
+    global __worker
+
+    __worker = RunContext()
+    __worker.setList(params.keys(), params.values())
+    return
+
+
+##-------------------------------------------------------------------------------
+#
+def runVariant(job: dict) -> dict:
+    """
+    Run a single heuristic variant. This is the entry point of each pool worker.
+
+    Input:
+      - job : Configuration path `c_path` and variant `variant`
+
+    Output:
+      - row : Variant, score and decision variables of the schedule
+    """
+    ctx = __worker
+    qm = QuinModified(job["c_path"], ctx=ctx, **job["variant"])
+    r = qm.optimize()
+
+    row = {k: np.asarray(r[k]) for k in ["u", "c", "v", "p", "eta", "g", "w"]}
+    row.update(scoreSchedule(ctx.m_params, r))
+    row["variant"] = job["variant"]
+
+    return row
+
+
+##===============================================================================
+#
+class Portfolio:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, c_path="./config", ctx: RunContext = None):
+        """
+        Initialize the heuristic portfolio
+
+        Input:
+          - c_path: Path to configuration directory, or its `Config`
+          - ctx: Run context, default: the `DataManager`
+
+        Output
+           - None
+        """
+        self.dm = DataManager() if ctx is None else ctx  # Run context
+        self.c_path = c_path
+        self.variants, self.jobs = self.__parseYAML(c_path)
+        self.scores = []  # Variant and score of every schedule
+        self.best = None  # Best schedule
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def search(self):
+        """
+        Run every variant and keep the best schedule. The data manager is left
+        untouched so the schedule can be used as a MILP warm start.
+
+        Input:
+          - None
+
+        Output:
+          - best : Variant, score and decision variables of the best schedule
+        """
+        # Variables
+        params = {k: v for k, v in self.dm.m_params.items()}
+        work = [{"c_path": self.c_path, "variant": v} for v in self.variants]
+        jobs = max(1, min(self.jobs, len(work)))
+
+        # Run the variants
+        with mp.Pool(processes=jobs, initializer=initWorker, initargs=(params,)) as pool:
+            rows = pool.map(runVariant, work)
+
+        # Fewest violations, then lowest objective
+        self.scores = [
+            dict(row["variant"], obj=row["obj"], violations=row["violations"]) for row in rows
+        ]
+        self.best = min(rows, key=lambda x: (x["violations"], x["obj"]))
+
+        return self.best
+
+    ##---------------------------------------------------------------------------
+    #
+    def optimize(self):
+        """
+        Generate a charging schedule with the best variant of the portfolio
+
+        Input:
+          - None
+
+        Output:
+          - Charging schedule
+        """
+        best = self.search()
+
+        # Update data manager
+        for k in ["u", "c", "p", "eta", "g", "w"]:
+            self.dm[k] = best[k]
+        self.dm["v"] = [int(x) for x in best["v"]]
+
+        # Save Results
+        ## Extract all the decision variable results
+        d_var_results = dict(
+            (k, self.dm.m_decision_var[k])
+            for k in self.dm.m_decision_var.keys()
+            if k != "model"
+        )
+
+        results = merge_dicts(self.dm.m_params, d_var_results)  # Update results
+
+        return results
+
+    ##===========================================================================
+    # PRIVATE
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __parseYAML(self, path):
+        """
+        Input:
+          - path: Path to the configuration directory, or its `Config`
+
+        Output:
+          - variants : Heuristic variants
+          - jobs     : Number of worker processes
+        """
+        general = loadConfig(path)
+        cfg = loadYAML(general.path + "/portfolio.yaml")
+
+        return genVariants(cfg), general.jobs
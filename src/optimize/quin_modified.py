@@ -1,10 +1,12 @@
 # Standard Library
 import numpy as np
-import yaml
 
 # Developed Modules
+from config_loader import loadConfig
 from data_manager import DataManager
 from dict_util import merge_dicts
+from free_slot_index import FreeSlotIndex
+from run_context import RunContext
 
 
 ##===============================================================================
@@ -16,24 +18,42 @@ class QuinModified:
 
     ##---------------------------------------------------------------------------
     #
-    def __init__(self, c_path: str = "./config"):
+    def __init__(
+        self,
+        c_path="./config",
+        high: float = 0.85,
+        med: float = 0.90,
+        low: float = 0.95,
+        scan: str = "slow",
+        fit: str = "earliest",
+        ctx: RunContext = None,
+    ):
         """
         Initialize the Quin-Modified algorithm
 
         Input:
-          - c_path: Path to configuration directory
+          - c_path : Path to configuration directory, or its `Config`
+          - high   : High priority threshold
+          - med    : Medium priority threshold
+          - low    : Low priority threshold
+          - scan   : Chargers tried first when either type may be used ('slow'
+                     or 'fast')
+          - fit    : Charger choice, the first with a free slot ('earliest') or
+                     the one left idle the least before the charge ('best')
+          - ctx    : Run context, default: the `DataManager`
 
         Output
            - None
         """
-        self.dm = DataManager()  # Get instance of data manager
+        self.dm = DataManager() if ctx is None else ctx  # Run context
         self.init = self.__parseYAML(c_path)  # Get ignored routes
-        self.__genDecisionVars()  # Generate decision variables
         self.BOD = 0.0  # Beginning of day
         self.EOD = self.init["time"]["EOD"] - self.init["time"]["BOD"]  # End of day
-        self.high = 0.85  # High priority
-        self.med = 0.90  # Medium priority
-        self.low = 0.95  # Low priority
+        self.high = high  # High priority
+        self.med = med  # Medium priority
+        self.low = low  # Low priority
+        self.scan = scan  # Charger type tried first
+        self.fit = fit  # Charger choice
         return
 
     ##---------------------------------------------------------------------------
@@ -55,9 +75,6 @@ class QuinModified:
         """
         # Variables
         results = []
-        high = self.high  # High priority
-        med = self.med  # Medium priority
-        low = self.low  # Low priority
 
         # Unpack MILP Variables
         ## Input variables
@@ -72,15 +89,14 @@ class QuinModified:
         t = self.dm["t"]  # Departure time from station
 
         ## Decision variables
+        self.__genDecisionVars()  # Generate decision variables
         c = self.c  # Detatch time
         eta = self.eta  # Charge at start of visit
         u = self.u  # Initial charge times
         v = self.v  # Active charger
 
         # Helper Variables
-        self.cu = [
-            [[self.BOD, self.EOD]] for i in range(Q)
-        ]  # Keep track of charger usage
+        self.reset(Q)  # Keep track of charger usage
 
         # For each visit
         for i in range(N):
@@ -93,49 +109,85 @@ class QuinModified:
                 eta[gam[i]] = eta[i] - dis  # Next visit charge
             ## Else its a normal visit
             else:
-                priority = "slow"
-
-                ### If the charge is below 60%, prioritize it to fast
-                if eta[i] < high * k[G[i]]:
-                    priority = "fast"
-                ### Else if prioritize to slow, fast if no slow
-                elif eta[i] >= high * k[G[i]] and eta[i] < med * k[G[i]]:
-                    priority = "slow"
-                ### Else if only use slow
-                elif eta[i] <= med * k[G[i]] and eta[i] < low * k[G[i]]:
-                    priority = "SLOW"
-                ### Else if, don't charge
-                elif eta[i] >= low * k[G[i]]:
-                    priority = ""  # Don't do anything
-
                 ## Assign bus to charger
-                eta[gam[i]], v[i], u[i], c[i] = self.__assignCharger(
-                    i, eta[i], self.cu, a[i], t[i], priority
-                )
+                eta[gam[i]], v[i], u[i], c[i] = self.assign(eta[i], k[G[i]], a[i], t[i], dis)
 
         # Format results
         results = self.__formatResults(eta, v, u, c)
 
         return results
 
+    ##---------------------------------------------------------------------------
+    #
+    def reset(self, Q: int):
+        """
+        Free every charger for the whole day
+
+        Input:
+          - Q : Number of chargers
+
+        Output:
+          - None
+        """
+        self.Q = Q
+        self.cu = FreeSlotIndex(Q, self.BOD, self.EOD)  # Keep track of charger usage
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def assign(self, eta: float, k: float, a: float, t: float, l: float):
+        """
+        Assign a single visit to a charger, given the reservations made so far
+
+        Input:
+          - eta : Charge on arrival [kwh]
+          - k   : Battery capacity [kwh]
+          - a   : Arrival time [hr]
+          - t   : Departure time [hr]
+          - l   : Discharge over the next route [kwh]
+
+        Output:
+          - eta : Charge at the next visit
+          - v   : Assigned charger, -1 if none
+          - u   : Start charge time
+          - c   : Stop charge time
+        """
+        # Variables
+        high = self.high  # High priority
+        med = self.med  # Medium priority
+        low = self.low  # Low priority
+        priority = "slow"
+
+        ### If the charge is below 60%, prioritize it to fast
+        if eta < high * k:
+            priority = "fast"
+        ### Else if prioritize to slow, fast if no slow
+        elif eta >= high * k and eta < med * k:
+            priority = "slow"
+        ### Else if only use slow
+        elif eta <= med * k and eta < low * k:
+            priority = "SLOW"
+        ### Else if, don't charge
+        elif eta >= low * k:
+            priority = ""  # Don't do anything
+
+        return self.__assignCharger(l, eta, self.cu, a, t, priority)
+
     ##===========================================================================
     # PRIVATE
     ##===========================================================================
 
     ##---------------------------------------------------------------------------
     # NOTE: Make this a shared util
-    def __parseYAML(self, path: str):
+    def __parseYAML(self, path):
         """
         Input:
-          - path: Path to the configuration directory
+          - path: Path to the configuration directory, or its `Config`
 
         Output:
           - self.init: Parsed schedule YAML file
         """
-        # Variables
-        with open(path + "/schedule.yaml", "r") as f:
-            init = yaml.load(f, Loader=yaml.FullLoader)
-        return init
+        return loadConfig(path).schedule
 
     ##---------------------------------------------------------------------------
     #
@@ -169,12 +221,12 @@ class QuinModified:
 
     ##---------------------------------------------------------------------------
     #
-    def __assignCharger(self, i, eta, cu, start, stop, priority):
+    def __assignCharger(self, l, eta, cu, start, stop, priority):
         """
         Charger assignment that prioritizes fast chargers
 
         Input
-          - i     : Visit index
+          - l     : Discharge over the next route
           - eta   : Current charge
           - cu    : Charger usage
           - start : Start rest time
@@ -188,23 +240,30 @@ class QuinModified:
         """
         # Variables
         s = self.init["chargers"]["slow"]["num"]
-        Q = self.dm["Q"]
+        Q = self.Q
         queue = []
         v = -1
         u = c = 0
 
         # Set up search priority
         if priority == "slow":
-            queue = range(Q)  # Prioritize slow
+            if self.scan == "fast":
+                queue = list(range(s, Q)) + list(range(s))  # Fast, then slow
+            else:
+                queue = range(Q)  # Prioritize slow
         if priority == "fast":
             queue = range(s, Q, 1)  # Prioritize fast
         if priority == "SLOW":
             queue = range(0, s)  # Only slow
 
+        # Try the chargers left idle the least before the charge first
+        if self.fit == "best":
+            queue = sorted(queue, key=lambda q: self.__idleTime(q, start, stop))
+
         # For each of the chargers going from slow to fast
         for q in queue:
             eta, u, c, v = self.__assignBusToCharge(
-                i, q, eta, start, stop
+                l, q, eta, start, stop
             )  # Determine charge and time
             if v >= 0:
                 break  # If a charger has been selected
@@ -261,12 +320,12 @@ class QuinModified:
 
     ##---------------------------------------------------------------------------
     #
-    def __assignBusToCharge(self, i, q, eta, a, t):
+    def __assignBusToCharge(self, l, q, eta, a, t):
         """
         Assign bus to charger and determine charge time
 
         Input
-          - i   : Visit index
+          - l   : Discharge over the next route [kwh]
           - q   : Charger of interest
           - eta : Current charge [kwh]
           - a   : Arrival time to station [hr]
@@ -307,9 +366,9 @@ class QuinModified:
             if eta + r * (c - u) >= perc * k:
                 c = (perc * k - eta) / r + u
                 # print("Amount charged: {0}".format(t))
-                eta = perc * k - self.dm["l"][i]
+                eta = perc * k - l
             else:
-                eta = eta + r * (c - u) - self.dm["l"][i]
+                eta = eta + r * (c - u) - l
 
             # Make reservation
             self.__makeReservation(v, u, c, avail)
@@ -337,44 +396,31 @@ class QuinModified:
           - u : Start charge time
           - c : End charge time
           - v : Selected queue
+          - i : Free slot the charge time lies in
         """
-        # Variables
-        u = a
-        c = t
-        v = -1
+        # Oldest free slot overlapping [a, t]
+        u, c, i = self.cu.findFreeTime(q, a, t)
+        v = q if i is not None else -1
+
+        return u, c, v, i
 
-        # For every assigned charge time
-        for i in self.cu[q]:
-            b = i[0]  # Begin slot
-            e = i[1]  # End slot
-
-            ## Try to find an open slot
-            if (all(a < x for x in i) and all(t < x for x in i)) or (
-                all(a > x for x in i) and all(t > x for x in i)
-            ):
-                continue
-
-            if b <= a and a <= t and t <= e:
-                v = q
-                break  # a <= u <= c <= t
-            elif a <= b and b <= t and t <= e:
-                u = b
-                v = q
-                break  # b <= u <= c <= t
-            elif b <= a and e <= t:
-                c = e
-                v = q
-                break  # a <= u <= c <= e
-            elif a <= b and e <= t:
-                u = b
-                c = e
-                v = q
-                break  # b <= u <= c <= e
+    ##---------------------------------------------------------------------------
+    #
+    def __idleTime(self, q, a, t):
+        """
+        Time charger `q` would be left idle before charging a bus
 
-            if v >= 0:
-                break  # Charger found
+        Input:
+          - q : Charger of interest
+          - a : Arrival time
+          - t : Departure time
 
-        return u, c, v, i
+        Output:
+          - idle : Time between the start of the free slot and the charge, inf
+                   if the charger is not free
+        """
+        u, _, i = self.cu.findFreeTime(q, a, t)
+        return u - i[0] if i is not None else np.inf
 
     ##---------------------------------------------------------------------------
     #
@@ -386,6 +432,7 @@ class QuinModified:
           - v : Charger of interest
           - u : Start charge time
           - c : End charge time
+          - i : Free slot the reservation lies in
 
         Output:
           - res_made : Flag to indicate reservation was made
@@ -395,13 +442,8 @@ class QuinModified:
 
         # If there has been times allotted
         if v >= 0:
-            s = i[0]   # Start of free time
-            e = i[1] # End of free time
-
-            # If the allocated time is in the selected free time
-            self.cu[v].remove(i)  # Remove current free time
-            self.cu[v].append([s, u])  # Update charger times
-            self.cu[v].append([c, e])
+            # Split the free time around the reservation
+            self.cu.reserve(v, i, u, c)
             res_made = True  # Indicate a reservation was made
 
         return res_made
@@ -0,0 +1,289 @@
+"""
+`repair` patches a charging schedule when the day does not go as planned (a bus
+arrives late, leaves early or uses more energy than expected), without solving
+the whole schedule again.
+
+Only the buses of the changed visits are touched, and only their visits from
+the first change up to `horizon` hours after the last one. Each of these visits
+is given the energy that brings the charge of its bus back to the planned
+charge after its route:
+
+- A visit whose charge still fits its window and whose bus is on plan keeps its
+  charge
+- Otherwise its charge is placed again, first on its charger at its planned
+  start, then anywhere on its charger, then on the other chargers, in the free
+  time left by the charges of every other visit
+- A bus that gets less energy than planned at a visit makes up the difference
+  at its next visits
+
+The charges of the other visits are never moved, so the repaired schedule never
+double-books a charger. The changes to the schedule are reported as a diff.
+"""
+
+# Standard Library
+import numpy as np
+
+# Developed Modules
+from booking_index import BookingIndex
+from data_manager import DataManager
+from dict_util import merge_dicts
+from run_context import RunContext
+from simulator import simulate
+
+
+##===============================================================================
+#
+class Repair:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, horizon: float = 2.0, ctx: RunContext = None):
+        """
+        Initialize the repair
+
+        Input:
+          - horizon : Time after the last changed visit in which the visits of
+                      the changed buses may be touched [hr]
+          - ctx     : Run context, default: the `DataManager`
+
+        Output:
+          - None
+        """
+        self.dm = DataManager() if ctx is None else ctx  # Run context
+        self.horizon = horizon
+        self.diff = []  # Changes made to the schedule
+        self.sim = None  # Simulation of the repaired schedule
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def repair(self, changes: dict, results: dict = None):
+        """
+        Repair a charging schedule after some visits changed
+
+        Input:
+          - changes : New arrival time `a`, departure time `t` and/or discharge
+                      `l` of each changed visit, indexed by visit
+          - results : Schedule to repair (`u`, `c`, `v`), default: the decision
+                      variables in the data manager
+
+        Output:
+          - Repaired charging schedule
+        """
+        if results is None:
+            results = self.dm.m_decision_var
+
+        self.__setup(results, changes)
+        self.diff = []
+
+        # Visits that may be touched
+        lo = min(min(self.a0[i], self.a[i]) for i in changes)
+        hi = max(max(self.t0[i], self.t[i]) for i in changes) + self.horizon
+        buses = {int(self.G[i]) for i in changes}
+        touch = [
+            i for b in buses for i in self.bus[b] if self.a[i] <= hi and self.t[i] >= lo
+        ]
+
+        # Shortfall of each bus from its planned charge
+        short = {b: 0.0 for b in buses}
+        eta = {}
+        for b in buses:
+            seq = self.bus[b]
+            e = self.kap[seq[0]] * self.alpha[seq[0]]
+            for i in seq:
+                eta[i] = e
+                e = e + self.E0[i] - self.l0[i]
+
+        # Repair the visits in order of arrival
+        for i in sorted(touch, key=lambda x: (self.a[x], x)):
+            b = int(self.G[i])
+            arrive = eta[i] - short[b]  # Charge on arrival
+            need = self.E0[i] + short[b] + self.l[i] - self.l0[i]
+            need = min(max(need, 0.0), self.kap[i] - arrive)
+
+            ## Keep the charge if it still fits
+            E = self.__energy(i)
+            fits = self.v[i] < 0 or (self.u[i] >= self.a[i] - 1e-9 and self.c[i] <= self.t[i] + 1e-9)
+            if not (fits and abs(need - E) <= 1e-9):
+                E = self.__reassign(i, need)
+
+            short[b] = eta[i] + self.E0[i] - self.l0[i] - (arrive + E - self.l[i])
+
+        # Report the changes
+        for i in range(self.N):
+            if self.v[i] != self.v0[i] or abs(self.u[i] - self.u0[i]) > 1e-9 or abs(self.c[i] - self.c0[i]) > 1e-9:
+                self.diff.append(
+                    {
+                        "visit": i,
+                        "bus": int(self.G[i]),
+                        "v": (int(self.v0[i]), int(self.v[i])),
+                        "u": (float(self.u0[i]), float(self.u[i])),
+                        "c": (float(self.c0[i]), float(self.c[i])),
+                    }
+                )
+
+        return self.__formatResults()
+
+    ##===========================================================================
+    # PRIVATE
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __setup(self, results: dict, changes: dict):
+        """
+        Unpack the parameters, apply the changes and unpack the schedule
+
+        Input:
+          - results : Schedule to repair
+          - changes : Changed visits
+
+        Output:
+          - None
+        """
+        dm = self.dm
+
+        # Parameters
+        self.N = int(dm["N"])
+        self.Q = int(dm["Q"])
+        self.G = np.asarray(dm["Gamma"], dtype=int)
+        self.a0 = np.asarray(dm["a"], dtype=float)
+        self.t0 = np.asarray(dm["t"], dtype=float)
+        self.l0 = np.asarray(dm["l"], dtype=float)
+        self.r = np.asarray(dm["r"], dtype=float)
+        self.kap = np.asarray(dm["kappa"], dtype=float)[self.G]
+        self.alpha = np.asarray(dm["alpha"], dtype=float)
+        self.gam = np.asarray(dm["gamma"], dtype=int)
+
+        # Changed parameters
+        self.a, self.t, self.l = np.copy(self.a0), np.copy(self.t0), np.copy(self.l0)
+        for i, ch in changes.items():
+            self.a[i] = ch.get("a", self.a[i])
+            self.t[i] = ch.get("t", self.t[i])
+            self.l[i] = ch.get("l", self.l[i])
+
+        # Schedule
+        self.u0 = np.array(results["u"], dtype=float)
+        self.c0 = np.array(results["c"], dtype=float)
+        self.v0 = np.rint(np.asarray(results["v"], dtype=float)).astype(int)
+        self.c0[self.v0 < 0] = self.u0[self.v0 < 0]
+        self.u, self.c, self.v = np.copy(self.u0), np.copy(self.c0), np.copy(self.v0)
+        self.E0 = np.array([self.__energy(i) for i in range(self.N)])
+
+        # Visits of each bus in order
+        self.bus = {}
+        for i in np.flatnonzero(self.alpha > 0):
+            seq = [int(i)]
+            while self.gam[seq[-1]] >= 0:
+                seq.append(int(self.gam[seq[-1]]))
+            self.bus[int(self.G[i])] = seq
+
+        # Charges on each charger
+        self.index = BookingIndex(self.Q)
+        for i in range(self.N):
+            self.index.book(i, self.v[i], self.u[i], self.c[i])
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __energy(self, i: int) -> float:
+        """
+        Input:
+          - i : Visit index
+
+        Output:
+          - E : Energy delivered at visit i [kwh]
+        """
+        return self.r[self.v[i]] * (self.c[i] - self.u[i]) if self.v[i] >= 0 else 0.0
+
+    ##---------------------------------------------------------------------------
+    #
+    def __reassign(self, i: int, need: float) -> float:
+        """
+        Place the charge of a visit again
+
+        Input:
+          - i    : Visit index
+          - need : Energy to deliver [kwh]
+
+        Output:
+          - E : Energy delivered [kwh]
+        """
+        q0 = self.v[i]
+        self.index.cancel(i, q0, self.u[i], self.c[i])
+        self.v[i] = -1
+        self.u[i] = self.c[i] = self.a[i]
+
+        if need <= 1e-9:
+            return 0.0
+
+        # Candidate placements, in order of preference
+        cand = []
+        if q0 >= 0:
+            cand.append((q0, max(self.u0[i], self.a[i])))
+            cand.append((q0, self.a[i]))
+        cand += [(q, self.a[i]) for q in range(self.Q) if q != q0]
+
+        best = (0.0, -1, 0.0, 0.0)
+        for q, s in cand:
+            s, d = self.index.place(q, s, self.t[i], need / self.r[q])
+            if self.r[q] * d > best[0] + 1e-9:
+                best = (self.r[q] * d, q, s, d)
+            if self.r[q] * d >= need - 1e-9:
+                break
+
+        E, q, s, d = best
+        if q >= 0:
+            self.v[i], self.u[i], self.c[i] = q, s, s + d
+            self.index.book(i, q, s, s + d)
+        return E
+
+    ##---------------------------------------------------------------------------
+    #
+    def __formatResults(self):
+        """
+        Format the results so that they can be plotted
+
+        Input:
+          - None
+
+        Output:
+          - Update data manager with the changed parameters and the decision
+            variables
+        """
+        N, Q = self.N, self.Q
+        on = self.v >= 0
+        w = np.zeros((N, Q), dtype=int)
+        g = np.zeros((N, Q), dtype=float)
+        w[on, self.v[on]] = 1
+        g[on, self.v[on]] = self.c[on] - self.u[on]
+
+        # Update data manager
+        self.dm["a"] = self.a  # Arrival times
+        self.dm["t"] = self.t  # Departure times
+        self.dm["l"] = self.l  # Discharges
+        self.dm["c"] = self.c  # Detatch time
+        self.dm["u"] = self.u  # Initial charge times
+        self.dm["v"] = [int(x) for x in self.v]  # Active charger
+        self.dm["p"] = self.c - self.u  # c_i - u_i
+        self.dm["w"] = w
+        self.dm["g"] = g
+
+        # Charge of the repaired schedule
+        self.sim = simulate(self.dm.m_params, {"u": self.u, "c": self.c, "v": self.v, "g": g, "w": w})
+        self.dm["eta"] = self.sim["eta"]  # Charge at start of visit
+
+        # Save Results
+        ## Extract all the decision variable results
+        d_var_results = dict(
+            (k, self.dm.m_decision_var[k])
+            for k in self.dm.m_decision_var.keys()
+            if k != "model"
+        )
+
+        results = merge_dicts(self.dm.m_params, d_var_results)  # Update results
+
+        return results
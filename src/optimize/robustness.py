@@ -0,0 +1,266 @@
+"""
+`robustness` estimates how a solved schedule holds up when the buses do not run
+on time. Thousands of days are sampled in which the arrival and departure times
+of every visit are delayed and the discharge of every route deviates from its
+nominal value. The schedule is replayed on each day with a repair policy:
+
+- A charge starts when the bus arrives if it arrives after the planned start
+- A charge keeps its planned duration, but ends when the bus leaves or when the
+  next charge planned on the charger starts, whichever comes first
+- A charge left with no time is missed
+
+Charges only ever move into time the charger was planned to be free, so the
+repaired schedule never double-books a charger. The charge of every bus is then
+propagated through its visits (capped at the battery capacity), and the bus is
+depleted if its charge after a route drops below `nu` of its capacity.
+
+The samples are split into chunks of fixed size, run in a process pool. Each
+chunk draws from its own child of the seed, so the estimates only depend on the
+seed and not on the number of workers. The perturbations are configured in
+'config/robustness.yaml'.
+"""
+
+# Standard Library
+import multiprocessing as mp
+
+import numpy as np
+
+# Developed Modules
+from config_loader import loadConfig, loadYAML
+from data_manager import DataManager
+from run_context import RunContext
+
+##===============================================================================
+# FUNCTIONS
+
+
+##-------------------------------------------------------------------------------
+#
+def genContext(params: dict, results: dict, cfg: dict) -> dict:
+    """
+    Collect the arrays needed to replay a schedule.
+
+    Input:
+      - params  : Input parameters of the schedule
+      - results : Decision variables of the schedule (`u`, `c`, `v`)
+      - cfg     : Parsed 'robustness.yaml'
+
+    Output:
+      - ctx : Replay context of the schedule
+    """
+    # Variables
+    N = int(params["N"])
+    A = int(params["A"])
+    G = np.asarray(params["Gamma"], dtype=int)
+    a = np.asarray(params["a"], dtype=float)
+    u = np.asarray(results["u"], dtype=float)
+    c = np.asarray(results["c"], dtype=float)
+    v = np.rint(np.asarray(results["v"], dtype=float)).astype(int)
+    r = np.asarray(params["r"], dtype=float)
+    kap = np.asarray(params["kappa"], dtype=float)
+    alp = np.asarray(params["alpha"], dtype=float)[:N]
+
+    # Start of the next charge planned on the same charger
+    on = (v >= 0) & (c > u)
+    nxt = np.full(N, np.inf)
+    idx = np.flatnonzero(on)
+    idx = idx[np.lexsort((u[idx], v[idx]))]
+    same = v[idx[1:]] == v[idx[:-1]]
+    nxt[idx[:-1][same]] = u[idx[1:][same]]
+
+    # Visits of each bus in order of arrival, padded with the dummy visit N
+    order = np.lexsort((a, G))
+    count = np.bincount(G, minlength=A)
+    K = int(np.max(count)) if N > 0 else 0
+    seq = np.full((A, K), N, dtype=int)
+    pos = np.arange(N) - np.repeat(np.cumsum(count) - count, count)
+    seq[G[order], pos] = order
+
+    # Initial charge of each bus
+    eta0 = np.zeros(A)
+    first = seq[:, 0] if K > 0 else np.zeros(0, dtype=int)
+    eta0[count > 0] = kap[count > 0] * alp[first[count > 0]]
+
+    return {
+        "a": a,
+        "t": np.asarray(params["t"], dtype=float),
+        "l": np.asarray(params["l"], dtype=float),
+        "u": u,
+        "p": np.where(on, c - u, 0.0),
+        "nxt": nxt,
+        "rate": np.where(on, r[np.maximum(v, 0)], 0.0),
+        "on": on,
+        "seq": seq,
+        "eta0": eta0,
+        "kappa": kap,
+        "nu": float(params["nu"]),
+        "delay": cfg.get("delay") or {},
+        "discharge": float(cfg.get("discharge", 0.0)),
+    }
+
+
+##-------------------------------------------------------------------------------
+#
+def replay(ctx: dict, S: int, rng: np.random.Generator) -> dict:
+    """
+    Replay a schedule on `S` sampled days.
+
+    Input:
+      - ctx : Replay context of the schedule (see `genContext`)
+      - S   : Number of sampled days
+      - rng : Random number generator
+
+    Output:
+      - counts : Number of days with a missed charge (`missed`) and with a
+                 depleted battery (`depleted`) for every bus, and the total
+                 number of missed charges (`charges`)
+    """
+    # Variables
+    N = len(ctx["a"])
+    seq = ctx["seq"]
+    kap = ctx["kappa"]
+    nu = ctx["nu"]
+    A = seq.shape[0]
+    delay = ctx["delay"]
+
+    # Sample the days
+    a = ctx["a"] + rng.normal(0.0, float(delay.get("arrival", 0.0)), size=(S, N))
+    t = ctx["t"] + rng.normal(0.0, float(delay.get("departure", 0.0)), size=(S, N))
+    t = np.maximum(t, a)
+    l = ctx["l"] * np.maximum(0.0, 1.0 + rng.normal(0.0, ctx["discharge"], size=(S, N)))
+
+    # Repair the charges
+    u = np.maximum(ctx["u"], a)
+    c = np.minimum(np.minimum(u + ctx["p"], t), ctx["nxt"])
+    p = np.maximum(0.0, c - u)
+    missed = ctx["on"] & (p <= 0.0)
+    E = ctx["rate"] * p
+
+    # Propagate the charge through the visits of every bus, the dummy visit N
+    # neither charges nor discharges
+    E = np.concatenate([E, np.zeros((S, 1))], axis=1)
+    l = np.concatenate([l, np.zeros((S, 1))], axis=1)
+    missed = np.concatenate([missed, np.zeros((S, 1), dtype=bool)], axis=1)
+
+    eta = np.tile(ctx["eta0"], (S, 1))
+    depleted = np.zeros((S, A), dtype=bool)
+    for k in range(seq.shape[1]):
+        i = seq[:, k]
+        real = i < N
+        eta = np.minimum(eta + E[:, i], kap) - l[:, i]
+        depleted |= real & (eta < nu * kap)
+
+    missed_bus = np.zeros((S, A), dtype=bool)
+    for k in range(seq.shape[1]):
+        missed_bus |= missed[:, seq[:, k]]
+
+    return {
+        "missed": np.count_nonzero(missed_bus, axis=0),
+        "depleted": np.count_nonzero(depleted, axis=0),
+        "charges": int(np.count_nonzero(missed)),
+    }
+
+
+##-------------------------------------------------------------------------------
+#
+def runChunk(job: dict) -> dict:
+    """
+    Replay a chunk of sampled days. This is the entry point of each pool worker.
+
+    Input:
+      - job : Replay context `ctx`, seed `seed` and number of days `samples`
+
+    Output:
+      - counts : Counts of the chunk (see `replay`)
+    """
+    rng = np.random.default_rng(job["seed"])
+    return replay(job["ctx"], job["samples"], rng)
+
+
+##===============================================================================
+#
+class Robustness:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, c_path="./config", ctx: RunContext = None):
+        """
+        Initialize the robustness evaluation
+
+        Input:
+          - c_path: Path to configuration directory, or its `Config`
+          - ctx: Run context, default: the `DataManager`
+
+        Output
+           - None
+        """
+        self.dm = DataManager() if ctx is None else ctx  # Run context
+        self.cfg, self.jobs = self.__parseYAML(c_path)
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def evaluate(self, results: dict = None) -> dict:
+        """
+        Estimate the probability of a missed charge and of a depleted battery
+        for each bus
+
+        Input:
+          - results : Schedule to evaluate, the schedule in the data manager if
+                      not given
+
+        Output:
+          - report : Dictionary with
+                     - 'samples'    : Number of sampled days
+                     - 'p_missed'   : Probability of a missed charge for each bus
+                     - 'p_depleted' : Probability of a depleted battery for each
+                                      bus
+                     - 'missed'     : Expected number of missed charges a day
+        """
+        # Variables
+        if results is None:
+            results = {k: self.dm[k] for k in ["u", "c", "v"]}
+        ctx = genContext(self.dm.m_params, results, self.cfg)
+        S = int(self.cfg["samples"])
+        size = max(1, int(self.cfg.get("chunk", S)))
+        sizes = [min(size, S - s) for s in range(0, S, size)]
+        seeds = np.random.SeedSequence(self.cfg.get("seed")).spawn(len(sizes))
+        work = [{"ctx": ctx, "seed": sd, "samples": n} for sd, n in zip(seeds, sizes)]
+        jobs = max(1, min(self.jobs, len(work)))
+
+        # Replay the chunks
+        if jobs > 1:
+            with mp.Pool(processes=jobs) as pool:
+                counts = pool.map(runChunk, work)
+        else:
+            counts = [runChunk(w) for w in work]
+
+        return {
+            "samples": S,
+            "p_missed": sum(x["missed"] for x in counts) / S,
+            "p_depleted": sum(x["depleted"] for x in counts) / S,
+            "missed": sum(x["charges"] for x in counts) / S,
+        }
+
+    ##===========================================================================
+    # PRIVATE
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __parseYAML(self, path):
+        """
+        Input:
+          - path: Path to the configuration directory, or its `Config`
+
+        Output:
+          - cfg  : Parsed robustness YAML file
+          - jobs : Number of worker processes
+        """
+        general = loadConfig(path)
+        cfg = loadYAML(general.path + "/robustness.yaml")
+
+        return cfg, general.jobs
@@ -0,0 +1,145 @@
+"""
+`tuning` stores and selects the Gurobi parameter profiles found by `tune.py`.
+Profiles are cached per instance-size bucket: the number of visits and the
+number of chargers are both rounded up to the next power of two.
+
+This file is primarily accessed via `optimizer.py` and `tune.py`
+"""
+
+# System Modules
+import math
+import os
+import yaml
+
+# Developed
+from config_loader import loadYAML
+
+##===============================================================================
+# PUBLIC CONSTANTS
+
+## Parameters that are searched over and the values they may take
+SEARCH_SPACE = {
+    "MIPFocus": [0, 1, 2, 3],
+    "Heuristics": [0.0, 0.05, 0.2, 0.5],
+    "Cuts": [-1, 0, 1, 2, 3],
+    "Presolve": [-1, 0, 1, 2],
+}
+
+##===============================================================================
+# PUBLIC
+
+
+##-------------------------------------------------------------------------------
+#
+def sizeBucket(N: int, Q: int) -> tuple:
+    """
+    Determine the size bucket of an instance.
+
+    Input:
+      - N : Number of visits
+      - Q : Number of chargers
+
+    Output:
+      - (N, Q) : Size of the bucket the instance falls in
+    """
+    return (__nextPow2(N), __nextPow2(Q))
+
+
+##-------------------------------------------------------------------------------
+#
+def bucketKey(N: int, Q: int) -> str:
+    """
+    Key of the size bucket in the profile file.
+
+    Input:
+      - N : Number of visits
+      - Q : Number of chargers
+
+    Output:
+      - key : Bucket key, i.e. 'N512-Q32'
+    """
+    nb, qb = sizeBucket(N, Q)
+    return "N{0}-Q{1}".format(nb, qb)
+
+
+##-------------------------------------------------------------------------------
+#
+def loadProfiles(path: str) -> dict:
+    """
+    Load the cached tuning profiles.
+
+    Input:
+      - path : Path to the profile file
+
+    Output:
+      - profiles : Dictionary of profiles indexed by bucket key
+    """
+    if not os.path.isfile(path):
+        return {}
+
+    return loadYAML(path) or {}
+
+
+##-------------------------------------------------------------------------------
+#
+def saveProfile(path: str, N: int, Q: int, profile: dict):
+    """
+    Store the profile of a bucket, replacing any previous profile of that
+    bucket.
+
+    Input:
+      - path    : Path to the profile file
+      - N       : Number of visits
+      - Q       : Number of chargers
+      - profile : Profile (parameters and scores) of the bucket
+
+    Output:
+      - Updated profile file
+    """
+    profiles = loadProfiles(path)
+    profiles[bucketKey(N, Q)] = profile
+
+    with open(path, "w") as f:
+        yaml.dump(profiles, f)
+
+    return
+
+
+##-------------------------------------------------------------------------------
+#
+def profileParams(path: str, N: int, Q: int) -> dict:
+    """
+    Select the tuned parameters for an instance.
+
+    Input:
+      - path : Path to the profile file
+      - N    : Number of visits
+      - Q    : Number of chargers
+
+    Output:
+      - params : Gurobi parameters of the matching bucket (empty if the bucket
+                 has not been tuned)
+    """
+    profile = loadProfiles(path).get(bucketKey(N, Q))
+
+    if not profile:
+        return {}
+
+    return profile["params"]
+
+
+##===============================================================================
+# PRIVATE
+
+
+##-------------------------------------------------------------------------------
+#
+def __nextPow2(x: int) -> int:
+    """
+    Input:
+      - x : Positive integer
+
+    Output:
+      - p : Smallest power of two greater or equal to x
+    """
+    return 2 ** math.ceil(math.log2(max(1, x)))
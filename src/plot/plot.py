@@ -12,82 +12,81 @@ class Plotter:
     ##===========================================================================
     # PUBLIC
 
-    ##---------------------------------------------------------------------------
-    # Static Variables
-
-    # Constants
-    A     = 0
-    N     = 0
-    Q     = 0
-    T     = 0
-    K     = 0
-
-    # Input Vars
-    a     = []
-    r     = []
-    t     = 0
-    Gamma = []
-    gamma = []
-
-    # Decision Vars
-    c     = []
-    delta = []
-    eta   = []
-    p     = []
-    sigma = []
-    u     = []
-    v     = []
-    w     = []
-
     ##---------------------------------------------------------------------------
     # Input:
-    #   Example: test
+    #   name: The name of the plot
     #
     # Output:
-    #   Example: test
+    #   NONE
     #
     def __init__(self, name):
         self.name   = name
         self.outdir = '../img/'
+
+        # Constants
+        self.A     = 0
+        self.N     = 0
+        self.Q     = 0
+        self.T     = 0
+        self.K     = 0
+
+        # Input Vars
+        self.a     = []
+        self.r     = []
+        self.t     = 0
+        self.Gamma = []
+        self.gamma = []
+        self.visit = None
+
+        # Decision Vars
+        self.c     = []
+        self.delta = []
+        self.eta   = []
+        self.p     = []
+        self.sigma = []
+        self.u     = []
+        self.v     = []
+        self.w     = []
         return
 
     ##---------------------------------------------------------------------------
     # Input
     #           results : Output of GUROBI solution
-    #           dm      : Data manager
+    #           dm      : Run context
     #
     # Output:
     #           NONE
     #
-    def initialize(results, dm):
+    def initialize(self, results, dm):
 
         # Constants
-        Plotter.A     = results['A']
-        Plotter.N     = results['N'] if 'K' in results else results['N']+Plotter.A
-        Plotter.Q     = results['Q']
-        Plotter.T     = results['T']
-        Plotter.K     = results['K'] if 'K' in results else 1000
-        Plotter.slow  = dm['slow']
-        Plotter.fast  = dm['fast']
+        self.A     = results['A']
+        self.N     = results['N'] if 'K' in results else results['N']+self.A
+        self.Q     = results['Q']
+        self.T     = results['T']
+        self.K     = results['K'] if 'K' in results else 1000
+        self.slow  = dm['slow']
+        self.fast  = dm['fast']
 
         # Input Vars
-        Plotter.a     = results['a']
-        Plotter.r     = results['r']
-        Plotter.t     = results['t']
-        Plotter.dt    = results['dt'] if 'dt' in results else Plotter.T/Plotter.K
-        Plotter.Gamma = results['Gamma']
-        Plotter.gamma = results['gamma']
+        self.a     = results['a']
+        self.r     = results['r']
+        self.t     = results['t']
+        self.dt    = results['dt'] if 'dt' in results else self.T/self.K
+        self.Gamma = results['Gamma']
+        self.gamma = results['gamma']
+        self.visit = dm.visitIndex()
 
         # Decision Vars
-        Plotter.c     = results['c']
-        Plotter.delta = results['delta']
-        Plotter.eta   = results['eta']
-        Plotter.g     = results['g']
-        Plotter.p     = results['p']
-        Plotter.sigma = results['sigma']
-        Plotter.u     = results['u']
-        Plotter.v     = results['v']
-        Plotter.w     = results['w']
+        self.c     = results['c']
+        self.delta = results['delta']
+        self.eta   = results['eta']
+        self.g     = results['g']
+        self.p     = results['p']
+        self.sigma = results['sigma']
+        self.u     = results['u']
+        self.v     = results['v']
+        self.w     = results['w']
 
         return
 
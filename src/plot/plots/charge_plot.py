@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 import numpy             as np
 
 # Developed Modules
+from array_util import valueAt
 from plot import Plotter
 from grid_shader import GridShader
 
@@ -37,7 +38,7 @@ class ChargePlot(Plotter):
 
         # Configure Plot
         fig, ax = plt.subplots(1)
-        x,y     = self.__groupChargeResults(N, A, self.Gamma, self.eta, self.u, self.c, self.v, self.r, self.g)
+        x,y     = self.__groupChargeResults(N, A, self.visit, self.eta, self.u, self.c, self.v, self.r, valueAt(self.g, self.v))
 
         # Set the axis limits
         ax.set_xlim(0, 24)
@@ -63,7 +64,7 @@ class ChargePlot(Plotter):
     # Input:
     #   N     : Number of bus visits
     #   A     : Number of buses
-    #   Gamma : Array of bus ID's
+    #   visit : Index of the visits of each bus
     #   eta   : Array of bus charges
     #   u     : Initial charge time
     #   c     : Detach time
@@ -74,7 +75,7 @@ class ChargePlot(Plotter):
     #   x : Array of incrementing values from 1 to N
     #   y : Array of charges for each bus
     #
-    def __groupChargeResults(self, N, A, Gamma, eta, u, c, v, r,g):
+    def __groupChargeResults(self, N, A, visit, eta, u, c, v, r,g):
         charges = []
         idx     = []
 
@@ -83,17 +84,15 @@ class ChargePlot(Plotter):
             tempx       = []
             tempy       = []
 
-            ## For every visit
-            for i in range(N):
-                ### If the visit is for the bus of interest
-                if Gamma[i] == j:
-                    #### Append the charge on arrival
-                    tempx.append(u[i])
-                    tempy.append(eta[i])
-
-                    #### Append the charge on departure
-                    tempx.append(c[i])
-                    tempy.append(eta[i] + g[i][int(v[i])]*r[int(v[i])])
+            ## For every visit of the bus
+            for i in visit.visits(j):
+                ### Append the charge on arrival
+                tempx.append(u[i])
+                tempy.append(eta[i])
+
+                ### Append the charge on departure
+                tempx.append(c[i])
+                tempy.append(eta[i] + g[i]*r[int(v[i])])
 
             ### Update the plot arrays
             idx.append(tempx)
@@ -0,0 +1,173 @@
+#!/usr/bin/python
+
+"""
+`replay` feeds the visits of 'config/routes.csv' to the `OnlineDispatcher` as a
+timed stream of arrival events and reports the latency percentiles of the
+dispatch. A producer thread releases each arrival on a queue at its arrival
+time, scaled by `speed` (hours of schedule per second), while the dispatcher
+consumes the queue.
+
+The latency of an arrival is measured from its release on the queue to its
+decision, so it includes the time spent waiting behind earlier arrivals. The
+replay is configured in `config/online.yaml`.
+"""
+
+# ================================================================================
+# INCLUDES
+
+# Standard Lib
+import queue
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+#
+# NOTE: Importing `main` includes the source tree in the path
+import main
+
+from config_loader import loadConfig, loadYAML
+from online_dispatcher import OnlineDispatcher
+from run_context import RunContext
+from scheduler import Schedule
+
+##===============================================================================
+# FUNCTIONS
+
+
+##-------------------------------------------------------------------------------
+#
+def genEvents(params: dict) -> list:
+    """
+    Convert the visits of a schedule into arrival events. The first visit of
+    each bus is not dispatched (the bus is not charged before its first route),
+    the charge it leaves is attached to the next arrival of the bus instead.
+
+    Input:
+      - params : Input parameters of the schedule
+
+    Output:
+      - events : Arrival events in order of arrival
+    """
+    # Variables
+    G = np.asarray(params["Gamma"])
+    a = np.asarray(params["a"], dtype=float)
+    t = np.asarray(params["t"], dtype=float)
+    l = np.asarray(params["l"], dtype=float)
+    alp = np.asarray(params["alpha"], dtype=float)
+    kap = np.asarray(params["kappa"], dtype=float)
+    charge = {}
+    events = []
+
+    for i in np.argsort(a, kind="stable"):
+        b = int(G[i])
+
+        ## Charge left by the first visit
+        if alp[i] > 0:
+            charge[b] = kap[b] * alp[i] - l[i]
+            continue
+
+        event = {
+            "visit": int(i),
+            "bus": b,
+            "arrival": float(a[i]),
+            "departure": float(t[i]),
+            "discharge": float(l[i]),
+        }
+        if b in charge:
+            event["charge"] = float(charge.pop(b))
+        events.append(event)
+
+    return events
+
+
+##-------------------------------------------------------------------------------
+#
+def feed(events: list, q: queue.Queue, speed: float):
+    """
+    Release the events on a queue at their arrival times, then `None`.
+
+    Input:
+      - events : Arrival events in order of arrival
+      - q      : Queue consumed by the dispatcher
+      - speed  : Hours of schedule released per second
+
+    Output:
+      - None
+    """
+    start = time.perf_counter()
+    a0 = events[0]["arrival"] if events else 0.0
+
+    for event in events:
+        ## Wait for the arrival
+        delay = (event["arrival"] - a0) / speed - (time.perf_counter() - start)
+        if delay > 0:
+            time.sleep(delay)
+
+        q.put(dict(event, sent=time.perf_counter()))
+
+    q.put(None)
+    return
+
+
+##-------------------------------------------------------------------------------
+#
+def replay(c_path: str = "./config") -> dict:
+    """
+    Replay 'C_PATH/routes.csv' through the online dispatcher.
+
+    Input:
+      - c_path : Path to the configuration directory
+
+    Output:
+      - stats : Latency percentiles of the replay (see `OnlineDispatcher.stats`)
+    """
+    # Variables
+    dm = RunContext()
+    cfg = loadYAML(c_path + "/online.yaml")
+
+    # Load the visits of the routes
+    with tempfile.TemporaryDirectory() as tmp:
+        routes = loadConfig(c_path, {"schedule_type": "csv", "run_prev": 0, "load_from_file": 0})
+        Schedule(None, routes, tmp, dm)
+
+    events = genEvents(dm.m_params)
+
+    # Stream the arrivals to the dispatcher
+    od = OnlineDispatcher(c_path)
+    q = queue.Queue()
+    producer = threading.Thread(target=feed, args=(events, q, float(cfg["speed"])))
+    producer.start()
+    od.run(q)
+    producer.join()
+
+    return od.stats()
+
+
+##===============================================================================
+# MAIN
+def main():
+    stats = replay()
+
+    print(
+        "Dispatched {0} arrivals: p50 {1:.3f} ms, p90 {2:.3f} ms, p99 {3:.3f} ms, "
+        "max {4:.3f} ms ({5} over the {6:.1f} ms budget)".format(
+            stats["events"],
+            stats["p50"],
+            stats["p90"],
+            stats["p99"],
+            stats["max"],
+            stats["over_budget"],
+            stats["budget"],
+        )
+    )
+    return
+
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,25 @@
 """
 `csv_loader`  loads a CSV file of routing data and produces the input parameters.
 
+Each row of the CSV holds the ID of a bus followed by the start (BEG) and end
+(END) time of each of its routes, in seconds. The file is read in chunks of
+`CHUNK` rows and each chunk is parsed in a single numpy call; the routes are then
+converted to visits and discharges for every bus at once.
+
 This file is primarily accessed via `scheduler.py`
 """
 
 # Standard Library
-import csv
+import itertools
 
 # Developed
+from bus_data import visitTable
 from schedule_util import *
 
+##===============================================================================
+# PUBLIC CONSTANTS
+CHUNK = 4096  # Rows of the CSV parsed at once
+
 ##===============================================================================
 # PUBLIC
 
@@ -32,24 +42,19 @@ def genCSVRoutes(self, d_path):
     # Variables
     r_path = d_path + "/routes.csv"
 
-    routes = __loadCSV(self, r_path)  # Load the route data from CSV
+    A, bus, beg, end = __loadCSV(self, r_path)  # Load the route data from CSV
 
-    visits = __convertRouteToVisit(
-        self, self.init, routes
-    )  # Convert start/end route to
+    id, arrival, departure, route = __convertRouteToVisit(
+        self, self.init, bus, beg, end
+    )  # Convert start/end route to arrival/departure
 
-    __bufferAttributes(self, routes, visits)  # Load the route attributes into
+    __bufferAttributes(self, A, id)  # Load the route attributes into
     # scheduler object
 
-    # arrival/departure
-    discharge = __calcDischarge(self, routes)  # Calculate the discharge
-
-    cnt = 0
-    for d in discharge:
-        cnt = cnt + len(d)
+    discharge = __calcDischarge(self, id, route, beg, end)  # Calculate the discharge
 
     __generateScheduleParams(
-        self, d_path, visits, discharge
+        self, d_path, id, arrival, departure, discharge
     )  # Generate schedule parameters
 
     return
@@ -64,63 +69,123 @@ def genCSVRoutes(self, d_path):
 def __loadCSV(self, path: str):
     """
     Load a CSV of bus route data and format data into an easily accessible
-    format
+    format. The routes of the ignored buses are dropped and the other buses are
+    numbered in order of appearance.
 
     Input:
       - self: Scheduler object
       - path: file path to the CSV file with bus data
 
     Output:
-      - routes: bus route data object
+      - A   : Number of buses
+      - bus : Bus index of each route
+      - beg : Start time of each route [hr]
+      - end : End time of each route [hr]
     """
-    # Lambda
-    SEC2HR = lambda x: x / 3600.0
-
     # Variables
-    first_row = True  # Indicate the first row is being
-    # processed
+    ignore = np.array(sorted(set(int(x) for x in self.init.get("ignore") or [])), dtype=int)
+    begs, ends, counts = [], [], []
 
     with open(path, newline="") as csvfile:  # Open the CSV file
-        routes_raw = csv.reader(csvfile, delimiter=",")
-        routes = []
-        id = 0
+        next(csvfile, None)  # Ignore the first row
+        line = 2
+
+        while True:
+            rows = [r for r in itertools.islice(csvfile, CHUNK) if r.strip()]
+            if not rows:
+                break
+
+            ## Parse the chunk
+            n = np.array([r.count(",") + 1 for r in rows])
+            try:
+                vals = np.fromstring(",".join(r.strip() for r in rows), sep=",")
+            except ValueError:
+                vals = np.zeros(0)
+            if len(vals) != np.sum(n):
+                raise ValueError(
+                    "{0}: non-numeric field in rows {1}-{2}".format(path, line, line + len(rows) - 1)
+                )
+            if np.any(n % 2 == 0):
+                raise ValueError(
+                    "{0}:{1}: a route is missing its END time".format(path, line + np.argmax(n % 2 == 0))
+                )
+
+            ## Split the ID from the routes
+            start = np.cumsum(n) - n
+            id = vals[start].astype(int)
+            keep = ~np.isin(id, ignore)
+            routes = np.delete(vals, start)
+            R = (n - 1) // 2
+            row = np.repeat(np.arange(len(rows)), R)
+
+            ## Keep the routes of the buses that are not ignored
+            mask = keep[row]
+            counts.append(R[keep])
+            begs.append(routes[0::2][mask])
+            ends.append(routes[1::2][mask])
+            __validateRoutes(path, line, row[mask], id, begs[-1], ends[-1])
+
+            line += len(rows)
+
+    # Number the buses in order of appearance
+    counts = np.concatenate(counts) if counts else np.zeros(0, dtype=int)
+    bus = np.repeat(np.arange(len(counts)), counts)
+    beg = np.concatenate(begs) / HR2SEC if begs else np.zeros(0)
+    end = np.concatenate(ends) / HR2SEC if ends else np.zeros(0)
+
+    return len(counts), bus, beg, end
+
+
+##-------------------------------------------------------------------------------
+#
+def __validateRoutes(path: str, line: int, row: np.ndarray, id: np.ndarray, beg: np.ndarray, end: np.ndarray):
+    """
+    Check that every route ends after it starts and that the routes of each bus
+    are in order.
 
-        for row in routes_raw:  # For each row in the csv file
-            if first_row:  # Ignore the first row
-                first_row = False
-                continue
+    Input:
+      - path : file path to the CSV file with bus data
+      - line : Line of the first row of the chunk
+      - row  : Row of the chunk of each route
+      - id   : ID of each row of the chunk
+      - beg  : Start time of each route
+      - end  : End time of each route
+
+    Output:
+      - ValueError if a route is invalid
+    """
+    bad = beg > end
+    bad[1:] |= (row[1:] == row[:-1]) & (beg[1:] < end[:-1])
 
-            ### If the route is not being ignored
-            if int(row[0]) not in self.init["ignore"]:
-                routes.append(
-                    {"id": id, "route": [SEC2HR(float(x)) for x in row[1:]]}
-                )  # Append the id and routes
-                id += 1  # Update ID
+    if np.any(bad):
+        k = np.argmax(bad)
+        raise ValueError(
+            "{0}:{1}: the routes of bus {2} are not in order (BEG {3}, END {4})".format(
+                path, line + row[k], id[row[k]], beg[k], end[k]
+            )
+        )
 
-    return routes
+    return
 
 
 ##-------------------------------------------------------------------------------
 #
-def __bufferAttributes(self, routes, visits):
+def __bufferAttributes(self, A, id):
     """
     Takes the start,stop set of routes and generates routes that the scheduler
     object can understand.
 
     Input:
       - self:
-      - routes:
-      - visits:
+      - A  : Number of buses
+      - id : Bus index of each visit
 
     Output:
       - set of route data to scheduler object
     """
-    # Variables
-    init = self.init
-
     # Calculate input parameters
-    self.dm["A"] = len(routes)  # Number of buses
-    self.dm["N"] = __countVisits(init, visits)  # Number of visits
+    self.dm["A"] = A  # Number of buses
+    self.dm["N"] = len(id)  # Number of visits
     self.dm["a"] = np.zeros(self.dm["N"], dtype=float)  # Arrival times
     self.dm["tau"] = np.zeros(self.dm["N"], dtype=float)  # Departure times
     self.dm["l"] = np.zeros(self.dm["N"], dtype=float)  # Discharge for route i
@@ -135,222 +200,109 @@ def __bufferAttributes(self, routes, visits):
 
 ##-------------------------------------------------------------------------------
 #
-def __countVisits(init, routes):
-    """
-    Counts the number of bus visits from the routes matrix.
-
-    Input:
-      - init  : Initialization parameters from YAML
-      - routes: Matrix of ID and start/stop times of routes for each bus
-
-    Output:
-      - N: Number of visits
-    """
-    # Variables
-    cnt = 0
-
-    for r in routes:
-        cnt = cnt + len(r["visit"])
-
-    return cnt
-
-
-##-------------------------------------------------------------------------------
-#
-def __convertRouteToVisit(self, init, routes):
+def __convertRouteToVisit(self, init, bus, beg, end):
     """
     Convert the start/stop representation to a arrival/departure representation
     of the route schedule.
 
+    A bus arrives at the BOD (or at the end of its previous route) and departs
+    at the start of each route. If its final route ends before the EOD, it
+    makes a final visit until the EOD.
+
     Input:
-      - init  : Initialization parameters from YAML
-      - routes: CSV route data in start/stop route form
+      - init : Initialization parameters from YAML
+      - bus  : Bus index of each route
+      - beg  : Start time of each route
+      - end  : End time of each route
 
     Output:
-      - routes: CSV route data in arrival/departure form
+      - id        : Bus index of each visit, grouped by bus
+      - arrival   : Arrival time of each visit
+      - departure : Departure time of each visit
+      - route     : Route following each visit, -1 for the final visit
     """
     # Variables
-    routes_visit = []
     BOD = init["time"]["BOD"]  # Beginning of day
     EOD = init["time"]["EOD"]  # End of day
+    R = len(bus)
 
-    # Generate set of visit/departures
-    # For each bus/route
-    for route in routes:
-        ## Variables
-        r = route["route"]  # Routes for bus b
-        b = route["id"]  # Bus id
-
-        arrival_c = r[1]  # Current arrival time
-        arrival_n = 0  # Next arrival time
-        departure = 0  # Departure time
-        tmp_route = []  # Temporary [Arrival, Depart] pair
-
-        ## Determine start/stop index
-        (i0, J) = __detStartEndIdx(self, r)
-
-        ## For each start/stop route pair
-        for j in range(i0, J, 2):
-            ### Update times
-            departure = r[j]  # Assign departure time
-            arrival_n = r[j + 1]  # Assign next arrival time
-
-            ### If the first visit as at the BOD
-            if j == 0 and r[j] > BOD:
-                tmp_route.append([BOD, departure])  # The first arrivial is at BOD
-            ### Otherwise the first visit after BOD
-            elif j == 0 and r[j] == BOD:
-                tmp_route.append(
-                    [BOD, BOD]
-                )  # Put in a dummy visit to propogate discharge
-            ### Otherwise
-            else:
-                tmp_route.append(
-                    [arrival_c, departure]
-                )  # Append next arrival/departure pair
-
-            ### If the final visit is not at the EOD
-            if j == J - 2 and r[j + 1] < EOD:
-                tmp_route.append(
-                    [arrival_n, EOD]
-                )  # The last visit is after final route to
-                # EOD
-            arrival_c = arrival_n  # Update the current visit for next
-            # iteration
-
-        routes_visit.append(
-            {"id": b, "visit": tmp_route}
-        )  # Update the visits for bus b
-
-    return routes_visit
-
+    # First and last route of each bus
+    first = np.ones(R, dtype=bool)
+    first[1:] = bus[1:] != bus[:-1]
+    last = np.ones(R, dtype=bool)
+    last[:-1] = bus[1:] != bus[:-1]
 
-##-------------------------------------------------------------------------------
-#
-def __detStartEndIdx(self, r):
-    """
-    Determine the starting index for converting routes to visits.
+    # Visit before each route
+    prev_end = np.empty(R)
+    prev_end[1:] = end[:-1]
+    arrival = np.where(first, BOD, prev_end)
 
-    Input:
-      - self  : Scheduler object
-      - r: Vector of bus routes for bus `b`
+    # Final visit after the last route of the bus, if it ends before the EOD
+    fin = np.flatnonzero(last & (end < EOD))
 
-    Output:
-      - (i0, ix): The start/end index to convert routes to visits
+    # Group the visits by bus, each final visit after the routes of its bus
+    key = np.concatenate((np.arange(R), fin + 0.5))
+    order = np.argsort(key, kind="stable")
 
-    """
-    # Variables
-    i0 = 0
-    ix = len(r)
+    id = np.concatenate((bus, bus[fin]))[order]
+    arrival = np.concatenate((arrival, end[fin]))[order]
+    departure = np.concatenate((beg, np.full(len(fin), float(EOD))))[order]
+    route = np.concatenate((np.arange(R), -np.ones(len(fin), dtype=int)))[order]
 
-    return (i0, ix)
+    return id, arrival, departure, route
 
 
 ##-------------------------------------------------------------------------------
 #
-def __calcDischarge(self, routes):
+def __calcDischarge(self, id, route, beg, end):
     """
     Calculate the discharge for each route
 
     Input:
       - self  : Scheduler object
-      - route : Bus routes in start/stop form
+      - id    : Bus index of each visit
+      - route : Route following each visit, -1 for the final visit
+      - beg   : Start time of each route
+      - end   : End time of each route
 
     Output:
-      - discharge : Battery discharge over each visit
+      - discharge : Battery discharge over each visit [KWh]
 
     """
-    # Variables
-    discharge = []  # Discharge for each visit [KWh]
-    EOD = self.init["time"]["EOD"]  # End of day [hr]
-
-    # For each set of routes for bus b
-    for route in routes:
-        J = len(route["route"])  # Number of routes for bus b
-        b = route["id"]  # Bus index
-        discharge_tmp = []  # Discharges for bus b
-
-        ## For each route for bus b
-        for j in range(0, J, 2):
-            r = route["route"]
-            discharge_tmp.append(
-                self.dm["zeta"][b] * (r[j + 1] - r[j])
-            )  # Calculate discharge
-
-            ### If the final visit is not at the end of the day
-            if j == J - 2 and r[j + 1] < EOD:
-                discharge_tmp.append(0)  # The final route does not have a discharge
-
-        discharge.append(discharge_tmp)  # Update discharges
-        b += 1  # Update the bus index
+    # The final visit does not have a discharge
+    on = route >= 0
+    discharge = np.zeros(len(id), dtype=float)
+    discharge[on] = self.dm["zeta"][id[on]] * (end[route[on]] - beg[route[on]])
 
     return discharge
 
 
 ##-------------------------------------------------------------------------------
 #
-def __generateScheduleParams(self, d_path, visits, discharge):
+def __generateScheduleParams(self, d_path, id, arrival, departure, discharge):
     """
     Generate a schedule based on the CSV file.
 
     Input
       - self      : Scheduler object
       - d_path    : Relative path to the data directory
-      - visits    : Routes in arrival/departure form
+      - id        : Bus index of each visit, grouped by bus
+      - arrival   : Arrival time of each visit
+      - departure : Departure time of each visit
       - discharge : Discharge for each bus route
 
     Output
       - Schedule generated from CSV
     """
-    ##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-    # Variables
-    bus_data = []  # Bus data to be sorted
-
-    ##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-    # Executable code
-
-    # Generate bus data structure for each visit
-    for visit, dis in zip(visits, discharge):
-        id = visit["id"]  # ID
-
-        for j in range(len(visit["visit"])):
-            arrival = visit["visit"][j][0]  # Visit
-            depart = visit["visit"][j][1]  # Departure
-            bd = self.fillBusData(id, arrival, depart, dis[j])  # Update bus data
-            bus_data.append(bd)
-
     # Sort and apply final elements to the schedule
-    ## Sort bus_data by arrival times
-    bus_data = sorted(
-        bus_data, key=lambda d: d["arrival_time"]
-    )  # Sort bus data using arrival time
-
-    ## Determine gamma array
-    self.dm["Gamma"] = genNextVisit(self, bus_data)
-
-    ## Determine Gamma array
-    self.dm["gamma"] = determineNextVisit(self, self.dm["Gamma"])
+    ## Build the visit table sorted by arrival times
+    table = visitTable(id, arrival, departure, discharge, self.dm["A"])
+    applyVisitTable(self, table)
 
     ## Randomly assign initial charges
-    self.dm["alpha"] = determineInitCharge(
-        self, self.dm["Gamma"], self.init["initial_charge"]
-    )
-
-    ## Assign final charges
-    self.dm["beta"] = determineFinalCharge(
-        self, self.dm["gamma"], self.init["final_charge"]
-    )
-
-    ## Assign arrival times to arrival array
-    self.dm["a"] = applyParam(self, bus_data, "arrival_time")
-
-    ## Assign departure times to tau array
-    self.dm["t"] = applyParam(self, bus_data, "departure_time")
-
-    ## Assign discharges to lambus_dataa array
-    self.dm["l"] = applyParam(self, bus_data, "route_discharge")
+    self.dm["alpha"] = determineInitCharge(self, self.init["initial_charge"])
 
     ## Save parameters to disk
-    saveParams(self, d_path)
+    saveParams(self, self.d_path)
 
     return
@@ -5,12 +5,9 @@
 
 # Standard Library
 import numpy as np
-import random
-import yaml
 
 # Developed
-from array_util    import *
-from bus_data      import *
+from bus_data      import visitTable
 from schedule_util import *
 
 ##==============================================================================
@@ -39,6 +36,11 @@ def genNewSchedule(self):
 #
 def __generateScheduleParams(self):
     """
+     The visits of every bus are drawn at once as arrays: a bus with `n` visits
+     arrives at the start of each of the `n` equal chunks of the day, rests for
+     a random time and drives until the start of the next chunk. The draws come
+     from a generator seeded with `seed` (see 'schedule.yaml').
+
      Input:
        - self: scheduler object
 
@@ -46,77 +48,46 @@ def __generateScheduleParams(self):
        - Randomly generated schedule
      """
     # Local variables
-    A         : float = self.dm['A']
-    N         : float = self.dm['N']
-    discharge : float = 0
-    id        : int   = 0
-    bus_data          = []
+    A    : int   = self.dm['A']
+    N    : int   = self.dm['N']
+    T    : float = self.dm['T']
+    rng          = np.random.default_rng(self.init.get('seed'))
+    zeta         = np.asarray(self.dm['zeta'], dtype=float)
 
     # Determine amount of visits for each bus
     # http://sunny.today/generate-random-integers-with-fixed-sum/
-    num_visits: np.array = np.random.multinomial(N, np.ones(A)/A, size=1)[0]
-
-    # For each bus
-    for a,n in zip(range(A),num_visits):
-        ## Initialize the previous arrival/departure
-        ## to hour 0 (beginning of day)
-        departure_t: float = float(0)
-        arrival_t_n: float = float(0)
-        arrival_t_o: float = float(0)
-
-        ## For each bus, determine all the parameters for each visit
-        for i in range(n):
-            ### Set the old arrival time equal to the new arrival time
-            arrival_t_o = arrival_t_n
-
-            ### Determine if this visit is the final visit
-            final_visit = True if i == n-1 else False
-
-            ### Select a start time (<= to the max rest time)
-            departure_t = __selectDeptTime(self, arrival_t_o, final_visit)
+    num_visits: np.array = rng.multinomial(N, np.ones(A)/A)
 
-            ### Select a duration (<= to the max route time allowed)
-            arrival_t_n = __selectNextArrivalTime(self, i, n)
+    # Bus and visit number of every visit, grouped by bus
+    bus   = np.repeat(np.arange(A), num_visits)
+    k     = np.arange(N) - np.repeat(np.cumsum(num_visits) - num_visits, num_visits)
+    n     = num_visits[bus]
+    final = k == n-1
+    chunk = T/n
 
-            ## Calculate discharge
-            discharge = __calcDischarge(self, id, arrival_t_n, departure_t)
+    # Arrival at the start of the chunk, departure after the rest time (at the
+    # end of the day for the final visit)
+    arrival   = k*chunk
+    departure = np.where(final, T, np.minimum(arrival + rng.uniform(self.dm['minr'], self.dm['maxr'], N), T))
 
-            ## Append to bus_data
-            bd = self.fillBusData(id, arrival_t_o, departure_t, discharge)
-            bus_data.append(bd)
-
-        ## Update id
-        id += 1
+    # Discharge until the start of the next chunk
+    discharge = zeta[bus]*((k+1)*chunk - departure)
 
     # Sort and apply final elements to the schedule
-    ## Sort bus_data by arrival times
-    bus_data = sorted(bus_data, key=lambda d: d['arrival_time'])
-
-    ## Determine gamma array
-    self.dm['Gamma'] = genNextVisit(self, bus_data)
-
-    ## Determine Gamma array
-    self.dm['gamma'] = determineNextVisit(self, self.dm['Gamma'])
+    ## Build the visit table sorted by arrival times
+    visits = visitTable(bus, arrival, departure, discharge, A)
+    applyVisitTable(self, visits)
 
     ## Randomly assign initial charges
-    self.dm['alpha'] = determineInitCharge(self, self.dm['Gamma'],
-                                           self.init['initial_charge'])
-
-    ## Assign final charges
-    self.dm['beta'] =  determineFinalCharge(self, self.dm['gamma'],
-                                            self.init['final_charge'])
-
-    ## Assign arrival times to arrival array
-    self.dm['a'] = applyParam(self, bus_data, "arrival_time")
-
-    ## Assign departure times to tau array
-    self.dm['t'] = applyParam(self, bus_data, "departure_time")
-
-    ## Assign discharges to lambda array
-    self.dm['l'] = applyParam(self, bus_data, "route_discharge")
+    ic    = self.init['initial_charge']
+    first = self.dm.visitIndex().first_visit
+    first = first[first >= 0]
+    alpha = np.zeros(N, dtype=float)
+    alpha[first] = rng.uniform(ic['min'], ic['max'], len(first))
+    self.dm['alpha'] = alpha
 
     ## Save parameters to disk
-    saveParams(self)
+    saveParams(self, self.d_path)
 
     return
 
@@ -154,63 +125,3 @@ def __bufferAttributes(self):
     self.dm['Gamma'] = np.zeros(self.dm['N'], dtype=int)
 
     return
-
-##------------------------------------------------------------------------------
-#
-def __selectDeptTime(self, prev_arrival: float, final_visit: bool) -> float:
-    """
-     Input:
-       - NONE
-
-     Output:
-       - Next departure time
-    """
-    # Local Variables
-    maxr = self.dm['maxr']
-    minr = self.dm['minr']
-
-    if not final_visit:
-        # If the next departure time is less than the time horizon use that,
-        # otherwise set the departure time as the time horizon
-        dept_time = \
-            prev_arrival + random.uniform(minr, maxr)                if   \
-            prev_arrival + random.uniform(minr, maxr) < self.dm['T'] else \
-            self.dm['T']
-    else:
-        dept_time = self.dm['T']
-
-    return dept_time
-
-##------------------------------------------------------------------------------
-#
-def __selectNextArrivalTime(self, i: float, n: float) -> float:
-    """
-    Input:
-      - i: Current visit number for bus a
-      - n: Total number of visits for bus a
-
-    Output:
-      - Next arrival time
-    """
-    # Local variables
-    i    += 1
-    chunk = self.dm['T']/n
-
-    # Determine when the time next time interval is over
-    arrival_time = i*chunk
-
-    return arrival_time
-
-##------------------------------------------------------------------------------
-#
-def __calcDischarge(self, b_id: int, arrival_t: float, departure_t: float) -> float:
-    """
-        Input:
-          - b_id       : bus id (index)
-          - arrival_t  : arrival time for bus a visit i
-          - departure_t: departure time for bus a visit i
-
-        Output:
-          - Total amount of discharge [KWH]
-        """
-    return self.dm['zeta'][b_id]*(arrival_t - departure_t)
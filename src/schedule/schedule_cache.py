@@ -0,0 +1,180 @@
+"""
+`schedule_cache` keeps the most recently used generated schedules in the data
+directory so that a schedule is only generated once for a given set of inputs.
+
+A schedule is identified by the fingerprint of its inputs: the parsed
+`schedule.yaml` (which holds the RNG seed), the schedule type and, for CSV
+schedules, the contents of `routes.csv`. A schedule is only deterministic, and
+therefore cached, if the seed is set.
+
+Each entry is an `array_store` directory named after the fingerprint. The
+entries are listed in 'index.json', most recently used first. Reading an entry
+moves it to the front; once there are more than `size` entries, the least
+recently used ones are removed.
+
+This file is primarily accessed via `scheduler.py`
+"""
+
+# Standard Library
+import hashlib
+import json
+import os
+import shutil
+
+# Developed
+from array_store import HEADER, loadArrays, saveArrays
+
+##===============================================================================
+# PUBLIC CONSTANTS
+VERSION = 1  # Bumped when the schedule generation changes
+INDEX = "index.json"  # Name of the file listing the entries
+
+
+##===============================================================================
+# PUBLIC
+
+
+##-------------------------------------------------------------------------------
+#
+def fingerprint(init: dict, schedule_type: str, c_path: str) -> str:
+    """
+    Fingerprint the inputs of a schedule
+
+    Input:
+      - init          : Parsed 'schedule.yaml'
+      - schedule_type : Type of schedule ('random' or 'csv')
+      - c_path        : Path to the configuration directory
+
+    Output:
+      - key : Hexadecimal fingerprint
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps([VERSION, schedule_type, init], sort_keys=True, default=str).encode())
+
+    # The routes of a CSV schedule
+    if schedule_type != "random":
+        with open(c_path + "/routes.csv", "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+
+    return h.hexdigest()[:32]
+
+
+##===============================================================================
+#
+class ScheduleCache:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, path: str, size: int):
+        """
+        Input:
+          - path : Path to the cache directory
+          - size : Maximum number of cached schedules, 0 disables the cache
+
+        Output:
+          - NONE
+        """
+        self.path = path
+        self.size = int(size or 0)
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def get(self, key: str):
+        """
+        Input:
+          - key : Fingerprint of the schedule
+
+        Output:
+          - params : Cached input parameters, None if the schedule is not cached
+        """
+        header = os.path.join(self.path, key, HEADER)
+
+        if self.size <= 0 or not os.path.isfile(header):
+            return None
+
+        # Mark the entry as the most recently used
+        self.__use(key)
+        return loadArrays(os.path.join(self.path, key))
+
+    ##---------------------------------------------------------------------------
+    #
+    def put(self, key: str, params: dict):
+        """
+        Cache a schedule and evict the least recently used ones
+
+        Input:
+          - key    : Fingerprint of the schedule
+          - params : Input parameters of the schedule
+
+        Output:
+          - Cache entry at 'PATH/KEY'
+        """
+        if self.size <= 0:
+            return
+
+        os.makedirs(self.path, exist_ok=True)
+        saveArrays(os.path.join(self.path, key), params)
+        self.__use(key)
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def keys(self) -> list:
+        """
+        Input:
+          - NONE
+
+        Output:
+          - keys : Fingerprints of the cached schedules, most recently used
+                   first
+        """
+        if not os.path.isdir(self.path):
+            return []
+
+        # Complete entries, entries being written have a suffix
+        found = [
+            k for k in os.listdir(self.path) if "." not in k and os.path.isfile(os.path.join(self.path, k, HEADER))
+        ]
+
+        # Entries missing from the index are the least recently used
+        try:
+            with open(os.path.join(self.path, INDEX), "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = []
+
+        return [k for k in index if k in found] + sorted(k for k in found if k not in index)
+
+    ##===========================================================================
+    # PRIVATE
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __use(self, key: str):
+        """
+        Move an entry to the front of the index and remove the least recently
+        used entries past `size`
+
+        Input:
+          - key : Fingerprint of the schedule
+
+        Output:
+          - Index at 'PATH/index.json'
+        """
+        # Variables
+        keys = [key] + [k for k in self.keys() if k != key]
+        tmp = os.path.join(self.path, INDEX + ".tmp")
+
+        for k in keys[self.size :]:
+            shutil.rmtree(os.path.join(self.path, k), ignore_errors=True)
+
+        with open(tmp, "w") as f:
+            json.dump(keys[: self.size], f)
+        os.replace(tmp, os.path.join(self.path, INDEX))
+        return
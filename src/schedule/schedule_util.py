@@ -7,7 +7,8 @@
 import numpy as np
 
 # Developed
-from array_util import *
+from array_store import saveArrays
+from array_util  import *
 
 ##===============================================================================
 # PUBLIC CONSTANTS
@@ -55,11 +56,10 @@ def genInputParams(self):
         self.dm['N']     = init['buses']['num_visit']                           # Number of bus visits
         self.dm['maxr']  = init['buses']['max_rest']                            # Maximum rest time between bus routes
         self.dm['minr']  = init['buses']['min_rest']                            # Minimum rest time between bus routes
-        self.dm['tk']    =  np.array([i*self.dm['dt'] for i in range(0,self.dm['K'])]) # Discrete time step size
 
     self.dm['K']     = init['time']['K']                                        # Total number of discrete steps
     self.dm['Q']     = init['chargers']['slow']['num'] + init['chargers']['fast']['num'] # Number of chargers
-    self.dm['alpha'] = initArray(self.dm['A'], dtype=float)                     # Initial charge percentages
+    self.dm['alpha'] = initArray(self.dm['N'], dtype=float)                     # Initial charge percentages
     self.dm['beta']  = initArray(self.dm['N'], dtype=float)                     # Final charge percentages
     self.dm['dt']    = self.dm['T']/self.dm['K']                                # Calculate discrete time step
     self.dm['e']     = epsilon                                                  # Cost of use for charger q
@@ -70,6 +70,9 @@ def genInputParams(self):
     self.dm['s']     = np.repeat(init['buses']['bus_length'], self.dm['N'])     # Length of a bus
     self.dm['zeta']  = np.repeat([init['buses']['dis_rate']], self.dm['A'])     # Discharge rate
 
+    if type == 'random':
+        self.dm['tk'] = np.array([i*self.dm['dt'] for i in range(0,self.dm['K'])]) # Discrete time step size
+
     # Plotting info
     self.dm.set('fast', init['chargers']['fast']['num'])                        # Set number of fast chargers
     self.dm.set('slow', init['chargers']['slow']['num'])                        # Set number of slow chargers
@@ -78,56 +81,40 @@ def genInputParams(self):
 
 ##------------------------------------------------------------------------------
 #
-def genNextVisit(self, bus_data: np.ndarray) -> np.ndarray:
+def applyVisitTable(self, visits: np.ndarray):
     """
-     Input:
-       bus_data: List of bus information
+    Apply the visit table to the schedule
 
-     Output:
-       Gamma: List of id's for each visit
-        """
-    Gamma         = [i['id'] for i in bus_data]
-    return Gamma
+    Input:
+      - visits: Visit table sorted by arrival time (see bus_data.py)
 
-##------------------------------------------------------------------------------
-#
-def determineNextVisit(self, Gamma: np.ndarray) -> np.ndarray:
+    Output:
+      - Bus ID, next visit, final charge, arrival/departure times and discharge
+        of each visit
     """
-        Input:
-            Gamma: Array of bus arrivals id's
+    ## Determine Gamma array
+    self.dm['Gamma'] = visits['id'].copy()
 
-        Output:
-            gamma: Array of index of next bus arrival for bus a
-        """
+    ## Determine gamma array
+    self.dm['gamma'] = visits['next'].copy()
 
-    # Local Variables
-    A = self.dm['A']
-    N = self.dm['N']
+    ## Assign final charges
+    self.dm['beta'] = determineFinalCharge(self, visits['next'], self.init['final_charge'])
 
-    ## Create gamma buffer
-    gamma = -1*np.ones(N, dtype=int)
+    ## Assign arrival times to arrival array
+    self.dm['a'] = visits['arrival'].copy()
 
-    ## Keep track of the previous index each bus arrived at
-    next_idx = np.array([final(Gamma, i) for i in range(A)], dtype=int)
+    ## Assign departure times to tau array
+    self.dm['t'] = visits['departure'].copy()
 
-    ## Keep track of the first instance each bus arrives
-    last_idx = next_idx.copy()
+    ## Assign discharges to lambda array
+    self.dm['l'] = visits['discharge'].copy()
 
-    # Loop through each bus visit
-    for i in range(N-1, -1, -1):
-        ## Make sure that the index being checked is greater than the first
-        ## visit. If it is, set the previous index value equal to the current.
-        ## In other words, index i's value indicates the next index the bus
-        ## will visit.
-        if i < last_idx[Gamma[i]]:
-            gamma[i]           = next_idx[Gamma[i]]
-            next_idx[Gamma[i]] = i
-
-    return gamma
+    return
 
 ##------------------------------------------------------------------------------
 #
-def determineInitCharge(self, Gamma: np.ndarray, initial_charges: np.ndarray) -> np.ndarray:
+def determineInitCharge(self, initial_charges: np.ndarray) -> np.ndarray:
     """
      Randomly assign inital charges that range from min to max
 
@@ -139,13 +126,14 @@ def determineInitCharge(self, Gamma: np.ndarray, initial_charges: np.ndarray) ->
        - alpha: Initial charge percentage for bus 'a'
     """
     # Local variables
-    init_charge = lambda: np.random.uniform(initial_charges['min'], initial_charges['max'])
-    alpha       = np.zeros(self.dm['N'], dtype=float)
+    first = self.dm.visitIndex().first_visit
+    alpha = np.zeros(self.dm['N'], dtype=float)
 
-    # Loop through bus
-    for a in range(self.dm['A']):
-        ## For each first visit, assign an inital charge percentage
-        alpha[first(Gamma, a)] = init_charge()
+    # For each first visit, assign an inital charge percentage. One charge is
+    # drawn per bus, in order of ID.
+    rng         = np.random.default_rng(self.init.get('seed'))
+    init_charge = rng.uniform(initial_charges['min'], initial_charges['max'], len(first))
+    alpha[first[first >= 0]] = init_charge[first >= 0]
 
     return alpha
 
@@ -165,32 +153,8 @@ def determineFinalCharge(self, gamma: np.ndarray,
     Output:
       - beta: Array of final charge percentages for bus 'a'
     """
-    # Local variables
-    beta = np.zeros(self.dm['N'], dtype=float)
-
-    # Loop through each visit
-    for i in range(self.dm['N']):
-        ## If it is the last visit for bus 'a', update the final charge
-        ## percentage
-        if gamma[i] == -1:
-            beta[i] = final_charge
-
-    return beta
-
-##------------------------------------------------------------------------------
-#
-def applyParam(self, bus_data: np.ndarray, info: str) -> np.ndarray:
-    """
-        Apply the departure times for visit 'i' in the tau array
-
-        Input:
-          -  bus_data: List of information for each bus visit (See bus_data.py)
-                       info: String specifying the data to extract from bus_data
-
-        Output:
-           - arr: Array of bus_data elements in Gamma order
-    """
-    return np.array([b[info] for b in bus_data])
+    # If it is the last visit for bus 'a', set the final charge percentage
+    return np.where(np.asarray(gamma) == -1, final_charge, 0.0)
 
 ##------------------------------------------------------------------------------
 #
@@ -202,8 +166,9 @@ def saveParams(self, d_path: str="data"):
       - NONE
 
     Output:
-       - Ouput parameters to '../data/input_vars.npy'
+       - Ouput parameters and the fingerprint of the inputs to
+         '../data/input_vars' (see `array_store`)
     """
     # Save data for furture runs
-    np.save(d_path+'/input_vars.npy', self.dm.m_params)
+    saveArrays(d_path+'/input_vars', dict(self.dm.m_params, fingerprint=self.fingerprint))
     return
@@ -14,19 +14,22 @@ Most, if not all interaction for schedule generation shoud be done through this
 # Standard Library
 import gurobipy as gp
 import numpy as np
-import yaml
 
 from gurobipy import GRB
 
 # Developed
 import dir_util
 
+from array_store  import loadArrays
 from array_util   import *
-from bus_data     import *
+from config_loader import loadConfig
 from csv_loader   import genCSVRoutes
 from data_manager import DataManager
 from gen_schedule import genNewSchedule
 from pretty       import *
+from run_context  import RunContext
+from schedule_cache import ScheduleCache, fingerprint
+from schedule_util  import saveParams
 
 ##===============================================================================
 #
@@ -36,12 +39,14 @@ class Schedule:
 
     ##---------------------------------------------------------------------------
     #
-    def __init__(self, model, c_path: str="./config/", d_path: str= "../data"):
+    def __init__(self, model, c_path="./config/", d_path: str= "../data", ctx: RunContext=None):
         """
         Input:
           - model  : MILP model
-          - c_path : Relative path to the base of the configuration files
+          - c_path : Relative path to the base of the configuration files, or
+                     their `Config`
           - d_path : Relative path to the base of the data files
+          - ctx    : Run context, default: the `DataManager`
 
         Output:
           - NONE
@@ -51,27 +56,45 @@ class Schedule:
         # Executable code
 
         # Parse YAML file
-        self.init, self.run_prev, self.schedule_type = self.__parseYAML(c_path)
+        cfg = loadConfig(c_path)
+        c_path = cfg.path
+        self.init, self.run_prev, self.schedule_type, cache = self.__parseYAML(cfg)
 
-        # Get an instance of data manager
-        self.dm = DataManager()
+        # Fingerprint the inputs of the schedule
+        self.fingerprint = fingerprint(self.init, self.schedule_type, c_path)
+
+        # Get the run context
+        self.dm = DataManager() if ctx is None else ctx
 
         # Store gurobi model
         self.model = model
 
+        # Store the path to the data directory
+        self.d_path = d_path
+
         # Ensure that the data directory exists
         dir_util.create_dir(d_path)
 
-        # If a new schedule is to be generated
-        if self.run_prev <= 0:
+        # Only a seeded schedule can be reused
+        self.cache = ScheduleCache(d_path+'/cache', cache if self.init.get("seed") is not None else 0)
+
+        # Reuse the previous schedule if it was generated from the same inputs,
+        # otherwise generate a new schedule
+        if self.run_prev <= 0 or not self.__loadPreviousParams(d_path):
+            cached = self.cache.get(self.fingerprint)
+
+            # Reuse the schedule generated from the same inputs
+            if cached is not None              : self.__loadCachedParams(cached)
             # Generate random schedule
-            if self.schedule_type == "random": genNewSchedule(self)
+            elif self.schedule_type == "random": genNewSchedule(self)
             # Load schedule from CSV
-            else                             : genCSVRoutes(self, c_path)
+            else                               : genCSVRoutes(self, c_path)
+
+            # Cache the new schedule
+            if cached is None: self.cache.put(self.fingerprint, self.dm.m_params)
+
             # Generate decision variables
             self.__genDecisionVars()
-        else:
-            self.__loadPreviousParams(d_path)
 
         return
 
@@ -88,72 +111,63 @@ class Schedule:
         # Close the opened YAML file
         return
 
-    ##---------------------------------------------------------------------------
-    #
-    def fillBusData(self, id: int, arrival_t: float, departure_t: float, discharge: float) -> dict:
-        """
-        Input:
-          arrival_t   : Arrival time of bus a visit i
-          departure_t : Departure time of bus a visit i
-          discharge   : Total discharge from route
-
-        Output:
-          b: filled bus_info dictionary
-        """
-        # Local variables
-        keys = bus_info.keys()
-        data = [id, arrival_t, departure_t, discharge]
-
-        return dict(zip(keys, data))
-
     ##===========================================================================
     # PRIVATE
 
     ##---------------------------------------------------------------------------
     #
-    def __parseYAML(self, path):
+    def __parseYAML(self, cfg):
         """
         Input:
-          - NONE
+          - cfg : Configuration of the run
 
         Output:
           - init          : Parsed schedule YAML file
           - run_prev      : YAML parameter to run previous configuration
           - schedule_type : YAML parameter to determine schedule type
+          - cache         : YAML parameter for the number of cached schedules
         """
-
-        # Parse 'schedule.yaml'
-        with open(path+'/schedule.yaml', "r") as f:
-            init = yaml.load(f, Loader = yaml.FullLoader)
-
-        # Parse 'general.yaml'
-        with open(path+"/general.yaml", "r") as f:
-                print(f)
-                file          = yaml.load(f, Loader=yaml.FullLoader)
-                run_prev      = file['run_prev']
-                schedule_type = file['schedule_type']
-
-
-        return init, run_prev, schedule_type
+        return cfg.schedule, cfg.run_prev, cfg.schedule_type, cfg.cache
 
     ##---------------------------------------------------------------------------
     #
     def __loadPreviousParams(self, d_path):
         """
-        Save the generated parameters
+        Load the parameters of the previous run if they were generated from the
+        current configuration
 
         Input:
             d_path: Path to data directory
 
         Output:
-            Previously generated schedule
+            loaded: True if the previous schedule was loaded
         """
 
         # Load previous run input params from disk
-        data = np.load(d_path+'input_vars.npy', allow_pickle='TRUE').item()
+        data = loadArrays(d_path+'/input_vars')
+
+        if data.get('fingerprint') != self.fingerprint:
+            print("WARNING: The previous schedule was not generated from the current configuration, generating a new one")
+            return False
 
         self.__saveKVParams(data)
         self.__genDecisionVars()
+        return True
+
+    ##---------------------------------------------------------------------------
+    #
+    def __loadCachedParams(self, params):
+        """
+        Load a cached schedule and save it as the input parameters of this run
+
+        Input:
+            params: Cached input parameters
+
+        Output:
+            Cached schedule
+        """
+        self.__saveKVParams(params)
+        saveParams(self, self.d_path)
         return
 
     ##---------------------------------------------------------------------------
@@ -0,0 +1,356 @@
+#!/usr/bin/python
+
+"""
+`sweep` runs a parameter sweep over `schedule.yaml`. Each scenario of the sweep
+(schedule generation, MILP and/or Quin-Modified and the data output) is run in
+its own process of a pool of `jobs` workers (see `general.yaml`). The results
+of every scenario are collected into a single summary table.
+
+The sweep itself is configured in `config/sweep.yaml`.
+"""
+
+# ================================================================================
+# INCLUDES
+
+# Standard Lib
+import csv
+import itertools
+import multiprocessing as mp
+import os
+import time
+import traceback
+
+import gurobipy as gp
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+#
+# NOTE: Importing `main` includes the source tree in the path
+from main import createModel, setupConstraints, setupObjective
+
+from array_util import columnSum
+from config_loader import Config, loadConfig, loadYAML
+from data_output import outputData
+from optimizer import Optimizer
+from quin_modified import QuinModified
+from run_context import RunContext
+from scheduler import Schedule
+from simulator import simulate
+
+import dir_util
+
+##===============================================================================
+# FUNCTIONS
+
+
+##-------------------------------------------------------------------------------
+#
+def loadSweep(c_path: str = "./config"):
+    """
+    Load the sweep configuration and the base configuration it is applied to.
+
+    Input:
+      - c_path : Path to the configuration directory
+
+    Output:
+      - sweep : Parsed 'sweep.yaml'
+      - cfg   : Base configuration (see `config_loader`)
+    """
+    return loadYAML(c_path + "/sweep.yaml"), loadConfig(c_path)
+
+
+##-------------------------------------------------------------------------------
+#
+def genScenarios(sweep: dict) -> list:
+    """
+    Expand the sweep configuration into a list of scenarios. Every explicit
+    scenario is combined with every point of the grid.
+
+    Input:
+      - sweep : Parsed 'sweep.yaml'
+
+    Output:
+      - scenarios : List of `(name, overrides)` pairs
+    """
+    # Variables
+    grid = sweep.get("grid") or {}
+    explicit = sweep.get("scenarios") or [{}]
+    keys = list(grid.keys())
+    scenarios = []
+
+    # Combine each explicit scenario with each grid point
+    for base in explicit:
+        for point in itertools.product(*[grid[k] for k in keys]):
+            overrides = dict(base)
+            overrides.update(zip(keys, point))
+            name = "scenario-{0:03d}".format(len(scenarios))
+            scenarios.append((name, overrides))
+
+    return scenarios
+
+
+##-------------------------------------------------------------------------------
+#
+def runScenario(job: dict) -> dict:
+    """
+    Run a single scenario of the sweep. This is the entry point of each pool
+    worker.
+
+    Input:
+      - job : Dictionary describing the scenario (see `sweep`)
+
+    Output:
+      - row : Summary row of the scenario
+    """
+    # Variables
+    name = job["name"]
+    s_path = job["d_path"] + "/" + name
+    ctx = RunContext()
+    row = {"name": name}
+    row.update(job["overrides"])
+
+    try:
+        # Run the MILP
+        if "milp" in job["solvers"]:
+            row.update(__runMILP(ctx, job["cfg"], s_path))
+
+        # Run Quin-Modified
+        if "qm" in job["solvers"]:
+            row.update(__runQM(ctx, job["cfg"], s_path, "milp" not in job["solvers"]))
+
+        row["error"] = ""
+    except Exception:
+        row["error"] = traceback.format_exc().strip().splitlines()[-1]
+
+    return row
+
+
+##-------------------------------------------------------------------------------
+#
+def sweep(c_path: str = "./config", d_path: str = "../data/sweep"):
+    """
+    Run every scenario of the sweep in a process pool and write the summary
+    table to 'D_PATH/summary.csv'.
+
+    Input:
+      - c_path : Path to the base configuration directory
+      - d_path : Path to the sweep output directory
+
+    Output:
+      - rows : Summary rows of every scenario
+    """
+    # Variables
+    sw, cfg = loadSweep(c_path)
+    scenarios = genScenarios(sw)
+    solvers = sw.get("solvers", ["milp", "qm"])
+    jobs = max(1, min(cfg.jobs, len(scenarios)))
+
+    # Split the machine between the workers so the total number of solver
+    # threads does not exceed the number of cores
+    threads = max(1, (os.cpu_count() or 1) // jobs)
+
+    dir_util.create_dir(d_path)
+
+    # Describe each scenario
+    work = []
+    for name, overrides in scenarios:
+        g = dict(sw.get("general") or {})
+        g.update({"threads": threads, "run_prev": 0, "load_from_file": 0, "plot": 0})
+        g.update({"schedule." + k: v for k, v in overrides.items()})
+
+        work.append(
+            {
+                "name": name,
+                "overrides": overrides,
+                "cfg": cfg.override(g),
+                "d_path": d_path,
+                "solvers": solvers,
+            }
+        )
+
+    print("Running {0} scenarios on {1} workers ({2} threads each)".format(
+        len(work), jobs, threads))
+
+    # Run the scenarios. Each worker only runs a single scenario so that the
+    # solver state starts clean for every scenario.
+    with mp.Pool(processes=jobs, maxtasksperchild=1) as pool:
+        rows = pool.map(runScenario, work, chunksize=1)
+
+    __writeSummary(d_path + "/summary.csv", rows)
+
+    return rows
+
+
+##===============================================================================
+# PRIVATE
+
+
+##-------------------------------------------------------------------------------
+#
+def __runMILP(dm: RunContext, cfg: Config, s_path: str) -> dict:
+    """
+    Generate the schedule and solve the MILP for a scenario.
+
+    Input:
+      - dm     : Run context of the scenario
+      - cfg    : Configuration of the scenario
+      - s_path : Path to the scenario output directory
+
+    Output:
+      - row : MILP summary columns
+    """
+    # Variables
+    start = time.perf_counter()
+
+    # Create schedule and model
+    dm["model"] = createModel(cfg)
+    Schedule(dm["model"], cfg, s_path, dm)
+
+    # Optimize
+    o = Optimizer(s_path, cfg, dm)
+    setupObjective(o, dm)
+    setupConstraints(o, dm)
+
+    try:
+        results = o.optimize()
+        outputData("milp", results, s_path + "/", ctx=dm)
+    except gp.GurobiError:
+        ## Only tolerate the failure if no solution was found (infeasible or
+        ## out of time)
+        if dm["model"].SolCount > 0:
+            raise
+        results = None
+
+    m = dm["model"]
+    sim = simulate(dm.m_params, results) if results else {}
+    return {
+        "N": dm["N"],
+        "A": dm["A"],
+        "Q": dm["Q"],
+        "milp_status": m.Status,
+        "milp_obj": __objective(results) if results else float("nan"),
+        "milp_bound": __attr(m, "ObjBound"),
+        "milp_gap": __attr(m, "MIPGap"),
+        "milp_violations": sim.get("violations", float("nan")),
+        "milp_peak": sim.get("peak", float("nan")),
+        "milp_time": time.perf_counter() - start,
+    }
+
+
+##-------------------------------------------------------------------------------
+#
+def __runQM(dm: RunContext, cfg: Config, s_path: str, gen: bool) -> dict:
+    """
+    Solve a scenario with Quin-Modified.
+
+    Input:
+      - dm     : Run context of the scenario
+      - cfg    : Configuration of the scenario
+      - s_path : Path to the scenario output directory
+      - gen    : Generate the schedule (no MILP was run)
+
+    Output:
+      - row : Quin-Modified summary columns
+    """
+    # Variables
+    start = time.perf_counter()
+    row = {}
+
+    # Create schedule if the MILP did not
+    if gen:
+        Schedule(None, cfg, s_path, dm)
+        row = {"N": dm["N"], "A": dm["A"], "Q": dm["Q"]}
+
+    results = QuinModified(cfg, ctx=dm).optimize()
+    outputData("qm", dm, s_path + "/")
+    sim = simulate(dm.m_params, results)
+
+    row.update(
+        {
+            "qm_obj": __objective(results),
+            "qm_violations": sim["violations"],
+            "qm_peak": sim["peak"],
+            "qm_time": time.perf_counter() - start,
+        }
+    )
+    return row
+
+
+##-------------------------------------------------------------------------------
+#
+def __attr(model, name: str) -> float:
+    """
+    Query a model attribute that may not be available (i.e. no solution was
+    found).
+
+    Input:
+      - model : Gurobi model
+      - name  : Name of the attribute
+
+    Output:
+      - val : Value of the attribute, NaN if it is not available
+    """
+    try:
+        return model.getAttr(name)
+    except (AttributeError, gp.GurobiError):
+        return float("nan")
+
+
+##-------------------------------------------------------------------------------
+#
+def __objective(results: dict) -> float:
+    """
+    Evaluate the MILP objective for a set of results.
+
+    Input:
+      - results : Results dictionary
+
+    Output:
+      - J : Assignment plus usage cost
+    """
+    m = np.asarray(results["m"], dtype=float)
+    e = np.asarray(results["e"], dtype=float)
+    return float(columnSum(results["w"]) @ m + columnSum(results["g"]) @ e)
+
+
+##-------------------------------------------------------------------------------
+#
+def __writeSummary(path: str, rows: list):
+    """
+    Write the summary table of the sweep to disk
+
+    Input:
+      - path : Path to the summary CSV
+      - rows : Summary rows of every scenario
+
+    Output:
+      - CSV file located at PATH
+    """
+    # Collect every column in order of appearance
+    fields = []
+    for r in rows:
+        fields += [k for k in r.keys() if k not in fields]
+
+    with open(path, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fields, restval="nan")
+        writer.writeheader()
+        writer.writerows(rows)
+
+    return
+
+
+##===============================================================================
+# MAIN
+def main():
+    rows = sweep()
+
+    failed = [r["name"] for r in rows if r["error"]]
+    print("Finished {0} scenarios ({1} failed)".format(len(rows), len(failed)))
+    return
+
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/python
+
+"""
+`tune` searches for the Gurobi parameters that solve the MILP fastest for a
+given instance size. For each size bucket listed in `config/tune.yaml`, a set of
+representative instances is randomly generated and the candidate parameter sets
+are scored on them. The best parameter set is cached in `config/tuning.yaml`,
+from which `Optimizer` picks the profile matching the size of the instance it
+solves.
+
+Two search methods are available:
+
+- 'random' : Random search over `tuning.SEARCH_SPACE`
+- 'gurobi' : Gurobi's own tuner run on the first instance of the bucket
+
+In both cases the default parameters are scored as well, so a profile is only
+kept if it beats the defaults.
+"""
+
+# ================================================================================
+# INCLUDES
+
+# Standard Lib
+import tempfile
+
+import numpy as np
+
+from gurobipy import GRB
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+#
+# NOTE: Importing `main` includes the source tree in the path
+from main import createModel, setupConstraints, setupObjective
+
+from config_loader import Config, loadConfig, loadYAML
+from optimizer import Optimizer
+from run_context import RunContext
+from scheduler import Schedule
+from tuning import SEARCH_SPACE, bucketKey, saveProfile, sizeBucket
+
+##===============================================================================
+# FUNCTIONS
+
+
+##-------------------------------------------------------------------------------
+#
+def tune(c_path: str = "./config"):
+    """
+    Tune every bucket listed in 'C_PATH/tune.yaml' and store the profiles in
+    'C_PATH/tuning.yaml'.
+
+    Input:
+      - c_path : Path to the configuration directory
+
+    Output:
+      - profiles : Dictionary of the new profiles indexed by bucket key
+    """
+    # Variables
+    profiles = {}
+    tcfg = loadYAML(c_path + "/tune.yaml")
+    cfg = loadConfig(c_path)
+
+    for N, Q in tcfg["buckets"]:
+        N, Q = sizeBucket(N, Q)
+        print("Tuning {0}...".format(bucketKey(N, Q)))
+
+        profile = tuneBucket(N, Q, tcfg, cfg)
+        saveProfile(c_path + "/tuning.yaml", N, Q, profile)
+        profiles[bucketKey(N, Q)] = profile
+
+        print(
+            "{0}: {1} (score {2:.2f}, default {3:.2f})".format(
+                bucketKey(N, Q), profile["params"], profile["score"], profile["default_score"]
+            )
+        )
+
+    return profiles
+
+
+##-------------------------------------------------------------------------------
+#
+def tuneBucket(N: int, Q: int, tcfg: dict, cfg: Config) -> dict:
+    """
+    Score the candidate parameter sets on representative instances of a size
+    bucket.
+
+    Input:
+      - N       : Number of visits of the bucket
+      - Q       : Number of chargers of the bucket
+      - tcfg    : Parsed 'tune.yaml'
+      - cfg     : Base configuration
+
+    Output:
+      - profile : Best parameters of the bucket and their score
+    """
+    # Variables
+    method = tcfg.get("method", "random")
+    candidates = None
+    scores = None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for k in range(tcfg["instances"]):
+            ## Generate a representative instance
+            model, o = __genInstance(N, Q, k, tcfg, cfg, tmp)
+
+            ## Determine the candidates on the first instance
+            if candidates is None:
+                candidates = [{}]
+                if method == "gurobi":
+                    candidates += __gurobiTune(model, tcfg)
+                else:
+                    candidates += __randomCandidates(tcfg)
+                scores = np.zeros(len(candidates))
+
+            ## Score every candidate on the instance
+            for i, c in enumerate(candidates):
+                scores[i] += __score(model, c, tcfg)
+
+            model.dispose()
+
+    best = int(np.argmin(scores))
+
+    return {
+        "N": N,
+        "Q": Q,
+        "method": method,
+        "params": candidates[best],
+        "score": float(scores[best]) / tcfg["instances"],
+        "default_score": float(scores[0]) / tcfg["instances"],
+    }
+
+
+##===============================================================================
+# PRIVATE
+
+
+##-------------------------------------------------------------------------------
+#
+def __genInstance(N, Q, k, tcfg, cfg, tmp):
+    """
+    Generate a random instance of the bucket and build its model.
+
+    Input:
+      - N       : Number of visits
+      - Q       : Number of chargers
+      - k       : Index of the instance (used as the seed)
+      - tcfg    : Parsed 'tune.yaml'
+      - cfg     : Base configuration
+      - tmp     : Scratch directory
+
+    Output:
+      - model : Built Gurobi model
+      - o     : Optimizer of the model
+    """
+    # Variables
+    dm = RunContext()
+    sc_cfg = cfg.override(
+        {
+            "schedule_type": "random",
+            "run_prev": 0,
+            "load_from_file": 0,
+            "schedule.buses.num_visit": N,
+            "schedule.chargers.slow.num": Q // 2,
+            "schedule.chargers.fast.num": Q - Q // 2,
+            "schedule.seed": tcfg.get("seed", 0) + k,
+        }
+    )
+
+    # Build the model
+    dm["model"] = createModel(sc_cfg)
+    Schedule(dm["model"], sc_cfg, tmp, dm)
+
+    o = Optimizer(tmp, sc_cfg, dm)
+    setupObjective(o, dm)
+    setupConstraints(o, dm)
+    o.build()
+
+    return dm["model"], o
+
+
+##-------------------------------------------------------------------------------
+#
+def __randomCandidates(tcfg: dict) -> list:
+    """
+    Draw distinct random parameter sets from the search space.
+
+    Input:
+      - tcfg : Parsed 'tune.yaml'
+
+    Output:
+      - candidates : List of parameter dictionaries
+    """
+    # Variables
+    rng = np.random.default_rng(tcfg.get("seed", 0))
+    keys = list(SEARCH_SPACE.keys())
+    n_max = int(np.prod([len(SEARCH_SPACE[k]) for k in keys]))
+    seen = set()
+    candidates = []
+
+    while len(candidates) < min(tcfg["trials"], n_max):
+        c = tuple(SEARCH_SPACE[k][rng.integers(len(SEARCH_SPACE[k]))] for k in keys)
+
+        if c not in seen:
+            seen.add(c)
+            candidates.append(dict(zip(keys, [v.item() if hasattr(v, "item") else v for v in c])))
+
+    return candidates
+
+
+##-------------------------------------------------------------------------------
+#
+def __gurobiTune(model, tcfg: dict) -> list:
+    """
+    Run Gurobi's tuner on a model.
+
+    Input:
+      - model : Built Gurobi model
+      - tcfg  : Parsed 'tune.yaml'
+
+    Output:
+      - candidates : The best parameter set found by the tuner (if any)
+    """
+    model.resetParams()
+    model.setParam("TimeLimit", tcfg["time_limit"])
+    model.setParam("TuneTimeLimit", tcfg["trials"] * tcfg["time_limit"])
+    model.tune()
+
+    if model.TuneResultCount == 0:
+        return []
+
+    # Read back the tuned values of the parameters of interest
+    model.getTuneResult(0)
+    return [dict((k, model.getParamInfo(k)[2]) for k in SEARCH_SPACE.keys())]
+
+
+##-------------------------------------------------------------------------------
+#
+def __score(model, params: dict, tcfg: dict) -> float:
+    """
+    Solve a model from scratch with a parameter set and score the solve. A
+    solve that does not prove optimality is penalized by its remaining gap.
+
+    Input:
+      - model  : Built Gurobi model
+      - params : Parameters to solve with
+      - tcfg   : Parsed 'tune.yaml'
+
+    Output:
+      - score : Solve time, penalized if not optimal [s]
+    """
+    # Variables
+    lim = tcfg["time_limit"]
+
+    model.reset(1)
+    model.resetParams()
+    model.setParam("OutputFlag", 0)
+    model.setParam("TimeLimit", lim)
+    for k, v in params.items():
+        model.setParam(k, v)
+
+    model.optimize()
+
+    if model.Status == GRB.OPTIMAL:
+        return model.Runtime
+
+    # The objective is a single objective, so the gap is available as soon as
+    # there is an incumbent
+    gap = min(1.0, model.MIPGap) if model.SolCount > 0 else 1.0
+
+    return lim * (1.0 + gap)
+
+
+##===============================================================================
+# MAIN
+def main():
+    tune()
+    return
+
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    main()
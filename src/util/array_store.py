@@ -0,0 +1,148 @@
+"""
+`array_store` saves a dictionary of parameters or results to disk without
+pickle.
+
+A store is a directory holding one uncompressed `.npy` file per array and a
+small JSON header:
+
+- `version`: version of the format (see `VERSION`)
+- `keys`   : the keys of the dictionary in order
+- `scalars`: the scalar values (int, float, bool, str or None)
+- `arrays` : the file and kind (`array`, `list` or `csr`) of every array
+
+A scipy.sparse matrix is stored in CSR format, its `data`, `indices` and
+`indptr` arrays each in their own file.
+
+The arrays are opened with `mmap_mode`, so loading a store only reads the header
+and maps the arrays; the data is read from disk when it is used. The arrays are
+mapped copy-on-write, so they can be modified in memory without changing the
+store.
+"""
+
+# Standard Library
+import json
+import os
+import shutil
+
+import numpy as np
+import scipy.sparse as sp
+
+##===============================================================================
+# PUBLIC CONSTANTS
+VERSION = 1  # Version of the store format
+HEADER = "header.json"  # Name of the header file
+
+##===============================================================================
+# PUBLIC
+
+
+##-------------------------------------------------------------------------------
+#
+def saveArrays(path: str, data: dict):
+    """
+    Save a dictionary to the store at PATH. The store is written next to PATH
+    and then swapped in, so a store is never left half written.
+
+    Input:
+      - path : Path to the store directory
+      - data : Dictionary of scalars, lists, numpy arrays and scipy.sparse
+               matrices
+
+    Output:
+      - Store at PATH
+    """
+    # Variables
+    path = os.path.normpath(path)
+    tmp = path + ".tmp"
+    old = path + ".old"
+    header = {"version": VERSION, "keys": list(data.keys()), "scalars": {}, "arrays": {}}
+
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    # Write every array to its own file
+    for i, (k, v) in enumerate(data.items()):
+        if isinstance(v, np.generic):
+            v = v.item()
+
+        if v is None or isinstance(v, (bool, int, float, str)):
+            header["scalars"][k] = v
+            continue
+
+        if sp.issparse(v):
+            v = sp.csr_array(v)
+            f = {}
+            for part in ["data", "indices", "indptr"]:
+                f[part] = "arr_{0}_{1}.npy".format(i, part)
+                np.save(os.path.join(tmp, f[part]), getattr(v, part), allow_pickle=False)
+            header["arrays"][k] = {"file": f, "kind": "csr", "shape": list(v.shape)}
+            continue
+
+        if not isinstance(v, (list, tuple, np.ndarray)):
+            raise ValueError("{0}: cannot store '{1}' of type {2}".format(path, k, type(v).__name__))
+
+        a = np.asarray(v)
+        if a.dtype.hasobject:
+            raise ValueError("{0}: cannot store '{1}', it is not a numeric array".format(path, k))
+
+        f = "arr_{0}.npy".format(i)
+        np.save(os.path.join(tmp, f), a, allow_pickle=False)
+        header["arrays"][k] = {"file": f, "kind": "array" if isinstance(v, np.ndarray) else "list"}
+
+    with open(os.path.join(tmp, HEADER), "w") as f:
+        json.dump(header, f, indent=1)
+
+    # Swap the new store in
+    shutil.rmtree(old, ignore_errors=True)
+    if os.path.isdir(path):
+        os.replace(path, old)
+    os.replace(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+
+    return
+
+
+##-------------------------------------------------------------------------------
+#
+def loadArrays(path: str, mmap: bool = True) -> dict:
+    """
+    Load the store at PATH.
+
+    Input:
+      - path : Path to the store directory
+      - mmap : Map the arrays instead of reading them
+
+    Output:
+      - data : Dictionary that was saved to the store
+    """
+    # Variables
+    mode = "c" if mmap else None
+
+    with open(os.path.join(path, HEADER), "r") as f:
+        header = json.load(f)
+
+    if header.get("version") != VERSION:
+        raise ValueError(
+            "{0}: unsupported store version {1} (expected {2})".format(path, header.get("version"), VERSION)
+        )
+
+    # Restore the scalars and arrays in order
+    data = {}
+    for k in header["keys"]:
+        if k in header["scalars"]:
+            data[k] = header["scalars"][k]
+            continue
+
+        a = header["arrays"][k]
+        if a["kind"] == "csr":
+            parts = [
+                np.load(os.path.join(path, a["file"][part]), mmap_mode=mode, allow_pickle=False)
+                for part in ["data", "indices", "indptr"]
+            ]
+            data[k] = sp.csr_array(tuple(parts), shape=tuple(a["shape"]))
+            continue
+
+        v = np.load(os.path.join(path, a["file"]), mmap_mode=mode, allow_pickle=False)
+        data[k] = v.tolist() if a["kind"] == "list" else v
+
+    return data
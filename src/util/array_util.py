@@ -2,6 +2,7 @@
 
 # Standard Lib
 import numpy as np
+import scipy.sparse as sp
 
 ##===============================================================================
 # Input:
@@ -33,43 +34,6 @@ def final(array, element):
     # Could not find the element
     return -1
 
-##===============================================================================
-# Input:
-#   array: An array of elements
-#   element: The element being looked for
-#
-# Output:
-#   The index of the last actual visit of the bus
-#
-def lastVisit(array, element):
-    found = False
-    for i in range(len(array)-1, 0, -1):
-        if array[i] == element:
-            if found:
-                return i
-            else:
-                found = True
-
-    # Could not find the element
-    return -1
-
-##===============================================================================
-# Input:
-#   array   : An array of elements
-#   element : The element being looked for
-#   idx     : Index to start looking from
-#
-# Output:
-#   The index of the last actual visit of the bus
-#
-def prevVisit(array, element, idx):
-    for i in range(idx-1, -1, -1):
-        if array[i] == element:
-            return i
-
-    # Could not find the element
-    return -1
-
 ##===========================================================================
 # Input:
 #   lb: Lower bound to normalize off of
@@ -114,3 +78,56 @@ def initArray(size: tuple, dtype=float) -> np.ndarray:
         Array of values corresponding to the matrix
     """
     return -1*np.ones(size, dtype=dtype)
+
+##===============================================================================
+#
+def asMatrix(M, dtype=float):
+    """
+    Cast a dense or sparse matrix without densifying it
+
+    Input:
+        M     : Dense array or scipy.sparse matrix
+        dtype : Type of the values
+
+    Output:
+        Sparse matrix in CSR format if M is sparse, otherwise a numpy array
+    """
+    if sp.issparse(M):
+        return sp.csr_array(M, dtype=dtype)
+    return np.asarray(M, dtype=dtype)
+
+##===============================================================================
+#
+def valueAt(M, v) -> np.ndarray:
+    """
+    Value of every row i of a dense or sparse matrix at the column v[i]
+
+    Input:
+        M : Dense array or scipy.sparse matrix of N rows
+        v : Column of every row, negative if none
+
+    Output:
+        Array of the N values, 0 where v[i] < 0
+    """
+    v  = np.rint(np.asarray(v, dtype=float)).astype(int)
+    on = v >= 0
+    x  = np.zeros(len(v), dtype=float)
+
+    if sp.issparse(M):
+        M = sp.csr_array(M)
+    x[on] = np.asarray(M[np.flatnonzero(on), v[on]], dtype=float).ravel()
+    return x
+
+##===============================================================================
+#
+def columnSum(M) -> np.ndarray:
+    """
+    Sum of every column of a dense or sparse matrix
+
+    Input:
+        M : Dense array or scipy.sparse matrix
+
+    Output:
+        Array of the sums of the columns
+    """
+    return np.asarray(asMatrix(M).sum(axis=0), dtype=float).ravel()
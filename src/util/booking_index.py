@@ -0,0 +1,123 @@
+"""
+`booking_index` keeps track of the charges booked on each charger, sorted by
+start time, so that the free time of a charger within a visit is found by
+bisection.
+
+The charges of a charger never overlap, so sorting them by start time also
+sorts them by end time.
+"""
+
+# Standard Library
+import bisect
+
+
+##===============================================================================
+#
+class BookingIndex:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, Q: int):
+        """
+        Initialize every charger with no booking
+
+        Input:
+          - Q : Number of chargers
+
+        Output:
+          - None
+        """
+        self.starts = [[] for _ in range(Q)]  # Start of each charge, sorted
+        self.ends = [[] for _ in range(Q)]  # End of each charge, same order
+        self.ids = [[] for _ in range(Q)]  # Visit of each charge, same order
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def book(self, i: int, q: int, u: float, c: float):
+        """
+        Book a charge. Charges of no duration are not booked.
+
+        Input:
+          - i : Visit index
+          - q : Charger
+          - u : Start charge time
+          - c : Stop charge time
+
+        Output:
+          - None
+        """
+        if q < 0 or c <= u:
+            return
+
+        k = bisect.bisect_left(self.starts[q], u)
+        self.starts[q].insert(k, u)
+        self.ends[q].insert(k, c)
+        self.ids[q].insert(k, i)
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def cancel(self, i: int, q: int, u: float, c: float):
+        """
+        Cancel the booking of a charge
+
+        Input:
+          - i : Visit index
+          - q : Charger
+          - u : Start charge time
+          - c : Stop charge time
+
+        Output:
+          - None
+        """
+        if q < 0 or c <= u:
+            return
+
+        k = bisect.bisect_left(self.starts[q], u)
+        while self.ids[q][k] != i:
+            k += 1
+
+        del self.starts[q][k]
+        del self.ends[q][k]
+        del self.ids[q][k]
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def place(self, q: int, a: float, t: float, need: float):
+        """
+        Find the free time on charger `q` within [a, t] for a charge of duration
+        `need`: the earliest gap that fits it, or else the longest gap.
+
+        Input:
+          - q    : Charger of interest
+          - a    : Earliest start time
+          - t    : Departure time
+          - need : Charge duration
+
+        Output:
+          - s : Start charge time
+          - d : Charge duration, at most `need`
+        """
+        st, en = self.starts[q], self.ends[q]
+        k = bisect.bisect_right(en, a)
+        s = a
+        best = (a, 0.0)
+
+        while True:
+            end = st[k] if k < len(st) and st[k] < t else t
+
+            d = end - s
+            if d >= need:
+                return s, need
+            if d > best[1]:
+                best = (s, d)
+            if end >= t:
+                return best
+
+            s = max(s, en[k])
+            k += 1
@@ -1,9 +1,56 @@
+"""
+`bus_data` describes the visit table: one record per visit with the ID of the
+bus, its arrival and departure times, the discharge of the route that follows
+and the index of the next visit of the same bus.
+
+The table is a structured numpy array, sorted by arrival time.
+"""
+
+# Standard Library
+import numpy as np
+
+# Developed
+from visit_index import VisitIndex
+
 ##===============================================================================
 #
-bus_info = \
-{
-    "id"              : None,
-    "arrival_time"    : None,
-    "departure_time"  : None,
-    "route_discharge" : None,
-}
+visit_dtype = np.dtype(
+    [
+        ("id", int),  # Bus ID
+        ("arrival", float),  # Arrival time [hr]
+        ("departure", float),  # Departure time [hr]
+        ("discharge", float),  # Discharge over the route after the visit [KWh]
+        ("next", int),  # Index of the next visit of the bus, -1 if none
+    ]
+)
+
+
+##-------------------------------------------------------------------------------
+#
+def visitTable(id, arrival, departure, discharge, A: int = None) -> np.ndarray:
+    """
+    Build the visit table sorted by arrival time. The visits of a bus must be
+    given in order; the sort is stable so they stay in order.
+
+    Input:
+      - id        : Bus ID of each visit
+      - arrival   : Arrival time of each visit
+      - departure : Departure time of each visit
+      - discharge : Discharge over the route after each visit
+      - A         : Number of buses, default: the largest ID plus one
+
+    Output:
+      - visits : Visit table (see `visit_dtype`)
+    """
+    # Sort by arrival time
+    arrival = np.asarray(arrival, dtype=float)
+    order = np.argsort(arrival, kind="stable")
+
+    visits = np.empty(len(arrival), dtype=visit_dtype)
+    visits["id"] = np.asarray(id, dtype=int)[order]
+    visits["arrival"] = arrival[order]
+    visits["departure"] = np.asarray(departure, dtype=float)[order]
+    visits["discharge"] = np.asarray(discharge, dtype=float)[order]
+    visits["next"] = VisitIndex(visits["id"], A).next_visit
+
+    return visits
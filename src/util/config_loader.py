@@ -0,0 +1,265 @@
+"""
+`config_loader` parses and validates 'general.yaml' and 'schedule.yaml' once and
+shares the result across the pipeline.
+
+`loadConfig` returns a `Config`: the settings of 'general.yaml' as typed,
+read-only attributes (`cfg.jobs`, `cfg.solver`, ...) and the parsed
+'schedule.yaml'. The files are parsed with the C YAML loader when PyYAML was
+built with it. A configuration directory is only parsed again if one of its
+files changed, so every stage of a run reads the same `Config`.
+
+The components that read the configuration take either the path to the
+configuration directory or a `Config`. A run can change its settings without
+writing files:
+
+    cfg = loadConfig("./config", {"jobs": 4, "schedule.buses.num_bus": 8})
+    Schedule(None, cfg)
+    QuinModified(cfg).optimize()
+
+Keys starting with 'schedule.' override 'schedule.yaml', the other keys
+override 'general.yaml'.
+
+The other YAML files of a configuration directory ('portfolio.yaml',
+'sweep.yaml', ...) are read with `loadYAML`, which uses the same loader and only
+parses a file again if it changed.
+"""
+
+# Standard Library
+import copy
+import os
+import yaml
+
+from types import MappingProxyType
+
+# Developed
+from dict_util import applyOverrides
+
+##===============================================================================
+# PUBLIC CONSTANTS
+REQUIRED = object()  # Marks a setting without default value
+
+# Settings of 'general.yaml': name -> (type, default)
+GENERAL = \
+{
+    'cache'          : (int,   0),        #  Number of cached schedules
+    'checkpoint'     : (int,   0),        #  Checkpoint interval                 [s]
+    'formulation'    : (str,   "compact"),#  MILP formulation
+    'heuristic'      : (str,   "quin"),   #  Heuristic
+    'jobs'           : (int,   REQUIRED), #  Number of worker processes
+    'load_from_file' : (int,   REQUIRED), #  Load the results of the previous run
+    'local_search'   : (int,   0),        #  Improve the heuristic schedule
+    'plot'           : (int,   0),        #  Show the plots
+    'resume'         : (int,   0),        #  Resume from the checkpoint
+    'robustness'     : (int,   0),        #  Evaluate the robustness of the schedules
+    'run_prev'       : (int,   REQUIRED), #  Reuse the previous schedule
+    'schedule_type'  : (str,   REQUIRED), #  Type of schedule ('random' or 'csv')
+    'solver'         : (str,   REQUIRED), #  MILP solver
+    'threads'        : (int,   0),        #  Solver threads, 0: solver default
+    'time_limit'     : (float, REQUIRED), #  Solver time limit                   [s]
+    'verbose'        : (int,   REQUIRED), #  Verbose solver output
+    'warm_start'     : (int,   0),        #  Warm start the MILP
+}
+
+# Settings 'schedule.yaml' must have
+SCHEDULE = ['time.BOD', 'time.EOD', 'time.K',
+            'chargers.slow.num', 'chargers.slow.rate',
+            'chargers.fast.num', 'chargers.fast.rate']
+
+LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)  # Fastest available YAML loader
+SIZE = 16  # Number of parsed configuration directories kept
+
+##===============================================================================
+# PRIVATE VARIABLES
+__parsed = {}  # (path, file contents) -> Config
+__files = {}  # (path, file contents) -> Parsed YAML file
+
+
+##===============================================================================
+#
+class Config:
+    __slots__ = ("path", "general", "_schedule")
+
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, path: str, general: dict, schedule: dict):
+        """
+        Validate a configuration
+
+        Input:
+          - path     : Path to the configuration directory
+          - general  : Parsed 'general.yaml'
+          - schedule : Parsed 'schedule.yaml'
+
+        Output:
+          - None
+        """
+        typed = dict(general)
+
+        for k, (t, default) in GENERAL.items():
+            v = general.get(k, default)
+
+            if v is REQUIRED:
+                raise ValueError("general.yaml: missing setting '{0}'".format(k))
+
+            try:
+                typed[k] = v if v is None else t(v)
+            except (TypeError, ValueError):
+                raise ValueError("general.yaml: '{0}' must be a {1}, got {2!r}".format(k, t.__name__, v))
+
+        for k in SCHEDULE:
+            d = schedule
+            for p in k.split("."):
+                if not isinstance(d, dict) or p not in d:
+                    raise ValueError("schedule.yaml: missing setting '{0}'".format(k))
+                d = d[p]
+
+        object.__setattr__(self, "path", path)
+        object.__setattr__(self, "general", MappingProxyType(typed))
+        object.__setattr__(self, "_schedule", schedule)
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    @property
+    def schedule(self) -> dict:
+        """
+        Input:
+          - None
+
+        Output:
+          - init : Copy of the parsed 'schedule.yaml'
+        """
+        return copy.deepcopy(self._schedule)
+
+    ##---------------------------------------------------------------------------
+    #
+    def override(self, overrides: dict):
+        """
+        Input:
+          - overrides : Dictionary of `key: value` overrides, nested keys are
+                        separated by '.' and the keys of 'schedule.yaml' start
+                        with 'schedule.'
+
+        Output:
+          - cfg : Copy of the configuration with the overrides applied
+        """
+        general = dict(self.general)
+        schedule = {}
+
+        for k, v in overrides.items():
+            if k.startswith("schedule."):
+                schedule[k[len("schedule."):]] = v
+            else:
+                general[k] = v
+
+        return Config(self.path, general, applyOverrides(self._schedule, schedule))
+
+    ##---------------------------------------------------------------------------
+    #
+    def __reduce__(self):
+        return (Config, (self.path, dict(self.general), self._schedule))
+
+    ##---------------------------------------------------------------------------
+    #
+    def __getattr__(self, key):
+        try:
+            return self.general[key]
+        except KeyError:
+            raise AttributeError("invalid setting: {0}".format(key))
+
+    ##---------------------------------------------------------------------------
+    #
+    def __setattr__(self, key, val):
+        raise AttributeError("the configuration can not be modified, use `override`")
+
+
+##===============================================================================
+# PUBLIC
+
+
+##-------------------------------------------------------------------------------
+#
+def loadConfig(c_path="./config", overrides: dict = None) -> Config:
+    """
+    Parse and validate the configuration of a run
+
+    Input:
+      - c_path    : Path to the configuration directory, or a `Config`
+      - overrides : Dictionary of `key: value` overrides (see `Config.override`)
+
+    Output:
+      - cfg : Configuration of the run
+    """
+    if isinstance(c_path, Config):
+        cfg = c_path
+    else:
+        cfg = __parse(c_path)
+
+    return cfg.override(overrides) if overrides else cfg
+
+
+##-------------------------------------------------------------------------------
+#
+def loadYAML(path: str):
+    """
+    Parse a YAML file, or copy the result of parsing the same file before
+
+    Input:
+      - path : Path to the YAML file
+
+    Output:
+      - data : Parsed file
+    """
+    with open(path, "rb") as f:
+        key = (os.path.abspath(path), f.read())
+
+    if key not in __files:
+        # Forget the oldest file
+        if len(__files) >= SIZE:
+            del __files[next(iter(__files))]
+
+        __files[key] = yaml.load(key[1], Loader=LOADER)
+
+    return copy.deepcopy(__files[key])
+
+
+##===============================================================================
+# PRIVATE
+
+
+##-------------------------------------------------------------------------------
+#
+def __parse(c_path: str) -> Config:
+    """
+    Parse a configuration directory, or return the `Config` parsed from the
+    same files
+
+    Input:
+      - c_path : Path to the configuration directory
+
+    Output:
+      - cfg : Configuration of the run
+    """
+    # Variables
+    files = []
+
+    for name in ["general.yaml", "schedule.yaml"]:
+        with open(os.path.join(c_path, name), "rb") as f:
+            files.append(f.read())
+
+    key = (os.path.abspath(c_path), *files)
+
+    if key not in __parsed:
+        general, schedule = (yaml.load(b, Loader=LOADER) or {} for b in files)
+
+        # Forget the oldest configuration
+        if len(__parsed) >= SIZE:
+            del __parsed[next(iter(__parsed))]
+
+        __parsed[key] = Config(c_path, general, schedule)
+
+    return __parsed[key]
@@ -2,6 +2,11 @@
 import numpy as np
 import csv
 
+# Developed Modules
+from array_util   import valueAt
+from data_manager import DataManager
+from run_context  import RunContext
+
 
 ##===============================================================================
 # STATIC
@@ -15,7 +20,7 @@ e_cell = "nan"
 
 ##-------------------------------------------------------------------------------
 #
-def outputData(fn, dm, path: str = "../data/"):
+def outputData(fn, dm, path: str = "../data/", ctx: RunContext = None):
     """
     Output data in a format for LaTeX to be able to plot
 
@@ -23,11 +28,16 @@ def outputData(fn, dm, path: str = "../data/"):
       - fn : Base name of the file
       - dm : Data manager
       - str: Path to output directory
+      - ctx: Run context of the results, default: dm if it is one, otherwise
+             the process-wide DataManager
 
     Output:
       - Data files
     """
-    __chargeOut(fn, dm, path)
+    if ctx is None:
+        ctx = dm if isinstance(dm, RunContext) else DataManager()
+
+    __chargeOut(fn, dm, path, ctx.visitIndex())
     __usageOut(fn, dm, path)
     __powerOut(fn, dm, path)
     __accEnergyOut(fn, dm, path)
@@ -42,13 +52,14 @@ def outputData(fn, dm, path: str = "../data/"):
 
 ##-------------------------------------------------------------------------------
 #
-def __chargeOut(fn, dm, path):
+def __chargeOut(fn, dm, path, visit):
     """
         Output charge plot data
     Input:
-        - fn : Base name of the file
-        - dm : Data manager
-        - str: Path to output directory
+        - fn   : Base name of the file
+        - dm   : Data manager
+        - str  : Path to output directory
+        - visit: Index of the visits of each bus
 
     Output:
         - Data files
@@ -57,13 +68,12 @@ def __chargeOut(fn, dm, path):
     name = fn + "-charge"
     N = dm["N"]
     A = dm["A"]
-    G = dm["Gamma"]
     eta = dm["eta"]
     u = dm["u"]
     c = dm["c"]
     v = dm["v"]
     r = dm["r"]
-    g = dm["g"]
+    g = valueAt(dm["g"], dm["v"])
     data = -1 * np.ones((2 * N, 2 * A))
     fields = [["time" + str(i), "eta" + str(i)] for i in range(A)]
     fields = [j for k in fields for j in k]
@@ -72,20 +82,18 @@ def __chargeOut(fn, dm, path):
     for j in range(A):
         t_i = 0
 
-        ## For every visit
-        for i in range(N):
-            ### If the visit is for the bus of interest
-            if G[i] == j:
-                #### Append the charge on arrival
-                data[t_i][j * 2 + 0] = u[i]
-                data[t_i][j * 2 + 1] = eta[i]
+        ## For every visit of the bus
+        for i in visit.visits(j):
+            ### Append the charge on arrival
+            data[t_i][j * 2 + 0] = u[i]
+            data[t_i][j * 2 + 1] = eta[i]
 
-                #### Append the charge on departure
-                data[t_i + 1][j * 2 + 0] = c[i]
-                data[t_i + 1][j * 2 + 1] = eta[i] + g[i][int(v[i])] * r[int(v[i])]
+            ### Append the charge on departure
+            data[t_i + 1][j * 2 + 0] = c[i]
+            data[t_i + 1][j * 2 + 1] = eta[i] + g[i] * r[int(v[i])]
 
-                #### Update index
-                t_i += 2
+            ### Update index
+            t_i += 2
 
     # Write data to disk
     __saveToFile(path, name, fields, data)
@@ -113,7 +121,7 @@ def __usageOut(fn, dm, path):
     N = dm["N"]
     T = dm["T"]
     u = dm["u"]
-    g = dm["g"]
+    g = valueAt(dm["g"], dm["v"])
     p = dm["p"]
     c = dm["c"]
     v = [int(i) for i in dm["v"]]
@@ -126,7 +134,7 @@ def __usageOut(fn, dm, path):
     for k in np.linspace(0.01, T - 0.01, K):
         data[idx, 0] = k
         for i in range(N):
-            if u[i] <= k and c[i] >= k and g[i][v[i]] > 0.0:
+            if u[i] <= k and c[i] >= k and g[i] > 0.0:
                 if v[i] < slow:
                     data[idx, 1] += 1
                 else:
@@ -158,7 +166,7 @@ def __powerOut(fn, dm, path):
     N = dm["N"]
     T = dm["T"]
     c = dm["c"]
-    g = dm["g"]
+    g = valueAt(dm["g"], dm["v"])
     r = dm["r"]
     u = dm["u"]
     v = [int(i) for i in dm["v"]]
@@ -171,7 +179,7 @@ def __powerOut(fn, dm, path):
         data[idx, 0] = k
 
         for i in range(N):
-            if u[i] <= k and c[i] >= k and g[i][v[i]] > 0:
+            if u[i] <= k and c[i] >= k and g[i] > 0:
                 data[idx, 1] += r[v[i]]
 
         idx += 1
@@ -202,7 +210,7 @@ def __accEnergyOut(fn, dm, path):
     T      = dm["T"]
     c      = dm["c"]
     dt     = dm["dt"]
-    g      = dm["g"]
+    g      = valueAt(dm["g"], dm["v"])
     r      = dm["r"]
     u      = dm["u"]
     v      = [int(i) for i in dm["v"]]
@@ -218,7 +226,7 @@ def __accEnergyOut(fn, dm, path):
             data[idx, 1] = data[idx - 1, 1]  # Use the previous data
 
         for i in range(N):
-            if u[i] <= k and c[i] >= k and g[i][v[i]] > 0:
+            if u[i] <= k and c[i] >= k and g[i] > 0:
                 data[idx, 1] += r[v[i]] * dt
 
         idx += 1
@@ -247,7 +255,7 @@ def __scheduleOut(fn, dm, path):
     A = dm["A"]
     N = dm["N"]
     G = dm["Gamma"]
-    g = dm["g"]
+    g = valueAt(dm["g"], dm["v"])
     r = dm["r"]
     u = dm["u"]
     v = [int(i) for i in dm["v"]]
@@ -257,10 +265,10 @@ def __scheduleOut(fn, dm, path):
 
     # For each visit
     for i in range(N):
-        if g[i][v[i]] > 0.001:
+        if g[i] > 0.001:
             data[i][G[i] * 3 + 0] = v[i]
             data[i][G[i] * 3 + 1] = u[i]
-            data[i][G[i] * 3 + 2] = g[i][v[i]]
+            data[i][G[i] * 3 + 2] = g[i]
 
     # Write data to disk
     __saveToFile(path, name, fields, data)
@@ -1,3 +1,6 @@
+# Standard Lib
+import copy
+
 ##===============================================================================
 # Input:
 #
@@ -7,3 +10,31 @@ def merge_dicts(x,y):
     z = x.copy()
     z.update(y)
     return z
+
+##===============================================================================
+#
+def applyOverrides(init: dict, overrides: dict) -> dict:
+    """
+    Apply a set of overrides to a parsed YAML file. Nested keys are separated
+    by '.', i.e. `chargers.slow.num`.
+
+    Input:
+      - init      : Parsed YAML file
+      - overrides : Dictionary of `key: value` overrides
+
+    Output:
+      - init : Copy of the YAML file with the overrides applied
+    """
+    init = copy.deepcopy(init)
+
+    for key, val in overrides.items():
+        d = init
+        path = key.split(".")
+
+        ## Walk down to the dictionary holding the final key
+        for k in path[:-1]:
+            d = d.setdefault(k, {})
+
+        d[path[-1]] = val
+
+    return init
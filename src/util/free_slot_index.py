@@ -0,0 +1,266 @@
+"""
+`free_slot_index` keeps track of the free time slots of each charger for the
+Quin-Modified heuristic.
+
+The free slots of a charger never overlap (they may touch), so sorting them by
+start time also sorts them by end time. The slots overlapping a window [a, t]
+are thus a contiguous range of that order. Each slot carries the sequence
+number of its creation: the heuristic uses the oldest overlapping slot, which
+is the one a scan of the slots in order of creation finds first.
+
+The slots of each charger are held in a treap (a binary search tree balanced by
+random priorities) ordered by start time, where each node also records the
+oldest slot of its subtree. The oldest slot overlapping a window is found in
+O(log F) and a reservation splits a slot in O(log F) expected time, F being the
+number of free slots of the charger.
+"""
+
+# Standard Library
+import random
+
+
+##===============================================================================
+#
+class FreeSlotIndex:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, Q: int, BOD: float, EOD: float):
+        """
+        Initialize every charger with a single free slot spanning the day
+
+        Input:
+          - Q   : Number of chargers
+          - BOD : Beginning of day
+          - EOD : End of day
+
+        Output:
+          - None
+        """
+        self.rng = random.Random(0)  # Treap priorities, seeded so runs repeat
+        self.roots = [self.__node((BOD, EOD, 0)) for _ in range(Q)]  # Treap of the free slots of each charger
+        self.seq = 1  # Sequence number of the next slot
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def findFreeTime(self, q: int, a: float, t: float):
+        """
+        Find the oldest free slot of charger `q` overlapping [a, t] (touching
+        counts as overlapping).
+
+        Input:
+          - q : Charger of interest
+          - a : Arrival time
+          - t : Departure time
+
+        Output:
+          - u    : Start charge time
+          - c    : End charge time
+          - slot : Free slot used, None if no slot overlaps [a, t]
+        """
+        # Descend to the first node overlapping [a, t], the root of the
+        # overlapping range
+        node = self.roots[q]
+        while node is not None:
+            if node[0][1] < a:
+                node = node[3]
+            elif node[0][0] > t:
+                node = node[2]
+            else:
+                break
+
+        if node is None:
+            return a, t, None
+
+        best = node[0]
+
+        # Left of the range root, every slot ending at or after the arrival
+        # overlaps, and with it everything to its right
+        n = node[2]
+        while n is not None:
+            if n[0][1] >= a:
+                best = self.__older(best, n[0], n[3])
+                n = n[2]
+            else:
+                n = n[3]
+
+        # Right of the range root, every slot starting at or before the
+        # departure overlaps, and with it everything to its left
+        n = node[3]
+        while n is not None:
+            if n[0][0] <= t:
+                best = self.__older(best, n[0], n[2])
+                n = n[3]
+            else:
+                n = n[2]
+
+        return max(a, best[0]), min(t, best[1]), best
+
+    ##---------------------------------------------------------------------------
+    #
+    def reserve(self, q: int, slot: tuple, u: float, c: float):
+        """
+        Reserve [u, c] within a free slot. The slot is replaced by the free time
+        before and after the reservation (either may be empty).
+
+        Input:
+          - q    : Charger of interest
+          - slot : Free slot returned by `findFreeTime`
+          - u    : Start charge time
+          - c    : End charge time
+
+        Output:
+          - None
+        """
+        root = self.__delete(self.roots[q], slot)
+        root = self.__insert(root, (slot[0], u, self.seq))
+        self.roots[q] = self.__insert(root, (c, slot[1], self.seq + 1))
+        self.seq += 2
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def freeSlots(self, q: int) -> list:
+        """
+        Input:
+          - q : Charger of interest
+
+        Output:
+          - slots : Free slots of charger `q` as [start, end] in order of
+                    creation
+        """
+        # Variables
+        slots = []
+        stack = [self.roots[q]]
+
+        while stack:
+            n = stack.pop()
+            if n is not None:
+                slots.append(n[0])
+                stack += [n[2], n[3]]
+
+        return [[b, e] for b, e, _ in sorted(slots, key=lambda x: x[2])]
+
+    ##===========================================================================
+    # PRIVATE
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __node(self, slot: tuple) -> list:
+        """
+        Input:
+          - slot : (start, end, seq) of the slot
+
+        Output:
+          - node : Treap node holding the slot alone, as [slot, priority, left
+                   subtree, right subtree, oldest slot of the subtree]
+        """
+        return [slot, self.rng.random(), None, None, slot]
+
+    ##---------------------------------------------------------------------------
+    #
+    def __older(self, best: tuple, slot: tuple, sub: list) -> tuple:
+        """
+        Input:
+          - best : Oldest slot found so far
+          - slot : Slot of a node
+          - sub  : Subtree whose slots all count, may be None
+
+        Output:
+          - best : Oldest of `best`, `slot` and the slots of `sub`
+        """
+        if slot[2] < best[2]:
+            best = slot
+        if sub is not None and sub[4][2] < best[2]:
+            best = sub[4]
+        return best
+
+    ##---------------------------------------------------------------------------
+    #
+    def __update(self, node: list) -> list:
+        """
+        Recompute the oldest slot of a subtree after its children changed
+
+        Input:
+          - node : Treap node
+
+        Output:
+          - node : Same node
+        """
+        node[4] = node[0]
+        for child in (node[2], node[3]):
+            if child is not None and child[4][2] < node[4][2]:
+                node[4] = child[4]
+        return node
+
+    ##---------------------------------------------------------------------------
+    #
+    def __insert(self, node: list, slot: tuple) -> list:
+        """
+        Input:
+          - node : Root of a treap
+          - slot : (start, end, seq) of the slot to insert
+
+        Output:
+          - node : Root of the treap with the slot
+        """
+        if node is None:
+            return self.__node(slot)
+
+        side = 2 if slot < node[0] else 3
+        child = self.__insert(node[side], slot)
+        node[side] = child
+
+        # Rotate the new node up while its priority is larger
+        if child[1] > node[1]:
+            node[side] = child[5 - side]
+            child[5 - side] = self.__update(node)
+            node = child
+
+        return self.__update(node)
+
+    ##---------------------------------------------------------------------------
+    #
+    def __delete(self, node: list, slot: tuple) -> list:
+        """
+        Input:
+          - node : Root of a treap holding `slot`
+          - slot : (start, end, seq) of the slot to remove
+
+        Output:
+          - node : Root of the treap without the slot
+        """
+        if slot == node[0]:
+            return self.__merge(node[2], node[3])
+
+        side = 2 if slot < node[0] else 3
+        node[side] = self.__delete(node[side], slot)
+        return self.__update(node)
+
+    ##---------------------------------------------------------------------------
+    #
+    def __merge(self, left: list, right: list) -> list:
+        """
+        Input:
+          - left  : Treap whose slots all come before those of `right`
+          - right : Treap
+
+        Output:
+          - node : Root of the joined treap
+        """
+        if left is None:
+            return right
+        if right is None:
+            return left
+
+        if left[1] > right[1]:
+            left[3] = self.__merge(left[3], right)
+            return self.__update(left)
+
+        right[2] = self.__merge(left, right[2])
+        return self.__update(right)
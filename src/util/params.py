@@ -0,0 +1,199 @@
+"""
+`params` holds the input parameters of a schedule.
+
+Every parameter is a slot of `Params` with a fixed type. Scalars are converted
+to `int` or `float` and arrays to a contiguous numpy array of a fixed dtype when
+they are assigned, so the code reading the parameters can rely on a single
+layout. The length of an array is checked against the dimensions it depends on
+(A, N, Q or K) if that dimension is already set.
+
+`Params` behaves like a dictionary of the parameters, so it can be merged with
+the decision variables and saved like one.
+"""
+
+# Standard Library
+from collections.abc import MutableMapping
+
+import numpy as np
+
+##===============================================================================
+# PUBLIC CONSTANTS
+
+# Input Variables: name -> (type, dimensions), arrays have a tuple of dimensions
+FIELDS = \
+{
+    'A'      : (int,   None),   #  Number of buses
+    'Gamma'  : (int,   ('N',)), #  Array of visit ID's
+    'N'      : (int,   None),   #  Number of total visits
+    'Q'      : (int,   None),   #  Number of chargers
+    'S'      : (None,  None),   #  Length of a single charger
+    'T'      : (float, None),   #  Time horizon                                [hr]
+    'K'      : (int,   None),   #  Discrete number of steps in T
+    'a'      : (float, ('N',)), #  Arrival time of bus visit i                 [hr]
+    'alpha'  : (float, ('N',)), #  Initial charge percentage for bus a         [%]
+    'beta'   : (float, ('N',)), #  Final charge percentage for bus a at T      [%]
+    'dt'     : (float, None),   #  Discrete time step                          [hr]
+    'e'      : (float, ('Q',)), #  (epsilon) Cost of using charger q per unit time
+    'gamma'  : (int,   ('N',)), #  Array of values indicating the next index for bus i
+    'kappa'  : (float, ('A',)), #  Battery capacity for bus i                  [MJ]
+    'l'      : (float, ('N',)), #  (lambda) Discharge of bus visit over route i
+    'm'      : (float, ('Q',)), #  Cost of bus i being assigned to charger q
+    'maxr'   : (float, None),   #  Maximum rest time between routes            [hr]
+    'minr'   : (float, None),   #  Minimum rest time between routes            [hr]
+    'nu'     : (float, None),   #  Minimum charge allowed on departure of visit i [%]
+    'r'      : (float, ('Q',)), #  Charge rate for charger q                   [KWh]
+    's'      : (float, ('N',)), #  Length of a bus
+    't'      : (float, ('N',)), #  (tau) Departure time for bus visit i        [hr]
+    'tk'     : (float, ('K',)), #  Array of discrete times                     [hr]
+    'zeta'   : (float, ('A',)), #  Discharge rate for bus a                    [KW]
+    'slow'   : (int,   None),   #  Number of slow chargers
+    'fast'   : (int,   None),   #  Number of fast chargers
+}
+
+DIMS = ('A', 'N', 'Q', 'K')  # Parameters the arrays are checked against
+
+
+##===============================================================================
+#
+class Params(MutableMapping):
+    __slots__ = tuple(FIELDS)
+
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, params: dict = None):
+        """
+        Create the parameters, every parameter is unset (None)
+
+        Input:
+          - params : Initial parameters
+
+        Output:
+          - None
+        """
+        for k in FIELDS:
+            object.__setattr__(self, k, None)
+
+        if params:
+            self.update(params)
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def update(self, params=(), **kw):
+        """
+        Set several parameters, the dimensions are set first so the arrays are
+        checked against the new ones
+
+        Input:
+          - params : Dictionary or list of `(key, value)` pairs
+
+        Output:
+          - None
+        """
+        items = list(params.items() if hasattr(params, "items") else params) + list(kw.items())
+
+        for k, v in sorted(items, key=lambda kv: kv[0] not in DIMS):
+            self[k] = v
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def copy(self) -> dict:
+        """
+        Input:
+          - None
+
+        Output:
+          - params : Dictionary of the parameters
+        """
+        return {k: getattr(self, k) for k in FIELDS}
+
+    ##---------------------------------------------------------------------------
+    #
+    def __getstate__(self):
+        return self.copy()
+
+    ##---------------------------------------------------------------------------
+    #
+    def __setstate__(self, state):
+        self.__init__(state)
+
+    ##---------------------------------------------------------------------------
+    #
+    def __setattr__(self, key, val):
+        self[key] = val
+
+    ##---------------------------------------------------------------------------
+    #
+    def __setitem__(self, key, val):
+        """
+        Convert and check a parameter
+
+        Input:
+          - key : Name of the parameter
+          - val : Value of the parameter
+
+        Output:
+          - None
+        """
+        if key not in FIELDS:
+            raise KeyError("invalid parameter: {0}".format(key))
+
+        t, dims = FIELDS[key]
+
+        if val is None or t is None:
+            pass
+
+        ## Scalars
+        elif dims is None:
+            val = t(val)
+
+        ## Arrays, the length must match the dimension if it is set
+        else:
+            val = np.require(val, dtype=t, requirements="C")
+
+            n = getattr(self, dims[0])
+            if val.ndim != 1 or (n is not None and len(val) != n):
+                raise ValueError(
+                    "{0} must have {1} = {2} elements, got shape {3}".format(key, dims[0], n, val.shape)
+                )
+
+        object.__setattr__(self, key, val)
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError("invalid parameter: {0}".format(key))
+
+        return getattr(self, key)
+
+    ##---------------------------------------------------------------------------
+    #
+    def __delitem__(self, key):
+        raise TypeError("parameters can not be removed, set them to None instead")
+
+    ##---------------------------------------------------------------------------
+    #
+    def __contains__(self, key):
+        return key in FIELDS
+
+    ##---------------------------------------------------------------------------
+    #
+    def __iter__(self):
+        return iter(FIELDS)
+
+    ##---------------------------------------------------------------------------
+    #
+    def __len__(self):
+        return len(FIELDS)
+
+    ##---------------------------------------------------------------------------
+    #
+    def __repr__(self):
+        return "Params({0})".format(self.copy())
@@ -0,0 +1,152 @@
+"""
+`run_context` holds the state of a single run: the input parameters, the
+decision variables and the model.
+
+Every component that reads or writes the schedule (`Schedule`, `Optimizer`, the
+heuristics, `outputData` and the plots) takes the context of its run, so several
+schedules can live in one process. Without a context, they fall back on the
+process-wide `DataManager`, which is itself a context.
+
+The input parameters are a `Params`, which converts and checks them as they are
+set. The `VisitIndex` of the visits is built once per schedule by `visitIndex`
+and shared by every component of the run.
+"""
+
+# Standard Library
+import numpy as np
+
+# Developed
+from params      import DIMS, FIELDS, Params
+from visit_index import VisitIndex
+
+##===============================================================================
+# PUBLIC CONSTANTS
+
+# Decision Variables
+DECISION_VARS = \
+{
+    'c'     : None, #  Detatch time for visit i                         [hr]
+    'delta' : None, #  Determines if i is "fully left" of j
+    'eta'   : None, #  Initial charge for bus visit i                   [MJ]
+    'g'     : None, #  Linearization for bilinear term g := p[i]*w[i][q]
+    'p'     : None, #  Time to charge for bus visit i                   [hr]
+    'sigma' : None, #  Determines if i is "fully below" j
+    'u'     : None, #  Initial charge time for visit i                  [hr]
+    'v'     : None, #  Assigned queue for visit i
+    'w'     : None, #  Matrix represetntation of bus charger assignments
+}
+
+##===============================================================================
+#
+class RunContext(object):
+    ##===========================================================================
+    # PUBLIC
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self):
+        """
+        Create an empty context
+
+        Input:
+          NONE
+
+        Output:
+          NONE
+        """
+        self.m_params       = Params()
+        self.m_decision_var = DECISION_VARS.copy()
+        self.m_visit        = None  # (Gamma, A, index of the visits)
+        return
+
+    ##---------------------------------------------------------------------------
+    # Input:
+    #   key: Key for the dictionary
+    #   val: Value to be inserted
+    #
+    # Output:
+    #   key_exists: Returns of the key exists (value was saved)
+    #
+    def set(self, key, val):
+        # Input parameters are converted and checked by `Params`
+        if key in FIELDS:
+            self.m_params[key] = val
+
+        # Decision variables given as lists are stored as arrays, the model is
+        # stored with them once it is set
+        elif key in DECISION_VARS or key == 'model':
+            self.m_decision_var[key] = np.asarray(val) if isinstance(val, list) else val
+
+        else:
+            return False
+
+        return True
+
+    ##---------------------------------------------------------------------------
+    # Input:
+    #   keys: List of keys for the dictionary
+    #   vals: List of values to be inserted
+    #
+    # Output:
+    #   key_exists: Returns list of key existence in dict (value was saved)
+    #
+    def setList(self, keys, vals):
+        keys, vals = list(keys), list(vals)
+
+        # Set the dimensions first, the arrays are checked against them
+        order = sorted(range(len(keys)), key=lambda i: keys[i] not in DIMS)
+        key_exists = [False]*len(keys)
+
+        for i in order:
+            key_exists[i] = self.set(keys[i], vals[i])
+
+        return key_exists
+
+    ##---------------------------------------------------------------------------
+    # Input:
+    #   NONE
+    #
+    # Output:
+    #   visit: Index of the visits of each bus, None if Gamma is not set. It is
+    #          built again only once Gamma or A change
+    #
+    def visitIndex(self):
+        G, A = self.m_params.Gamma, self.m_params.A
+
+        if G is None:
+            return None
+
+        # Gamma is a new array every time it is set
+        if self.m_visit is None or self.m_visit[0] is not G or self.m_visit[1] != A:
+            self.m_visit = (G, A, VisitIndex(G, A))
+
+        return self.m_visit[2]
+
+    ##---------------------------------------------------------------------------
+    # Input:
+    #   key: Key for the dictionary
+    #
+    # Output:
+    #   value: The value associated with the specified key
+    #
+    def __getitem__(self, key):
+        if key in FIELDS:
+            return getattr(self.m_params, key)
+
+        if key in self.m_decision_var:
+            return self.m_decision_var[key]
+
+        if key == 'model':
+            return None
+
+        raise KeyError("invalid run context key: {0}".format(key))
+
+    ##---------------------------------------------------------------------------
+    # Input:
+    #   key: Key for the dictionary
+    #
+    # Output:
+    #   key_exists: Returns of the key exists (value was saved)
+    #
+    def __setitem__(self, key, value):
+        return self.set(key, value)
@@ -0,0 +1,197 @@
+"""
+`simulator` replays a charging schedule independently of the solver that
+produced it. The charge of every bus is propagated from its initial charge
+through its visits (charge gained on the assigned charger, then the discharge of
+the next route), and the schedule is checked against the physical limits:
+
+- 'window'  : Charge outside of the visit or ending before it starts
+- 'overlap' : Charger booked by two visits at once
+- 'empty'   : Negative charge
+- 'nu'      : Charge below `nu` of the battery capacity after a route
+- 'kappa'   : Charge above the battery capacity
+- 'beta'    : Final charge below `beta` of the battery capacity
+
+Everything is computed with numpy array operations (no loop over the visits),
+so a schedule of 10k visits is checked in a few milliseconds.
+"""
+
+# Standard Library
+import numpy as np
+
+# Developed
+from array_util import asMatrix, columnSum
+
+# Violation kinds, in order of reporting
+KINDS = ["window", "overlap", "empty", "nu", "kappa", "beta"]
+
+##===============================================================================
+# FUNCTIONS
+
+
+##-------------------------------------------------------------------------------
+#
+def simulate(params: dict, results: dict, eps: float = 1e-6) -> dict:
+    """
+    Simulate a schedule and check it against the physical limits.
+
+    Input:
+      - params  : Input parameters of the schedule
+      - results : Decision variables of the schedule (`u`, `c`, `v`, `g`, `w`,
+                  optionally `eta`)
+      - eps     : Tolerance of the checks
+
+    Output:
+      - sim : Dictionary with
+              - 'obj'        : MILP objective of the schedule
+              - 'peak'       : Peak power drawn by the chargers [kw]
+              - 'eta'        : Simulated charge on arrival of every visit [kwh]
+              - 'eta_error'  : Largest deviation of the reported charge from the
+                               simulated one [kwh]
+              - 'violations' : Number of visits violating any limit
+              - one entry per violation kind (see `KINDS`) with the number of
+                visits violating it
+    """
+    # Variables
+    N = int(params["N"])
+    G = np.asarray(params["Gamma"], dtype=int)
+    a = np.asarray(params["a"], dtype=float)
+    t = np.asarray(params["t"], dtype=float)
+    l = np.asarray(params["l"], dtype=float)
+    r = np.asarray(params["r"], dtype=float)
+    m = np.asarray(params["m"], dtype=float)
+    e = np.asarray(params["e"], dtype=float)
+    alp = np.asarray(params["alpha"], dtype=float)[:N]
+    kap = np.asarray(params["kappa"], dtype=float)[G]
+    beta = np.asarray(params["beta"], dtype=float)
+    nu = float(params["nu"])
+
+    u = np.asarray(results["u"], dtype=float)
+    c = np.asarray(results["c"], dtype=float)
+    v = np.rint(np.asarray(results["v"], dtype=float)).astype(int)
+    g = asMatrix(results["g"])
+    w = asMatrix(results["w"])
+
+    # Charge
+    eta = __propagate(G, a, alp * kap, g @ r - l)
+    charged = eta + g @ r
+
+    # Violations
+    on = v >= 0
+    bad = {
+        "window": on & ((u < a - eps) | (c > t + eps) | (c < u - eps)),
+        "overlap": __overlaps(u, c, v, eps),
+        "empty": (eta < -eps) | (charged - l < -eps),
+        "nu": charged - l < nu * kap - eps,
+        "kappa": charged > kap + eps,
+        "beta": (beta > 0) & (eta < beta * kap - eps),
+    }
+
+    sim = {k: int(np.count_nonzero(bad[k])) for k in KINDS}
+    sim["violations"] = int(np.count_nonzero(np.logical_or.reduce([bad[k] for k in KINDS])))
+    sim["obj"] = float(columnSum(w) @ m + columnSum(g) @ e)
+    sim["peak"] = __peakPower(u[on], c[on], r[v[on]])
+    sim["eta"] = eta
+    sim["eta_error"] = (
+        float(np.max(np.abs(np.asarray(results["eta"], dtype=float) - eta), initial=0.0))
+        if results.get("eta") is not None
+        else float("nan")
+    )
+
+    return sim
+
+
+##===============================================================================
+# PRIVATE
+
+
+##-------------------------------------------------------------------------------
+#
+def __propagate(G: np.ndarray, a: np.ndarray, eta0: np.ndarray, delta: np.ndarray):
+    """
+    Propagate the charge of every bus through its visits.
+
+    Input:
+      - G     : Bus of every visit
+      - a     : Arrival time of every visit
+      - eta0  : Initial charge of every visit (only read for the first visit of
+                each bus)
+      - delta : Change of charge over every visit and its next route
+
+    Output:
+      - eta : Charge on arrival of every visit
+    """
+    # Visits grouped by bus in order of arrival
+    idx = np.lexsort((a, G))
+    d = delta[idx]
+
+    # First visit of every group
+    first = np.ones(len(idx), dtype=bool)
+    first[1:] = G[idx[1:]] != G[idx[:-1]]
+    start = np.maximum.accumulate(np.where(first, np.arange(len(idx)), 0))
+
+    # Exclusive cumulative sum within each group
+    cs = np.cumsum(d) - d
+    eta = np.empty(len(idx))
+    eta[idx] = eta0[idx[start]] + cs - cs[start]
+
+    return eta
+
+
+##-------------------------------------------------------------------------------
+#
+def __overlaps(u: np.ndarray, c: np.ndarray, v: np.ndarray, eps: float):
+    """
+    Flag the charges that start before an earlier charge on the same charger has
+    ended.
+
+    Input:
+      - u   : Start charge times
+      - c   : Stop charge times
+      - v   : Assigned charger of every visit (-1 if none)
+      - eps : Tolerance
+
+    Output:
+      - bad : Visits overlapping an earlier charge
+    """
+    bad = np.zeros(len(v), dtype=bool)
+    idx = np.flatnonzero((v >= 0) & (c > u))
+    idx = idx[np.lexsort((u[idx], v[idx]))]
+
+    if len(idx) < 2:
+        return bad
+
+    # Latest stop time of the previous charges on the same charger. The charger
+    # offset keeps the running maximum from leaking into the next charger.
+    span = np.max(c[idx]) - np.min(u[idx]) + 1.0
+    off = v[idx] * span
+    ends = np.maximum.accumulate(c[idx] - np.min(u[idx]) + off) - off
+
+    same = v[idx[1:]] == v[idx[:-1]]
+    bad[idx[1:]] = same & (u[idx[1:]] - np.min(u[idx]) < ends[:-1] - eps)
+
+    return bad
+
+
+##-------------------------------------------------------------------------------
+#
+def __peakPower(u: np.ndarray, c: np.ndarray, r: np.ndarray) -> float:
+    """
+    Peak power drawn by a set of charges.
+
+    Input:
+      - u : Start charge times
+      - c : Stop charge times
+      - r : Charge rate of every charge
+
+    Output:
+      - peak : Largest total charge rate in use at once
+    """
+    if len(u) == 0:
+        return 0.0
+
+    # Stops are processed before starts at the same time
+    times = np.concatenate([c, u])
+    power = np.concatenate([-r, r])
+    order = np.lexsort((power, times))
+
+    return float(max(0.0, np.max(np.cumsum(power[order]))))
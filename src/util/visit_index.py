@@ -0,0 +1,117 @@
+"""
+`visit_index` indexes the visits of each bus: the first and last visit of every
+bus, and the next and previous visit of the same bus for every visit.
+
+The visits are grouped by bus with a single stable argsort of `Gamma`, so the
+visits of a bus keep their order (the visits are sorted by arrival time). Every
+query is then a lookup in an array.
+"""
+
+# Standard Library
+import numpy as np
+
+
+##===============================================================================
+#
+class VisitIndex:
+    ##===========================================================================
+    # PUBLIC
+    ##===========================================================================
+
+    ##---------------------------------------------------------------------------
+    #
+    def __init__(self, Gamma: np.ndarray, A: int = None):
+        """
+        Index the visits of each bus
+
+        Input:
+          - Gamma : ID of the bus of each visit
+          - A     : Number of buses, default: the largest ID plus one
+
+        Output:
+          - None
+        """
+        self.Gamma = G = np.asarray(Gamma, dtype=int)
+        N = len(G)
+        A = (int(np.max(G)) + 1 if N else 0) if A is None else int(A)
+
+        # Visits grouped by bus
+        self.order = order = np.argsort(G, kind="stable")
+        self.count = count = np.bincount(G, minlength=A)
+        self.start = start = np.cumsum(count) - count
+
+        # First and last visit of each bus
+        has = count > 0
+        self.first_visit = -np.ones(A, dtype=int)
+        self.last_visit = -np.ones(A, dtype=int)
+        self.first_visit[has] = order[start[has]]
+        self.last_visit[has] = order[start[has] + count[has] - 1]
+
+        # Next and previous visit of the same bus
+        same = G[order[1:]] == G[order[:-1]]
+        self.next_visit = -np.ones(N, dtype=int)
+        self.prev_visit = -np.ones(N, dtype=int)
+        self.next_visit[order[:-1][same]] = order[1:][same]
+        self.prev_visit[order[1:][same]] = order[:-1][same]
+        return
+
+    ##---------------------------------------------------------------------------
+    #
+    def first(self, b: int) -> int:
+        """
+        Input:
+          - b : Bus ID
+
+        Output:
+          - i : First visit of bus b, -1 if it has no visit
+        """
+        return int(self.first_visit[b])
+
+    ##---------------------------------------------------------------------------
+    #
+    def last(self, b: int) -> int:
+        """
+        Input:
+          - b : Bus ID
+
+        Output:
+          - i : Last visit of bus b, -1 if it has no visit
+        """
+        return int(self.last_visit[b])
+
+    ##---------------------------------------------------------------------------
+    #
+    def next(self, i: int) -> int:
+        """
+        Input:
+          - i : Visit index
+
+        Output:
+          - j : Next visit of the bus of visit i, -1 if i is its last visit
+        """
+        return int(self.next_visit[i])
+
+    ##---------------------------------------------------------------------------
+    #
+    def prev(self, i: int) -> int:
+        """
+        Input:
+          - i : Visit index
+
+        Output:
+          - j : Previous visit of the bus of visit i, -1 if i is its first
+                visit
+        """
+        return int(self.prev_visit[i])
+
+    ##---------------------------------------------------------------------------
+    #
+    def visits(self, b: int) -> np.ndarray:
+        """
+        Input:
+          - b : Bus ID
+
+        Output:
+          - idx : Visits of bus b in order
+        """
+        return self.order[self.start[b] : self.start[b] + self.count[b]]
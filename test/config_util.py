@@ -0,0 +1,47 @@
+"""
+`config_util` writes the configuration directories of the tests.
+
+`writeConfig` copies 'general.yaml' and 'schedule.yaml' from './src/config' to a
+test directory, with a random schedule that is never reused or loaded from a
+previous run, and writes a small 'portfolio.yaml'. The test modules must add
+'./src' to the path before importing it.
+"""
+
+# Standard Lib
+import yaml
+
+# Developed
+from dict_util import applyOverrides
+
+
+##===============================================================================
+#
+def writeConfig(path: str, overrides: dict, general: dict = {}):
+    """
+    Write a test configuration
+
+    Input:
+      - path      : Path to the configuration directory
+      - overrides : Overrides of 'schedule.yaml' (see `applyOverrides`)
+      - general   : Updates of 'general.yaml'
+
+    Output:
+      - None
+    """
+    with open("./src/config/general.yaml", "r") as f:
+        g = yaml.load(f, Loader=yaml.SafeLoader)
+    with open("./src/config/schedule.yaml", "r") as f:
+        init = yaml.load(f, Loader=yaml.SafeLoader)
+
+    g.update({"schedule_type": "random", "run_prev": 0, "load_from_file": 0,
+              "checkpoint": 0, "resume": 0, "jobs": 2})
+    g.update(general)
+
+    with open(path + "/general.yaml", "w") as f:
+        yaml.dump(g, f)
+    with open(path + "/schedule.yaml", "w") as f:
+        yaml.dump(applyOverrides(init, overrides), f)
+    with open(path + "/portfolio.yaml", "w") as f:
+        yaml.dump({"thresholds": [[0.85, 0.90, 0.95], [0.6, 0.8, 0.9]],
+                   "scan": ["slow", "fast"], "fit": ["earliest", "best"]}, f)
+    return
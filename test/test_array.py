@@ -5,6 +5,9 @@ import sys
 import os
 import unittest
 
+import numpy as np
+import scipy.sparse as sp
+
 ##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Include in path
 #
@@ -52,3 +55,19 @@ class TestArrayModule(unittest.TestCase):
         lb  = 5
         self.assertEqual(adjustArray(lb, arr) , [-1, -1, -1, -1, 4, 5, 6, 7, 8])
         return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_sparse(self):
+        M = np.array([[0.0, 2.0], [3.0, 0.0], [0.0, 0.0]])
+        v = [1, 0, -1]
+
+        # Dense and sparse matrices give the same values
+        for x in [M, sp.csr_array(M), sp.coo_matrix(M)]:
+            np.testing.assert_array_equal(valueAt(x, v), [2.0, 3.0, 0.0])
+            np.testing.assert_array_equal(columnSum(x), [3.0, 2.0])
+
+        # Sparse matrices are not densified
+        self.assertTrue(sp.issparse(asMatrix(sp.csr_array(M > 0))))
+        np.testing.assert_array_equal(asMatrix(sp.csr_array(M > 0)) @ [1.0, 2.0], [2.0, 1.0, 0.0])
+        return
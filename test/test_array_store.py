@@ -0,0 +1,128 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import json
+import tempfile
+import unittest
+
+import numpy as np
+import scipy.sparse as sp
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from array_store import HEADER, loadArrays, saveArrays
+from data_manager import DataManager
+from scheduler import Schedule
+from config_util import writeConfig
+
+##===============================================================================
+#
+class TestArrayStore(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_round_trip(self):
+        data = {"N": 3, "dt": np.float64(0.1), "S": None, "name": "day",
+                "a": np.array([0.5, 1.0, 2.0]), "gamma": np.array([1, -1, -1]),
+                "m": [0, 1000], "w": np.eye(3, dtype=bool),
+                "sigma": sp.csr_array(np.triu(np.ones((4, 4), dtype=bool), 1))}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            saveArrays(tmp + "/store", data)
+            r = loadArrays(tmp + "/store")
+
+            # Same keys in the same order, scalars in the header
+            self.assertEqual(list(r.keys()), list(data.keys()))
+            self.assertEqual((r["N"], r["dt"], r["S"], r["name"]), (3, 0.1, None, "day"))
+            self.assertEqual(r["m"], [0, 1000])
+
+            # Arrays are mapped and keep their type
+            self.assertIsInstance(r["a"], np.memmap)
+            for k in ["a", "gamma", "w"]:
+                self.assertEqual(r[k].dtype, data[k].dtype)
+                np.testing.assert_array_equal(r[k], data[k])
+
+            # Sparse matrices stay sparse
+            self.assertTrue(sp.issparse(r["sigma"]))
+            self.assertEqual(r["sigma"].nnz, 6)
+            np.testing.assert_array_equal(r["sigma"].toarray(), data["sigma"].toarray())
+
+            # Mapped copy-on-write
+            r["a"][0] = 9.0
+            self.assertEqual(loadArrays(tmp + "/store")["a"][0], 0.5)
+
+            # Overwrite the store
+            saveArrays(tmp + "/store", {"N": 4})
+            self.assertEqual(loadArrays(tmp + "/store"), {"N": 4})
+            self.assertEqual(sorted(os.listdir(tmp)), ["store"])
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_invalid(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # Objects are never pickled
+            with self.assertRaises(ValueError):
+                saveArrays(tmp + "/store", {"x": [[1], [1, 2]]})
+            with self.assertRaises(ValueError):
+                saveArrays(tmp + "/store", {"x": {"y": 1}})
+
+            # Unknown version
+            saveArrays(tmp + "/store", {"x": np.zeros(2)})
+            with open(tmp + "/store/" + HEADER) as f:
+                header = json.load(f)
+            header["version"] += 1
+            with open(tmp + "/store/" + HEADER, "w") as f:
+                json.dump(header, f)
+
+            with self.assertRaises(ValueError):
+                loadArrays(tmp + "/store")
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_run_prev(self):
+        dm = DataManager()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": 40})
+            Schedule(None, tmp, tmp)
+            prev = {k: np.copy(v) for k, v in dm.m_params.items()}
+
+            # Reload the parameters of the previous run
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": 40},
+                        {"run_prev": 1})
+            Schedule(None, tmp, tmp)
+
+            for k, v in prev.items():
+                np.testing.assert_array_equal(dm[k], v)
+
+            # The previous schedule is not reused once the configuration changed
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": 41})
+            Schedule(None, tmp, tmp)
+            new = np.copy(dm["a"])
+
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": 40})
+            Schedule(None, tmp, tmp)
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": 41},
+                        {"run_prev": 1})
+            Schedule(None, tmp, tmp)
+
+            np.testing.assert_array_equal(dm["a"], new)
+            self.assertFalse(np.array_equal(dm["a"], prev["a"]))
+        return
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    unittest.main()
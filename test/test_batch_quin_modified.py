@@ -0,0 +1,122 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from batch_quin_modified import BatchQuinModified
+from quin_modified       import QuinModified
+from run_context         import RunContext
+from scheduler           import Schedule
+from config_util         import writeConfig
+
+##===============================================================================
+#
+class TestBatchQuinModified(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def scenario(self, path: str, seed: int, thresholds: tuple):
+        """
+        Run Quin-Modified on a random schedule whose visits all arrive and
+        depart at distinct times
+        """
+        writeConfig(path, {"buses.num_bus": 6, "buses.num_visit": 60,
+                           "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": seed})
+        ctx = RunContext()
+        Schedule(None, path, path, ctx)
+
+        # Random schedules arrive on a grid of times shared by the buses
+        ctx["a"] = ctx["a"] + 1e-6*np.arange(ctx["N"])
+        ctx["t"] = ctx["t"] - 1e-6*np.arange(ctx["N"], 0, -1)
+
+        high, med, low = thresholds
+        qm = QuinModified(path, high=high, med=med, low=low, ctx=ctx).optimize()
+        return ctx, {k: np.asarray(qm[k], dtype=float) for k in ["u", "c", "v", "eta"]}
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_parity(self):
+        thresholds = [(0.85, 0.90, 0.95), (0.6, 0.8, 0.9), (0.9, 0.92, 0.97)]
+        expected   = []
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for seed in [2, 3, 8, 16, 18, 19]:
+                high, med, low = thresholds[seed % len(thresholds)]
+                ctx, qm = self.scenario(tmp, seed, (high, med, low))
+
+                if not expected:
+                    batch = BatchQuinModified(tmp, ctx=ctx)
+                batch.add(ctx.m_params, high=high, med=med, low=low)
+                expected.append(qm)
+
+        r = batch.optimize()
+
+        for s, e in enumerate(expected):
+            # Quin-Modified never charged for zero time, which is where the two
+            # differ
+            on = e["v"] >= 0
+            self.assertTrue(np.all(e["c"][on] > e["u"][on]))
+
+            # Every scenario matches its own run of Quin-Modified
+            for k in ["u", "c", "v", "eta"]:
+                np.testing.assert_allclose(r[k][s], e[k], err_msg=k)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_zero_time(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ctx, qm = self.scenario(tmp, 0, (0.85, 0.90, 0.95))
+            batch = BatchQuinModified(tmp, ctx=ctx)
+            batch.add(ctx.m_params)
+            r = batch.optimize()
+
+        # The schedules first differ where Quin-Modified assigns a charger for
+        # zero time, which the batch does not assign
+        i = np.flatnonzero(r["v"][0] != qm["v"])[0]
+        self.assertGreaterEqual(qm["v"][i], 0)
+        self.assertEqual(qm["c"][i], qm["u"][i])
+        for k in ["u", "c", "v", "eta"]:
+            np.testing.assert_allclose(r[k][0][:i], qm[k][:i], err_msg=k)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_variants(self):
+        batch = BatchQuinModified("./src/config")
+        sc    = {k: np.zeros(4) for k in ["Gamma", "a", "alpha", "gamma", "kappa", "l", "t"]}
+
+        # Only the default charger scan and choice are batched
+        batch.add(dict(sc, N=4, Q=2), scan="slow", fit="earliest")
+        with self.assertRaises(ValueError):
+            batch.add(dict(sc, N=4, Q=2), scan="fast")
+        with self.assertRaises(ValueError):
+            batch.add(dict(sc, N=4, Q=2), fit="best")
+        self.assertEqual(len(batch.scenarios), 1)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_mismatched_scenarios(self):
+        batch = BatchQuinModified("./src/config")
+        sc    = {k: np.zeros(4) for k in ["Gamma", "a", "alpha", "gamma", "kappa", "l", "t"]}
+
+        batch.add(dict(sc, N=4, Q=2))
+        with self.assertRaises(ValueError):
+            batch.add(dict(sc, N=4, Q=3))
+        return
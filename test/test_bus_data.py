@@ -0,0 +1,45 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from bus_data import visit_dtype, visitTable
+
+##===============================================================================
+#
+class TestBusData(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_visit_table(self):
+        # Visits given bus by bus, in order
+        id        = [0, 0, 0, 1, 1, 2]
+        arrival   = [0.0, 5.0, 20.0, 0.0, 12.0, 5.0]
+        departure = [1.0, 6.0, 24.0, 2.0, 24.0, 24.0]
+        discharge = [40.0, 30.0, 0.0, 50.0, 0.0, 0.0]
+
+        v = visitTable(id, arrival, departure, discharge)
+
+        # Sorted by arrival, ties in the order given
+        self.assertEqual(v.dtype, visit_dtype)
+        np.testing.assert_array_equal(v["id"], [0, 1, 0, 2, 1, 0])
+        np.testing.assert_array_equal(v["arrival"], [0.0, 0.0, 5.0, 5.0, 12.0, 20.0])
+        np.testing.assert_array_equal(v["discharge"], [40.0, 50.0, 30.0, 0.0, 0.0, 0.0])
+
+        # Next visit of the same bus
+        np.testing.assert_array_equal(v["next"], [2, 4, 5, -1, -1, -1])
+        return
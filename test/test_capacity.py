@@ -0,0 +1,80 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+import yaml
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+sys.path.append("./src")
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from capacity       import capacity
+from config_util    import writeConfig
+
+##===============================================================================
+#
+class TestCapacity(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def search(self, overrides: dict, general: dict, cfg: dict):
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, overrides, general)
+            with open(tmp + "/capacity.yaml", "w") as f:
+                yaml.dump(cfg, f)
+
+            return capacity(tmp, tmp + "/capacity")
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_heuristics(self):
+        sched = {"buses.num_bus": 6, "buses.num_visit": 80}
+        cfg   = {"slow": [0, 4], "fast": [0, 2], "seed": 1, "heuristics": ["quin", "edf"], "milp": 0}
+
+        frontier, probes = self.search(sched, {"jobs": 3}, cfg)
+        feasible = {(p["slow"], p["fast"]): p["feasible"] for p in probes}
+
+        # The minimum is feasible and one slow charger less is not
+        self.assertEqual([r["fast"] for r in frontier], [0, 1, 2])
+        for r in frontier:
+            if r["slow"] is None:
+                self.assertFalse(feasible[(4, r["fast"])])
+                continue
+
+            self.assertTrue(feasible[(r["slow"], r["fast"])])
+            if r["slow"] > 0:
+                self.assertFalse(feasible[(r["slow"] - 1, r["fast"])])
+
+        # The probes do not depend on the number of workers
+        again, _ = self.search(sched, {"jobs": 1}, cfg)
+        self.assertEqual(frontier, again)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_milp_boundary(self):
+        sched = {"buses.num_bus": 4, "buses.num_visit": 16}
+        cfg   = {"slow": [0, 2], "fast": [1, 2], "seed": 1, "heuristics": ["quin"], "milp": 1,
+                 "general": {"time_limit": 60}}
+
+        frontier, probes = self.search(sched, {"jobs": 2, "verbose": 0}, cfg)
+        milp = [p for p in probes if p["method"] == "milp"]
+
+        # Quin-Modified fails for the whole range, so the MILP starts at the
+        # largest number of slow chargers and lowers the minimum
+        self.assertTrue(all(not p["feasible"] for p in probes if p["method"] == "quin"))
+        self.assertEqual(frontier, [{"fast": 1, "slow": None, "method": ""},
+                                    {"fast": 2, "slow": 0, "method": "milp"}])
+        self.assertEqual(sorted((p["slow"], p["fast"], p["feasible"]) for p in milp),
+                         [(0, 2, True), (1, 2, True), (2, 1, False), (2, 2, True)])
+        return
@@ -0,0 +1,126 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+sys.path.append("./src")
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from array_store    import loadArrays, saveArrays
+from checkpoint     import Checkpoint
+from main           import createModel, setupConstraints, setupObjective
+from optimizer      import Optimizer
+from run_context    import RunContext
+from scheduler      import Schedule
+from config_util    import writeConfig
+
+##===============================================================================
+#
+class TestCheckpoint(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def solve(self, path: str, general: dict):
+        """
+        Solve the MILP of the test instance
+
+        Input:
+          - path    : Path to the configuration and data directory
+          - general : Overrides of 'general.yaml'
+
+        Output:
+          - o : Optimizer
+          - m : Solved model
+        """
+        writeConfig(path, {"buses.num_bus": 4, "buses.num_visit": 16,
+                           "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": 40},
+                    dict({"time_limit": 60, "verbose": 0}, **general))
+
+        ctx = RunContext()
+        ctx["model"] = createModel(path)
+        ctx["model"].setParam("OutputFlag", 0)
+        Schedule(ctx["model"], path, path, ctx)
+
+        o = Optimizer(path, path, ctx)
+        setupObjective(o, ctx)
+        setupConstraints(o, ctx)
+        o.optimize()
+        return o, ctx["model"]
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(Checkpoint.load(tmp + "/checkpoint"))
+
+            # Resume from a previous checkpoint
+            prev = {"x": np.array([1.0, 0.0]), "obj": 10.0, "bound": 8.0, "runtime": 5.0}
+            ckpt = Checkpoint(tmp + "/checkpoint", 0, 1234, prev)
+            ckpt.runtime = 2.0
+            ckpt.save()
+
+            data = Checkpoint.load(tmp + "/checkpoint")
+            self.assertEqual(data["fingerprint"], 1234)
+            self.assertEqual((data["obj"], data["bound"], data["runtime"]), (10.0, 8.0, 7.0))
+            np.testing.assert_array_equal(data["x"], prev["x"])
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # The final state of the solve is checkpointed
+            _, m = self.solve(tmp, {"checkpoint": 1})
+            data = Checkpoint.load(tmp + "/checkpoint")
+            x = np.array(m.getAttr("X", m.getVars()))
+
+            self.assertEqual(data["fingerprint"], Checkpoint.modelFingerprint(m))
+            np.testing.assert_allclose(data["x"], x)
+            self.assertAlmostEqual(data["obj"], m.ObjVal, places=4)
+
+            # Spend most of the time limit
+            data["runtime"] = 45.0
+            saveArrays(tmp + "/checkpoint", data)
+
+            # The incumbent is the MIP start and only the remaining time is
+            # given to the solver
+            o, m = self.solve(tmp, {"checkpoint": 0, "resume": 1})
+            self.assertTrue(o.resumed)
+            self.assertEqual(m.Params.TimeLimit, 15.0)
+            np.testing.assert_allclose(m.getAttr("Start", m.getVars()), x)
+            self.assertAlmostEqual(m.ObjVal, data["obj"], places=4)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_mismatch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.solve(tmp, {"checkpoint": 1})
+
+            # A checkpoint of another model is ignored
+            data = loadArrays(tmp + "/checkpoint", mmap=False)
+            data["fingerprint"] += 1
+            saveArrays(tmp + "/checkpoint", data)
+
+            o, m = self.solve(tmp, {"checkpoint": 0, "resume": 1})
+            self.assertFalse(o.resumed)
+            self.assertEqual(m.Params.TimeLimit, 60.0)
+        return
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from column_generation import ColumnGeneration
+from data_manager      import DataManager
+from scheduler         import Schedule
+from simulator         import simulate
+from config_util       import writeConfig
+
+##===============================================================================
+#
+class TestColumnGeneration(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_feasible_schedule(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # Small random instance
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16,
+                              "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": 40},
+                        {"time_limit": 60})
+            dm = DataManager()
+            Schedule(None, tmp, tmp)
+
+            cg = ColumnGeneration(tmp)
+            r  = cg.optimize()
+
+        u, c, v = r['u'], r['c'], r['v']
+
+        # Every visit is covered within its time window
+        self.assertTrue(np.all(v >= 0), "A visit was not covered.")
+        self.assertTrue(np.all(u >= r['a'] - 1e-6), "A charge starts before the arrival.")
+        self.assertTrue(np.all(c <= r['t'] + 1e-6), "A charge ends after the departure.")
+
+        # No two charges overlap on a charger
+        for q in range(dm['Q']):
+            idx = np.flatnonzero((v == q) & (c > u))
+            idx = idx[np.argsort(u[idx])]
+            self.assertTrue(np.all(u[idx][1:] >= c[idx][:-1] - 1e-6), "Two charges overlap.")
+
+        # The bound does not exceed the objective
+        J = np.sum(r['w']*r['m'] + r['g']*r['e'])
+        self.assertLessEqual(cg.lower_bound, J + 1e-6)
+
+        # The schedule is physically valid
+        self.assertTrue(cg.feasible)
+        self.assertEqual(simulate(dm.m_params, r)["violations"], 0)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_slack(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # The generated columns only combine with the minimum charge slacks
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16,
+                              "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": 24},
+                        {"time_limit": 60})
+            Schedule(None, tmp, tmp)
+
+            cg = ColumnGeneration(tmp)
+            r  = cg.optimize()
+
+        # A solution using the artificial slacks is not a schedule
+        self.assertIsNone(r)
+        self.assertFalse(cg.feasible)
+        return
@@ -0,0 +1,121 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import pickle
+import tempfile
+import unittest
+import yaml
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from config_loader  import loadConfig, loadYAML
+from run_context    import RunContext
+from scheduler      import Schedule
+from config_util    import writeConfig
+
+##===============================================================================
+#
+class TestConfigLoader(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": 40})
+            cfg = loadConfig(tmp)
+
+            # Typed settings, parsed once for the same files
+            self.assertEqual((cfg.jobs, cfg.schedule_type), (2, "random"))
+            self.assertIsInstance(cfg.time_limit, float)
+            self.assertEqual(cfg.schedule["buses"]["num_visit"], 16)
+            self.assertIs(loadConfig(tmp), cfg)
+            self.assertIs(loadConfig(cfg), cfg)
+
+            # A changed file is parsed again
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": 41})
+            self.assertEqual(loadConfig(tmp).schedule["seed"], 41)
+
+            # The configuration can not be modified
+            with self.assertRaises(AttributeError):
+                cfg.jobs = 4
+            with self.assertRaises(TypeError):
+                cfg.general["jobs"] = 4
+            cfg.schedule["seed"] = 0
+            self.assertEqual(cfg.schedule["seed"], 40)
+
+            self.assertEqual(pickle.loads(pickle.dumps(cfg)).schedule, cfg.schedule)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_invalid(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {}, {"jobs": "many"})
+            with self.assertRaises(ValueError):
+                loadConfig(tmp)
+
+            writeConfig(tmp, {})
+            with open(tmp + "/schedule.yaml", "r") as f:
+                init = yaml.load(f, Loader=yaml.FullLoader)
+            del init["time"]["K"]
+            with open(tmp + "/schedule.yaml", "w") as f:
+                yaml.dump(init, f)
+            with self.assertRaises(ValueError):
+                loadConfig(tmp)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_override(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": 40})
+            cfg = loadConfig(tmp, {"jobs": 3, "schedule.buses.num_visit": 30})
+
+            self.assertEqual(cfg.jobs, 3)
+            self.assertEqual(loadConfig(tmp).jobs, 2)
+
+            # The schedule is generated from the overridden configuration
+            ctx = RunContext()
+            Schedule(None, cfg, tmp, ctx)
+            self.assertEqual(ctx["N"], 30)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_yaml(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = tmp + "/portfolio.yaml"
+            with open(path, "w") as f:
+                yaml.dump({"scan": ["slow", "fast"]}, f)
+
+            # Callers may change what they get without changing the cache
+            cfg = loadYAML(path)
+            cfg["scan"].append("none")
+            self.assertEqual(loadYAML(path), {"scan": ["slow", "fast"]})
+
+            # A changed file is parsed again
+            with open(path, "w") as f:
+                yaml.dump({"scan": ["fast"]}, f)
+            self.assertEqual(loadYAML(path), {"scan": ["fast"]})
+
+            # Only plain YAML is accepted
+            with open(path, "w") as f:
+                f.write("scan: !!python/object/apply:os.getcwd []\n")
+            with self.assertRaises(yaml.YAMLError):
+                loadYAML(path)
+        return
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+sys.path.append("./src")
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+import csv_loader
+
+from data_manager   import DataManager
+from scheduler      import Schedule
+from config_util    import writeConfig
+
+##===============================================================================
+#
+class TestCSVLoader(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def load(self, rows: list, ignore: list = []) -> DataManager:
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {"ignore": ignore}, {"schedule_type": "csv"})
+            with open(tmp + "/routes.csv", "w") as f:
+                f.write("ID, BEG, END\n" + "\n".join(rows) + "\n")
+
+            Schedule(None, tmp, tmp)
+
+        return DataManager()
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_visits(self):
+        dm = self.load(["7, 0.0, 3600.0, 7200.0, 10800.0",
+                        "8, 1800.0, 3600.0, 3600.0, 86400.0",
+                        "9, 0.0, 3600.0"], ignore=[9])
+
+        # Bus 7 arrives at the BOD, between its routes and after its last route.
+        # Bus 8 ends its day on its last route.
+        self.assertEqual(dm["A"], 2)
+        np.testing.assert_array_equal(dm["Gamma"], [0, 1, 0, 1, 0])
+        np.testing.assert_allclose(dm["a"], [0.0, 0.0, 1.0, 1.0, 3.0])
+        np.testing.assert_allclose(dm["t"], [0.0, 0.5, 2.0, 1.0, 24.0])
+        np.testing.assert_array_equal(dm["gamma"], [2, 3, 4, -1, -1])
+
+        z = dm["zeta"][0]
+        np.testing.assert_allclose(dm["l"], [z*1.0, z*0.5, z*1.0, z*23.0, 0.0])
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_chunks(self):
+        rows = ["{0}, {1}, {2}, {3}, {4}".format(b, 600.0*b, 600.0*b + 3600, 600.0*b + 7200, 600.0*b + 9000)
+                for b in range(23)]
+
+        whole = {k: np.copy(self.load(rows)[k]) for k in ["Gamma", "a", "t", "l"]}
+
+        chunk, csv_loader.CHUNK = csv_loader.CHUNK, 5
+        try:
+            parts = {k: np.copy(self.load(rows)[k]) for k in ["Gamma", "a", "t", "l"]}
+        finally:
+            csv_loader.CHUNK = chunk
+
+        for k in whole:
+            np.testing.assert_array_equal(whole[k], parts[k])
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_validation(self):
+        with self.assertRaisesRegex(ValueError, "bus 4 are not in order"):
+            self.load(["3, 0.0, 3600.0", "4, 3600.0, 1800.0"])
+
+        with self.assertRaisesRegex(ValueError, "bus 3 are not in order"):
+            self.load(["3, 0.0, 3600.0, 1800.0, 7200.0"])
+
+        with self.assertRaisesRegex(ValueError, ":3: a route is missing its END"):
+            self.load(["3, 0.0, 3600.0", "4, 3600.0"])
+
+        with self.assertRaisesRegex(ValueError, "non-numeric"):
+            self.load(["3, 0.0, x"])
+
+        # Invalid routes of ignored buses do not matter
+        self.assertEqual(self.load(["3, 0.0, 3600.0", "4, 3600.0, 1800.0"], ignore=[4])["A"], 1)
+        return
@@ -0,0 +1,89 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+sys.path.append("./src")
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from data_manager   import DataManager
+from data_output    import outputData
+from edf            import EDF
+from main           import createModel, setupConstraints, setupObjective
+from optimizer      import Optimizer
+from quin_modified  import QuinModified
+from scheduler      import Schedule
+from simulator      import simulate
+from config_util    import writeConfig
+
+##===============================================================================
+#
+class TestEDF(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_schedule(self):
+        dm = DataManager()
+
+        for seed in range(3):
+            with tempfile.TemporaryDirectory() as tmp:
+                writeConfig(tmp, {"buses.num_bus": 6, "buses.num_visit": 80,
+                                  "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": seed})
+                Schedule(None, tmp, tmp)
+                qm = simulate(dm.m_params, QuinModified(tmp).optimize())
+
+                # Building the schedule leaves the data manager untouched
+                u = np.copy(dm["u"])
+                s = EDF().construct()
+                np.testing.assert_array_equal(dm["u"], u)
+
+                # Saving the schedule writes it to the data manager
+                r = EDF().optimize()
+                outputData("edf", dm, tmp + "/")
+
+            # The schedule is valid, cheaper than Quin-Modified and its charge
+            # is the simulated one
+            sim = simulate(dm.m_params, r)
+            self.assertEqual(sim["violations"], 0)
+            self.assertLess(sim["obj"], qm["obj"])
+            self.assertLess(sim["eta_error"], 1e-6)
+            np.testing.assert_array_equal(s["v"], dm["v"])
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_warm_start(self):
+        dm = DataManager()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16,
+                              "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": 40},
+                        {"time_limit": 60, "verbose": 0})
+
+            dm["model"] = createModel(tmp)
+            dm["model"].setParam("OutputFlag", 0)
+            Schedule(dm["model"], tmp, tmp)
+
+            o = Optimizer(tmp, tmp)
+            setupObjective(o, dm)
+            setupConstraints(o, dm)
+            o.warmStart(EDF().construct())
+            r = o.optimize()
+
+        # The warm start does not change the optimum
+        J = np.sum(r['w']*np.asarray(r['m']) + r['g']*np.asarray(r['e']))
+        self.assertAlmostEqual(J, 15014.79, places=1)
+        return
@@ -0,0 +1,74 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from free_slot_index import FreeSlotIndex
+
+##===============================================================================
+#
+class TestFreeSlotIndex(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_list_scan_parity(self):
+        rng = np.random.default_rng(7)
+
+        for _ in range(20):
+            Q   = 3
+            idx = FreeSlotIndex(Q, 0, 100)
+            ref = [[[0, 100]] for _ in range(Q)]
+
+            for _ in range(200):
+                q = int(rng.integers(Q))
+                a = int(rng.integers(0, 100))
+                t = int(rng.integers(a, 101))
+
+                # Original scan: first overlapping slot in order of creation
+                i = next((s for s in ref[q] if not (t < s[0] or a > s[1])), None)
+                u, c, slot = idx.findFreeTime(q, a, t)
+
+                if i is None:
+                    self.assertIsNone(slot)
+                    continue
+
+                self.assertEqual((u, c), (max(a, i[0]), min(t, i[1])))
+                self.assertEqual(list(slot[:2]), i)
+
+                # Reserve a random part of the overlap (possibly empty)
+                u, c = sorted(rng.integers(u, c + 1, size=2).tolist())
+                idx.reserve(q, slot, u, c)
+                ref[q].remove(i)
+                ref[q] += [[i[0], u], [c, i[1]]]
+
+                self.assertEqual(idx.freeSlots(q), ref[q])
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_touching_slot(self):
+        idx = FreeSlotIndex(1, 0, 10)
+        u, c, slot = idx.findFreeTime(0, 2, 4)
+        idx.reserve(0, slot, u, c)
+
+        # A window ending where the reservation starts touches the first slot
+        self.assertEqual(idx.findFreeTime(0, 1, 2)[:2], (1, 2))
+
+        # A window within the reservation still touches both neighbours; the
+        # oldest is used
+        self.assertEqual(idx.findFreeTime(0, 2, 4)[:2], (2, 2))
+        return
@@ -0,0 +1,86 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from data_manager import DataManager
+from lagrangian   import Lagrangian
+from scheduler    import Schedule
+from simulator    import simulate
+from config_util  import writeConfig
+
+##===============================================================================
+#
+class TestLagrangian(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_bound_and_schedule(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # Small random instance
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16,
+                              "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": 40},
+                        {"time_limit": 60})
+            dm = DataManager()
+            Schedule(None, tmp, tmp)
+
+            lr = Lagrangian(tmp, max_iter=50)
+            r  = lr.optimize()
+
+        u, c, v = r['u'], r['c'], r['v']
+
+        # The schedule respects the time windows
+        self.assertTrue(np.all(u >= r['a'] - 1e-6), "A charge starts before the arrival.")
+        self.assertTrue(np.all(c <= r['t'] + 1e-6), "A charge ends after the departure.")
+
+        # No two charges overlap on a charger
+        for q in range(dm['Q']):
+            idx = np.flatnonzero((v == q) & (c > u))
+            idx = idx[np.argsort(u[idx])]
+            self.assertTrue(np.all(u[idx][1:] >= c[idx][:-1] - 1e-6), "Two charges overlap.")
+
+        # The bound does not exceed the objective of the schedule
+        J = np.sum(r['w']*r['m'] + r['g']*r['e'])
+        self.assertTrue(np.isfinite(lr.upper_bound), "No feasible schedule was found.")
+        self.assertAlmostEqual(lr.upper_bound, J)
+        self.assertLessEqual(lr.lower_bound, J + 1e-6)
+
+        # The MILP optimum of this instance is 15014.79
+        self.assertLessEqual(lr.lower_bound, 15014.79 + 1e-2)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_infeasible(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # Instance the relaxation proves infeasible
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16,
+                              "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": 0},
+                        {"time_limit": 60})
+            dm = DataManager()
+            Schedule(None, tmp, tmp)
+
+            lr = Lagrangian(tmp, max_iter=50)
+            r  = lr.optimize()
+
+        # No repaired schedule is recorded as an upper bound, and none
+        # overcharges a battery
+        self.assertTrue(np.isinf(lr.lower_bound))
+        self.assertTrue(np.isinf(lr.upper_bound))
+        self.assertEqual(simulate(dm.m_params, r)["kappa"], 0)
+        return
@@ -0,0 +1,99 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from data_manager  import DataManager
+from local_search  import LocalSearch
+from portfolio     import scoreSchedule
+from quin_modified import QuinModified
+from scheduler     import Schedule
+from config_util   import writeConfig
+
+##===============================================================================
+#
+class TestLocalSearch(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def improve(self, overrides: dict):
+        dm = DataManager()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, overrides)
+            Schedule(None, tmp, tmp)
+            qm = QuinModified(tmp).optimize()
+            qm = {k: np.copy(qm[k]) for k in ["u", "c", "v", "g", "w"]}
+
+        # Charge of the heuristic schedule
+        G, gam, r = dm['Gamma'], dm['gamma'], np.asarray(dm['r'])
+        E         = np.where(qm['v'] >= 0, r[np.maximum(qm['v'], 0)]*(qm['c'] - qm['u']), 0)
+        qm['eta'] = np.zeros(dm['N'])
+        for i in range(dm['N']):
+            if dm['alpha'][i] > 0:
+                qm['eta'][i] = dm['kappa'][G[i]]*dm['alpha'][i]
+            if gam[i] >= 0:
+                qm['eta'][gam[i]] = qm['eta'][i] + E[i] - dm['l'][i]
+
+        ls = LocalSearch()
+        r  = ls.optimize(qm)
+
+        return ls, scoreSchedule(dm.m_params, qm), scoreSchedule(dm.m_params, r)
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_improvement(self):
+        for seed in range(3):
+            ls, before, after = self.improve({"buses.num_bus": 8, "buses.num_visit": 100,
+                                              "chargers.slow.num": 3, "chargers.fast.num": 3,
+                                              "seed": seed})
+
+            # The schedule gets cheaper without violating more constraints
+            self.assertLess(after["obj"], before["obj"])
+            self.assertLessEqual(after["violations"], before["violations"])
+
+            # The incremental objective matches the schedule
+            self.assertAlmostEqual(ls.initial_obj, before["obj"], places=6)
+            self.assertAlmostEqual(ls.obj, after["obj"], places=6)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_range_min(self):
+        ls    = LocalSearch()
+        x     = np.random.default_rng(0).normal(size=37)
+        table = getattr(ls, "_LocalSearch__sparseTable")(x)
+        query = getattr(ls, "_LocalSearch__rangeMin")
+
+        # Every range matches its minimum
+        for lo in range(len(x)):
+            for hi in range(lo + 1, len(x) + 1):
+                self.assertEqual(query(table, lo, hi), np.min(x[lo:hi]))
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_milp_bound(self):
+        ls, before, after = self.improve({"buses.num_bus": 4, "buses.num_visit": 16,
+                                          "chargers.slow.num": 2, "chargers.fast.num": 2,
+                                          "seed": 40})
+
+        # The MILP optimum of this instance is 15014.79
+        self.assertGreaterEqual(after["obj"], 15014.79 - 1e-2)
+        self.assertLess(after["obj"], before["obj"])
+        return
@@ -0,0 +1,137 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import json
+import queue
+import tempfile
+import threading
+import unittest
+import yaml
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+sys.path.append("./src")
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from config_loader     import loadConfig
+from data_manager      import DataManager
+from online_dispatcher import OnlineDispatcher, eventsFromFile
+from quin_modified     import QuinModified
+from replay            import feed, genEvents
+from scheduler         import Schedule
+from config_util       import writeConfig
+
+##===============================================================================
+#
+class TestOnlineDispatcher(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def setUp(self):
+        self.dm  = DataManager()
+        self.tmp = tempfile.TemporaryDirectory()
+        path     = self.tmp.name
+
+        writeConfig(path, {"buses.num_bus": 6, "buses.num_visit": 120,
+                           "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": 3})
+        with open(path + "/online.yaml", "w") as f:
+            yaml.dump({"budget": 0.005, "speed": 1e6}, f)
+
+        Schedule(None, path, path)
+        self.events = genEvents(self.dm.m_params)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def tearDown(self):
+        self.tmp.cleanup()
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_matches_quin_modified(self):
+        N  = self.dm["N"]
+        od = OnlineDispatcher(self.tmp.name)
+        d  = od.run(self.events)
+        qm = QuinModified(self.tmp.name).optimize()
+
+        # Every visit but the first of each bus is dispatched
+        self.assertEqual(len(d), N - np.count_nonzero(self.dm["alpha"]))
+
+        # Streaming the arrivals gives the day-ahead schedule. The last visit
+        # is skipped: Quin-Modified stores the charge left by the last visit of
+        # every bus in it.
+        for x in d:
+            i = x["visit"]
+            if i == N - 1:
+                continue
+            self.assertEqual(x["v"], qm["v"][i])
+            self.assertAlmostEqual(x["u"], qm["u"][i])
+            self.assertAlmostEqual(x["c"], qm["c"][i])
+            self.assertAlmostEqual(x["eta"], qm["eta"][i])
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_sources(self):
+        od   = OnlineDispatcher(self.tmp.name)
+        keys = ["visit", "v", "u", "c"]
+        ref  = [[x[k] for k in keys] for x in od.run(self.events)]
+
+        # File of JSON lines
+        path = self.tmp.name + "/events.json"
+        with open(path, "w") as f:
+            for e in self.events:
+                f.write(json.dumps(e) + "\n")
+
+        od.reset()
+        self.assertEqual([[x[k] for k in keys] for x in od.run(eventsFromFile(path))], ref)
+
+        # Timed queue
+        q        = queue.Queue()
+        producer = threading.Thread(target=feed, args=(self.events, q, 1e6))
+
+        od.reset()
+        producer.start()
+        d = od.run(q)
+        producer.join()
+        self.assertEqual([[x[k] for k in keys] for x in d], ref)
+
+        # Latency statistics
+        stats = od.stats()
+        self.assertEqual(stats["events"], len(self.events))
+        self.assertLessEqual(stats["p50"], stats["p99"])
+        self.assertLessEqual(stats["p99"], stats["max"])
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_config(self):
+        cfg = loadConfig(self.tmp.name, {"schedule.chargers.slow.num": 3})
+        od  = OnlineDispatcher(cfg)
+
+        # 'online.yaml' is read from the directory of the configuration and
+        # the chargers from its overrides
+        self.assertEqual(od.budget, 0.005)
+        self.assertEqual(od.Q, 5)
+        self.assertEqual(len(od.run(self.events)), len(self.events))
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_budget(self):
+        od = OnlineDispatcher(self.tmp.name, budget=0.0)
+        od.run(self.events)
+
+        self.assertEqual(od.stats()["over_budget"], len(self.events))
+        return
@@ -0,0 +1,98 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import copy
+import pickle
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from params      import FIELDS, Params
+from run_context import RunContext
+
+##===============================================================================
+#
+class TestParams(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_types(self):
+        p = Params()
+        p["N"] = np.int64(3)
+        p["T"] = 24
+        p["Gamma"] = [0, 1, 0]
+        p["a"] = np.array([1, 2, 3])[::-1]
+
+        # Scalars are Python numbers, arrays are contiguous with a fixed dtype
+        self.assertEqual((type(p["N"]), type(p["T"])), (int, float))
+        self.assertEqual(p["Gamma"].dtype, int)
+        self.assertEqual(p["a"].dtype, float)
+        self.assertTrue(p["a"].flags.c_contiguous)
+        np.testing.assert_array_equal(p["a"], [3, 2, 1])
+
+        # Unset parameters are None, unknown ones do not exist
+        self.assertIsNone(p["Q"])
+        self.assertEqual(list(p), list(FIELDS))
+        with self.assertRaises(KeyError):
+            p["x"] = 1
+        with self.assertRaises(AttributeError):
+            p.__dict__
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_shapes(self):
+        p = Params({"A": 2, "N": 3, "Q": 2})
+
+        with self.assertRaises(ValueError):
+            p["a"] = np.zeros(4)
+        with self.assertRaises(ValueError):
+            p["kappa"] = np.zeros(3)
+        with self.assertRaises(ValueError):
+            p["m"] = np.zeros((2, 2))
+
+        # The dimensions are set before the arrays
+        p.update({"a": np.zeros(4), "N": 4})
+        self.assertEqual(len(p["a"]), 4)
+
+        ctx = RunContext()
+        self.assertEqual(ctx.setList(["r", "Q", "v"], [[1, 2], 2, [0, 1]]), [True, True, True])
+        self.assertEqual(ctx["r"].dtype, float)
+        self.assertIsInstance(ctx["v"], np.ndarray)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_mapping(self):
+        p = Params({"N": 2, "a": [0.5, 1.0]})
+
+        # Copies are plain dictionaries
+        d = p.copy()
+        self.assertIsInstance(d, dict)
+        self.assertEqual(d["N"], 2)
+        self.assertEqual(dict(p, x=1)["x"], 1)
+
+        for q in [copy.deepcopy(p), pickle.loads(pickle.dumps(p))]:
+            self.assertIsInstance(q, Params)
+            np.testing.assert_array_equal(q["a"], p["a"])
+
+        with self.assertRaises(TypeError):
+            del p["a"]
+        return
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+sys.path.append("./src")
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from data_manager  import DataManager
+from main          import createModel, setupConstraints, setupObjective
+from optimizer     import Optimizer
+from portfolio     import Portfolio, genVariants, scoreSchedule
+from quin_modified import QuinModified
+from run_context   import RunContext
+from scheduler     import Schedule
+from config_util   import writeConfig
+
+##===============================================================================
+#
+class TestPortfolio(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_gen_variants(self):
+        variants = genVariants({"thresholds": [[0.85, 0.9, 0.95], [0.6, 0.8, 0.9]],
+                                "scan": ["slow", "fast"]})
+
+        self.assertEqual(len(variants), 4)
+        self.assertEqual(variants[0], {"high": 0.85, "med": 0.9, "low": 0.95,
+                                       "scan": "slow", "fit": "earliest"})
+        self.assertEqual(variants[-1]["scan"], "fast")
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_best_variant(self):
+        dm = DataManager()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {"buses.num_bus": 6, "buses.num_visit": 60,
+                              "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": 0})
+            Schedule(None, tmp, tmp)
+
+            pf   = Portfolio(tmp)
+            best = pf.search()
+
+            # The default heuristic is one of the variants
+            default = scoreSchedule(dm.m_params, QuinModified(tmp).optimize())
+
+        self.assertEqual(len(pf.scores), 8)
+        self.assertIn(dict(pf.variants[0], **default), pf.scores)
+
+        # The best variant has the fewest violations, then the lowest objective
+        key = lambda x: (x["violations"], x["obj"])
+        self.assertEqual(key(best), min(key(x) for x in pf.scores))
+        self.assertLessEqual(key(best), key(default))
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_context(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # The data manager holds a larger schedule than the one searched
+            big, small = tmp + "/big", tmp + "/small"
+            for path, n in [(big, 60), (small, 30)]:
+                os.makedirs(path)
+                writeConfig(path, {"buses.num_bus": 6, "buses.num_visit": n,
+                                   "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": 0})
+            Schedule(None, big, big)
+
+            ctx = RunContext()
+            Schedule(None, small, small, ctx)
+
+            best    = Portfolio(small, ctx=ctx).search()
+            default = scoreSchedule(ctx.m_params, QuinModified(small, ctx=ctx).optimize())
+
+        # Every variant ran on the schedule of the context
+        self.assertEqual(len(best["u"]), 30)
+        self.assertLessEqual((best["violations"], best["obj"]),
+                             (default["violations"], default["obj"]))
+        self.assertEqual(DataManager()["N"], 60)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_warm_start(self):
+        dm = DataManager()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16,
+                              "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": 40},
+                        {"time_limit": 60, "verbose": 0})
+
+            dm["model"] = createModel(tmp)
+            dm["model"].setParam("OutputFlag", 0)
+            Schedule(dm["model"], tmp, tmp)
+
+            o = Optimizer(tmp, tmp)
+            setupObjective(o, dm)
+            setupConstraints(o, dm)
+            o.warmStart(Portfolio(tmp).search())
+            r = o.optimize()
+
+        # The warm start does not change the optimum
+        J = np.sum(r['w']*np.asarray(r['m']) + r['g']*np.asarray(r['e']))
+        self.assertAlmostEqual(J, 15014.79, places=1)
+        return
@@ -0,0 +1,113 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+sys.path.append("./src")
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from data_manager   import DataManager
+from quin_modified  import QuinModified
+from repair         import Repair
+from scheduler      import Schedule
+from simulator      import simulate
+from config_util    import writeConfig
+
+##===============================================================================
+#
+class TestRepair(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def setUp(self):
+        self.dm = DataManager()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {"buses.num_bus": 6, "buses.num_visit": 80,
+                              "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": 3})
+            Schedule(None, tmp, tmp)
+            r = QuinModified(tmp).optimize()
+
+        self.results = {k: np.copy(r[k]) for k in ["u", "c", "v", "g", "w"]}
+        self.before  = simulate(self.dm.m_params, self.results)
+
+        # A visit charged for a while, with later visits on the same bus
+        dm, r = self.dm, self.results
+        cand  = [i for i in range(dm["N"]) if r["v"][i] >= 0 and r["c"][i] - r["u"][i] > 0.05
+                 and dm["gamma"][i] >= 0 and dm["gamma"][dm["gamma"][i]] >= 0]
+        self.i = cand[len(cand)//2]
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def later(self, i: int) -> list:
+        gam, seq = self.dm["gamma"], []
+        while gam[i] >= 0:
+            i = gam[i]
+            seq.append(i)
+        return seq
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_unchanged(self):
+        rp = Repair()
+        rp.repair({self.i: {}}, self.results)
+
+        self.assertEqual(rp.diff, [])
+        self.assertEqual(rp.sim["violations"], self.before["violations"])
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_late_arrival(self):
+        i, r = self.i, self.results
+        a    = r["u"][i] + 0.5*(r["c"][i] - r["u"][i])
+        l    = 1.3*self.dm["l"][i]
+
+        rp  = Repair()
+        out = rp.repair({i: {"a": a, "l": l}}, r)
+
+        # The charge of the late bus moved, the charges of the other buses did not
+        self.assertIn(i, [d["visit"] for d in rp.diff])
+        for d in rp.diff:
+            self.assertEqual(d["bus"], self.dm["Gamma"][i])
+        self.assertGreaterEqual(out["u"][i], a)
+
+        # The repaired schedule is valid and the bus is back on plan
+        self.assertEqual(rp.sim["window"] + rp.sim["overlap"], 0)
+        self.assertLessEqual(rp.sim["violations"], self.before["violations"])
+        np.testing.assert_allclose(rp.sim["eta"][self.later(i)], self.before["eta"][self.later(i)])
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_make_up(self):
+        # The bus leaves as soon as it arrives. Within the horizon, its next
+        # visits charge for it.
+        i, r = self.i, self.results
+        hi   = self.dm["t"][i]
+
+        rp = Repair(horizon=0.0)
+        rp.repair({i: {"t": self.dm["a"][i]}}, r)
+        for d in rp.diff:
+            self.assertLessEqual(self.dm["a"][d["visit"]], hi)
+
+        rp  = Repair(horizon=24.0)
+        out = rp.repair({i: {"t": self.dm["a"][i]}}, r)
+        self.assertEqual(out["v"][i], -1)
+        self.assertTrue(any(d["visit"] in self.later(i) for d in rp.diff))
+        self.assertEqual(rp.sim["window"] + rp.sim["overlap"], 0)
+        return
@@ -0,0 +1,101 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+import yaml
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+sys.path.append("./src")
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from data_manager   import DataManager
+from quin_modified  import QuinModified
+from robustness     import Robustness
+from scheduler      import Schedule
+from simulator      import simulate
+from config_util    import writeConfig
+
+##===============================================================================
+#
+class TestRobustness(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def setUp(self):
+        self.dm  = DataManager()
+        self.tmp = tempfile.TemporaryDirectory()
+
+        writeConfig(self.tmp.name, {"buses.num_bus": 6, "buses.num_visit": 80,
+                                    "chargers.slow.num": 2, "chargers.fast.num": 2,
+                                    "seed": 2})
+        Schedule(None, self.tmp.name, self.tmp.name)
+        self.results = QuinModified(self.tmp.name).optimize()
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def tearDown(self):
+        self.tmp.cleanup()
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def evaluate(self, cfg: dict, jobs: int = 2):
+        cfg = dict({"samples": 300, "chunk": 50, "seed": 7}, **cfg)
+        with open(self.tmp.name + "/robustness.yaml", "w") as f:
+            yaml.dump(cfg, f)
+
+        rb      = Robustness(self.tmp.name)
+        rb.jobs = jobs
+        return rb.evaluate(self.results)
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_on_time(self):
+        dm  = self.dm
+        rep = self.evaluate({})
+
+        # Without delays, no charge is missed and the depleted buses are the
+        # ones the simulator flags
+        sim     = simulate(dm.m_params, self.results)
+        charged = sim["eta"] + self.results["g"] @ np.asarray(dm["r"], dtype=float)
+        low     = charged - dm["l"] < dm["nu"]*np.asarray(dm["kappa"])[dm["Gamma"]] - 1e-6
+        flagged = np.bincount(np.asarray(dm["Gamma"])[low], minlength=dm["A"]) > 0
+
+        np.testing.assert_array_equal(rep["p_missed"], 0)
+        np.testing.assert_array_equal(rep["p_depleted"], flagged.astype(float))
+        self.assertEqual(rep["missed"], 0)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_delays(self):
+        cfg = {"delay": {"arrival": 0.3, "departure": 0.1}, "discharge": 0.2}
+        rep = self.evaluate(cfg)
+
+        # Late buses miss charges and run low more often
+        self.assertEqual(len(rep["p_missed"]), self.dm["A"])
+        self.assertGreater(rep["missed"], 0)
+        self.assertTrue(np.all((rep["p_missed"] >= 0) & (rep["p_missed"] <= 1)))
+        self.assertGreaterEqual(np.sum(rep["p_depleted"]), np.sum(self.evaluate({})["p_depleted"]))
+
+        # The estimates only depend on the seed
+        again = self.evaluate(cfg, jobs=1)
+        np.testing.assert_array_equal(rep["p_missed"], again["p_missed"])
+        np.testing.assert_array_equal(rep["p_depleted"], again["p_depleted"])
+
+        other = self.evaluate(dict(cfg, seed=8))
+        self.assertNotEqual(rep["missed"], other["missed"])
+        return
@@ -0,0 +1,109 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from data_manager   import DataManager
+from quin_modified  import QuinModified
+from run_context    import RunContext
+from scheduler      import Schedule
+from config_util    import writeConfig
+
+##===============================================================================
+#
+class TestRunContext(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_keys(self):
+        ctx = RunContext()
+
+        ctx["N"] = 3
+        ctx["u"] = np.zeros(3)
+        self.assertFalse(ctx.set("unknown", 1))
+        self.assertEqual(ctx.m_params["N"], 3)
+        self.assertIn("u", ctx.m_decision_var)
+        self.assertIsNone(ctx["model"])
+
+        with self.assertRaises(KeyError):
+            ctx["unknown"]
+
+        # Contexts do not share their state, the data manager is one of them
+        self.assertIsNone(RunContext()["N"])
+        self.assertIs(DataManager(), DataManager())
+        self.assertIsInstance(DataManager(), RunContext)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_visit_index(self):
+        ctx = RunContext()
+        self.assertIsNone(ctx.visitIndex())
+
+        ctx["A"]     = 3
+        ctx["N"]     = 5
+        ctx["Gamma"] = [1, 0, 1, 2, 0]
+
+        # The index is built once and shared
+        visit = ctx.visitIndex()
+        self.assertIs(ctx.visitIndex(), visit)
+        self.assertEqual(list(visit.visits(0)), [1, 4])
+
+        # A new schedule gets a new index
+        ctx["Gamma"] = [0, 0, 1, 2, 2]
+        self.assertIsNot(ctx.visitIndex(), visit)
+        self.assertEqual(list(ctx.visitIndex().visits(2)), [3, 4])
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_two_schedules(self):
+        runs = []
+
+        with tempfile.TemporaryDirectory() as tmp:
+            # Two schedules live side by side in the same process
+            for n, seed in [(16, 40), (30, 41)]:
+                path = tmp + "/{0}".format(seed)
+                os.makedirs(path)
+                writeConfig(path, {"buses.num_bus": 4, "buses.num_visit": n, "seed": seed})
+
+                ctx = RunContext()
+                Schedule(None, path, path, ctx)
+                runs.append((ctx, path))
+
+            results = [QuinModified(path, ctx=ctx).optimize() for ctx, path in runs]
+
+            # Running the same schedule through the data manager gives the
+            # same schedule
+            Schedule(None, runs[0][1], runs[0][1])
+            qm = QuinModified(runs[0][1]).optimize()
+
+        # Each context kept its own schedule
+        self.assertEqual([ctx["N"] for ctx, _ in runs], [16, 30])
+        for (ctx, _), r in zip(runs, results):
+            np.testing.assert_array_equal(ctx["u"], r["u"])
+            self.assertEqual(len(r["u"]), ctx["N"])
+
+        np.testing.assert_array_equal(qm["u"], results[0]["u"])
+        np.testing.assert_array_equal(DataManager()["a"], runs[0][0]["a"])
+        return
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    unittest.main()
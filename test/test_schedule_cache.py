@@ -0,0 +1,113 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from data_manager   import DataManager
+from schedule_cache import ScheduleCache, fingerprint
+from scheduler      import Schedule
+from config_util    import writeConfig
+
+##===============================================================================
+#
+class TestScheduleCache(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_fingerprint(self):
+        init = {"seed": 0, "buses": {"num_bus": 4}}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            shutil.copy("./src/config/routes.csv", tmp)
+            key = fingerprint(init, "csv", tmp)
+
+            # Same inputs, same fingerprint
+            self.assertEqual(fingerprint(dict(init), "csv", tmp), key)
+
+            # The seed, the schedule type and the routes are part of it
+            self.assertNotEqual(fingerprint(dict(init, seed=1), "csv", tmp), key)
+            self.assertNotEqual(fingerprint(init, "random", tmp), key)
+
+            with open(tmp + "/routes.csv", "a") as f:
+                f.write("\n")
+            self.assertNotEqual(fingerprint(init, "csv", tmp), key)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_lru(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ScheduleCache(tmp + "/cache", 2)
+            self.assertIsNone(cache.get("a"))
+
+            cache.put("a", {"N": 1})
+            cache.put("b", {"N": 2})
+            self.assertEqual(cache.get("a"), {"N": 1})
+
+            # The least recently used entry is evicted
+            cache.put("c", {"N": 3})
+            self.assertEqual(cache.keys(), ["c", "a"])
+            self.assertIsNone(cache.get("b"))
+
+            # Disabled cache
+            cache = ScheduleCache(tmp + "/off", 0)
+            cache.put("a", {"N": 1})
+            self.assertIsNone(cache.get("a"))
+            self.assertFalse(os.path.exists(tmp + "/off"))
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_schedule(self):
+        dm = DataManager()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": 40},
+                        {"cache": 2})
+            s = Schedule(None, tmp, tmp)
+            prev = {k: np.copy(v) for k, v in dm.m_params.items()}
+            self.assertEqual(s.cache.keys(), [s.fingerprint])
+
+            # Switch to another scenario and back: the schedule is loaded from
+            # the cache (the arrays are mapped from disk)
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": 41},
+                        {"cache": 2})
+            Schedule(None, tmp, tmp)
+            self.assertNotIsInstance(dm["a"], np.memmap)
+
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": 40},
+                        {"cache": 2})
+            s = Schedule(None, tmp, tmp)
+            self.assertIsInstance(dm["a"], np.memmap)
+            self.assertEqual(len(s.cache.keys()), 2)
+
+            for k, v in prev.items():
+                np.testing.assert_array_equal(dm[k], v)
+
+            # Unseeded schedules are never cached
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": None},
+                        {"cache": 2})
+            s = Schedule(None, tmp, tmp)
+            self.assertEqual(len(s.cache.keys()), 2)
+        return
+
+##===============================================================================
+#
+if __name__ == "__main__":
+    unittest.main()
@@ -4,9 +4,12 @@
 import sys
 import os
 import random
+import tempfile
 import unittest
 import yaml
 
+import numpy as np
+
 ##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Include in path
 #
@@ -21,6 +24,7 @@ for root, dirs, files in os.walk("src/", topdown=False):
 from data_manager import DataManager
 from scheduler import Schedule
 from schedule_util import KWH2KJ
+from config_util   import writeConfig
 
 ##==============================================================================
 #
@@ -87,6 +91,47 @@ class TestScheduleClass(unittest.TestCase):
 
         return
 
+    ##--------------------------------------------------------------------------
+    #
+    def test_schedule_generation_random_seeded(self):
+        dm = DataManager()
+        out = []
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for seed in [0, 0, 1]:
+                writeConfig(tmp, {"buses.num_bus": 20, "buses.num_visit": 500, "seed": seed})
+                Schedule(None, tmp, tmp)
+                out.append({k: np.copy(dm[k]) for k in ["a", "t", "l", "Gamma", "gamma", "alpha", "beta"]})
+
+            # The global random number generator is left alone
+            np.random.seed(7)
+            x = np.random.random()
+            np.random.seed(7)
+            Schedule(None, tmp, tmp)
+            self.assertEqual(np.random.random(), x)
+
+        # The schedule only depends on the seed
+        for k in out[0]:
+            np.testing.assert_array_equal(out[0][k], out[1][k])
+        self.assertFalse(np.array_equal(out[0]["a"], out[2]["a"]))
+
+        # Visits are sorted by arrival and each one is followed by the next
+        # visit of its bus
+        s, nxt = out[0], out[0]["gamma"]
+        self.assertTrue(np.all(np.diff(s["a"]) >= 0))
+        self.assertTrue(np.all(s["t"] >= s["a"]))
+        on = nxt >= 0
+        np.testing.assert_array_equal(s["Gamma"][nxt[on]], s["Gamma"][on])
+        self.assertTrue(np.all(s["a"][nxt[on]] > s["a"][on]))
+        np.testing.assert_allclose(s["l"][on], dm["zeta"][0]*(s["a"][nxt[on]] - s["t"][on]))
+
+        # Every bus has one first and one last visit
+        first = np.setdiff1d(np.arange(500), nxt[on])
+        self.assertEqual(len(first), len(np.unique(s["Gamma"])))
+        self.assertTrue(np.all(s["alpha"][first] > 0))
+        self.assertEqual(np.count_nonzero(s["alpha"]), len(first))
+        np.testing.assert_array_equal(s["beta"] > 0, ~on)
+        return
 
     ##==========================================================================
     # Helper functions
@@ -0,0 +1,171 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import scipy.sparse as sp
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+sys.path.append("./src")
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from data_manager  import DataManager
+from main          import createModel, setupConstraints, setupObjective
+from optimizer     import Optimizer
+from quin_modified import QuinModified
+from scheduler     import Schedule
+from simulator     import simulate
+from config_util   import writeConfig
+
+##===============================================================================
+#
+class TestSimulator(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def schedule(self):
+        # Two buses with three visits each, one slow and one fast charger
+        params = {
+            "N": 6, "Q": 2, "nu": 0.2,
+            "Gamma": [0, 1, 0, 1, 0, 1],
+            "a":     [0.0, 0.0, 1.0, 1.5, 3.0, 3.0],
+            "t":     [0.5, 0.5, 2.0, 2.5, 4.0, 4.0],
+            "l":     [20.0, 20.0, 20.0, 20.0, 0.0, 0.0],
+            "alpha": [0.5, 0.5, 0, 0, 0, 0],
+            "beta":  [0, 0, 0, 0, 0.2, 0.2],
+            "kappa": [100.0, 100.0],
+            "r":     [10, 50],
+            "m":     [10, 100],
+            "e":     [10, 50],
+        }
+        results = {
+            "u": np.array([0.0, 0.0, 1.0, 1.5, 0.0, 0.0]),
+            "c": np.array([0.0, 0.0, 2.0, 1.7, 0.0, 0.0]),
+            "v": np.array([-1, -1, 0, 1, -1, -1]),
+        }
+        return params, results
+
+    ##-------------------------------------------------------------------------------
+    #
+    def complete(self, params, results):
+        N, Q = params["N"], params["Q"]
+        results["w"] = np.zeros((N, Q))
+        results["g"] = np.zeros((N, Q))
+        for i in np.flatnonzero(results["v"] >= 0):
+            results["w"][i, results["v"][i]] = 1
+            results["g"][i, results["v"][i]] = results["c"][i] - results["u"][i]
+        return results
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_valid_schedule(self):
+        params, results = self.schedule()
+        sim = simulate(params, self.complete(params, results))
+
+        # Charge of each bus through its visits
+        np.testing.assert_allclose(sim["eta"], [50, 50, 30, 30, 20, 20])
+        self.assertEqual(sim["violations"], 0)
+        self.assertAlmostEqual(sim["obj"], 10 + 10*1.0 + 100 + 50*0.2)
+        self.assertAlmostEqual(sim["peak"], 60)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_violations(self):
+        params, results = self.schedule()
+
+        # Bus 1 on the slow charger during the charge of bus 0, past its departure
+        results["v"][3] = 0
+        results["c"][3] = 2.6
+        sim = simulate(params, self.complete(params, results))
+
+        self.assertEqual(sim["overlap"], 1)
+        self.assertEqual(sim["window"], 1)
+        self.assertEqual(sim["peak"], 20)
+
+        # Charge of bus 1 short of its final charge
+        self.assertEqual(sim["beta"], 0)
+        params["beta"][5] = 0.4
+        self.assertEqual(simulate(params, results)["beta"], 1)
+
+        # Long route empties the battery of bus 0
+        params["l"][2] = 90.0
+        sim = simulate(params, results)
+        self.assertEqual(sim["empty"], 2)
+        self.assertGreaterEqual(sim["nu"], 1)
+
+        # Overlaps hidden behind a short charge
+        params, results = self.schedule()
+        results["u"] = np.array([0.0, 0.0, 1.0, 1.1, 1.5, 0.0])
+        results["c"] = np.array([0.0, 0.0, 2.0, 1.2, 1.8, 0.0])
+        results["v"] = np.array([-1, -1, 0, 0, 0, -1])
+        params["a"][4], params["t"][4] = 1.0, 4.0
+        self.assertEqual(simulate(params, self.complete(params, results))["overlap"], 2)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_quin_modified(self):
+        dm = DataManager()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {"buses.num_bus": 8, "buses.num_visit": 150,
+                              "chargers.slow.num": 3, "chargers.fast.num": 3, "seed": 1})
+            Schedule(None, tmp, tmp)
+            r = QuinModified(tmp).optimize()
+
+        # Charge of the schedule, visit by visit along the chain of each bus
+        G, gam = dm['Gamma'], dm['gamma']
+        E      = r['g'] @ np.asarray(dm['r'], dtype=float)
+        eta    = np.zeros(dm['N'])
+        for i in range(dm['N']):
+            if dm['alpha'][i] > 0:
+                eta[i] = dm['kappa'][G[i]]*dm['alpha'][i]
+            if gam[i] >= 0:
+                eta[gam[i]] = eta[i] + E[i] - dm['l'][i]
+
+        sim = simulate(dm.m_params, r)
+        np.testing.assert_allclose(sim["eta"], eta, atol=1e-6)
+        self.assertEqual(sim["window"] + sim["overlap"], 0)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_milp(self):
+        dm = DataManager()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16,
+                              "chargers.slow.num": 2, "chargers.fast.num": 2, "seed": 40},
+                        {"time_limit": 60, "verbose": 0})
+
+            dm["model"] = createModel(tmp)
+            dm["model"].setParam("OutputFlag", 0)
+            Schedule(dm["model"], tmp, tmp)
+
+            o = Optimizer(tmp, tmp)
+            setupObjective(o, dm)
+            setupConstraints(o, dm)
+            r = o.optimize()
+
+        # The binary and linearization matrices are kept sparse
+        for k in ["sigma", "delta", "w", "g"]:
+            self.assertTrue(sp.issparse(r[k]))
+
+        # The optimal schedule is physically valid
+        sim = simulate(dm.m_params, r)
+        self.assertEqual(sim["violations"], 0)
+        self.assertAlmostEqual(sim["obj"], 15014.79, places=1)
+        self.assertLess(sim["eta_error"], 1e-3)
+        return
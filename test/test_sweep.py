@@ -0,0 +1,84 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import math
+import tempfile
+import unittest
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+sys.path.append("./src")
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from config_loader import loadConfig
+from dict_util     import applyOverrides
+from sweep         import genScenarios, runScenario
+
+##===============================================================================
+#
+class TestSweep(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_gen_scenarios(self):
+        sweep = {
+            "grid"      : {"chargers.slow.num": [1, 2], "chargers.fast.num": [3, 4, 5]},
+            "scenarios" : [{"seed": 0}, {"seed": 1}],
+        }
+
+        scenarios = genScenarios(sweep)
+        names     = [n for n,_ in scenarios]
+
+        self.assertEqual(len(scenarios), 12)
+        self.assertEqual(len(set(names)), 12)
+        self.assertEqual(scenarios[0][1], {"seed": 0, "chargers.slow.num": 1, "chargers.fast.num": 3})
+        self.assertEqual(scenarios[-1][1], {"seed": 1, "chargers.slow.num": 2, "chargers.fast.num": 5})
+
+        # No grid results in only the explicit scenarios
+        self.assertEqual(len(genScenarios({"scenarios": [{"seed": 0}]})), 1)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_apply_overrides(self):
+        init = {"chargers": {"slow": {"num": 15, "rate": 30}}, "ignore": [1, 2]}
+
+        new = applyOverrides(init, {"chargers.slow.num": 3, "ignore": [], "seed": 7})
+
+        self.assertEqual(new["chargers"]["slow"], {"num": 3, "rate": 30})
+        self.assertEqual(new["ignore"], [])
+        self.assertEqual(new["seed"], 7)
+
+        # The original is untouched
+        self.assertEqual(init["chargers"]["slow"]["num"], 15)
+        self.assertEqual(init["ignore"], [1, 2])
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_milp_bound(self):
+        overrides = {"buses.num_bus": 4, "buses.num_visit": 16, "chargers.slow.num": 2,
+                     "chargers.fast.num": 2, "seed": 40}
+        general   = {"schedule_type": "random", "run_prev": 0, "load_from_file": 0,
+                     "checkpoint": 0, "resume": 0, "time_limit": 60, "verbose": 0}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            general.update({"schedule." + k: v for k, v in overrides.items()})
+            cfg = loadConfig("./src/config", general)
+            row = runScenario({"name": "scenario-000", "overrides": overrides, "cfg": cfg,
+                               "d_path": tmp, "solvers": ["milp"]})
+
+        # The bound and the gap of the MILP are reported
+        self.assertEqual(row["error"], "")
+        self.assertFalse(math.isnan(row["milp_bound"]))
+        self.assertLessEqual(row["milp_bound"], row["milp_obj"] + 1e-6)
+        self.assertLess(row["milp_gap"], 1e-3)
+        return
@@ -0,0 +1,74 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import tempfile
+import unittest
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+sys.path.append("./src")
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+import tune
+
+from config_loader  import loadConfig
+from config_util    import writeConfig
+from tuning         import *
+
+##===============================================================================
+#
+class TestTuning(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_size_bucket(self):
+        self.assertEqual(sizeBucket(338, 30), (512, 32))
+        self.assertEqual(sizeBucket(512, 32), (512, 32))
+        self.assertEqual(sizeBucket(513, 2) , (1024, 2))
+        self.assertEqual(bucketKey(338, 30) , "N512-Q32")
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_profiles(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = tmp + "/tuning.yaml"
+
+            # No profiles yet
+            self.assertEqual(profileParams(path, 300, 30), {})
+
+            # Any instance of the bucket uses the profile
+            saveProfile(path, 512, 32, {"params": {"MIPFocus": 1}})
+            self.assertEqual(profileParams(path, 300, 30), {"MIPFocus": 1})
+            self.assertEqual(profileParams(path, 600, 30), {})
+
+            # Re-tuning a bucket replaces its profile
+            saveProfile(path, 400, 20, {"params": {"Cuts": 2}})
+            self.assertEqual(profileParams(path, 300, 30), {"Cuts": 2})
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_score(self):
+        tcfg = {"instances": 1, "trials": 2, "time_limit": 10, "seed": 40}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            writeConfig(tmp, {"buses.num_bus": 4, "buses.num_visit": 16, "seed": 40})
+            model, _ = getattr(tune, "__genInstance")(16, 4, 0, tcfg, loadConfig(tmp), tmp)
+            score = getattr(tune, "__score")
+
+            # An optimal solve scores its runtime, an unfinished one is
+            # penalized by its gap
+            self.assertLess(score(model, {}, tcfg), 10)
+            self.assertLess(10, score(model, {"SolutionLimit": 1}, tcfg))
+            self.assertLess(score(model, {"SolutionLimit": 1}, tcfg), 20)
+            model.dispose()
+        return
@@ -0,0 +1,64 @@
+#!/usr/bin/python
+
+# Standard Lib
+import sys
+import os
+import unittest
+
+import numpy as np
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Include in path
+#
+# Recursively include in path:
+# https://www.tutorialspoint.com/python/os_walk.htm
+for root, dirs, files in os.walk("./src/", topdown=False):
+    for name in dirs:
+        sys.path.append(root+'/'+name)
+
+##~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Developed
+from visit_index import VisitIndex
+
+##===============================================================================
+#
+class TestVisitIndex(unittest.TestCase):
+    ##-------------------------------------------------------------------------------
+    #
+    def test_small(self):
+        G  = [1, 0, 1, 3, 0, 1, 3]
+        vi = VisitIndex(G)
+
+        self.assertEqual([vi.first(b) for b in range(4)], [1, 0, -1, 3])
+        self.assertEqual([vi.last(b) for b in range(4)], [4, 5, -1, 6])
+        self.assertEqual([vi.next(i) for i in range(7)], [2, 4, 5, 6, -1, -1, -1])
+        self.assertEqual([vi.prev(i) for i in range(7)], [-1, -1, 0, -1, 1, 2, 3])
+        self.assertEqual(list(vi.visits(1)), [0, 2, 5])
+        self.assertEqual(len(vi.visits(2)), 0)
+
+        # Buses without visits past the largest ID
+        self.assertEqual(VisitIndex(G, 6).last(5), -1)
+        return
+
+    ##-------------------------------------------------------------------------------
+    #
+    def test_random(self):
+        rng = np.random.default_rng(0)
+        A   = 30
+        G   = rng.integers(0, A, 2000)
+        vi  = VisitIndex(G, A)
+
+        for b in range(A):
+            idx = np.flatnonzero(G == b)
+            np.testing.assert_array_equal(vi.visits(b), idx)
+            self.assertEqual(vi.first(b), idx[0])
+            self.assertEqual(vi.last(b), idx[-1])
+
+        for i in rng.integers(0, len(G), 200):
+            prev = np.flatnonzero(G[:i] == G[i])
+            self.assertEqual(vi.prev(i), prev[-1] if len(prev) else -1)
+
+        # Next and previous visits are inverse of each other
+        on = vi.next_visit >= 0
+        np.testing.assert_array_equal(vi.prev_visit[vi.next_visit[on]], np.flatnonzero(on))
+        return